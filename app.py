@@ -1,22 +1,41 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.ticker as mticker
-import seaborn as sns
-from io import BytesIO
+from datetime import datetime, timezone
 from utils import (
     get_status_box_style,
     get_vrio_table_data,
-    highlight_vrio_cells,
     # get_factor_explanation_box_style # Ezt már nem használjuk
 )
+from factors import factor_definitions, factor_texts, FACTOR_KEYS, IS_BARRIER
+from content import available_languages, get_bundle
+from scoring import cached_score_profile, get_potential_tier
+from lookup_table import get_table
+from scoring_models import get_registry
+from montecarlo import DEFAULT_NOISE_PROBABILITY, cached_simulate
+from population import reference_population
+from store import get_store
+from history import get_history
+from segments import DEFAULT_SEGMENTS, cached_segment_store
+from sensitivity import sensitivity_table, summarize_steps, tier_targets, what_if
+from export import show_pdf_download
+from report import cached_build_report
+from cache import cache_stats
+from instrumentation import finish_rerun, fragment_rerun, page_stats, stage, start_rerun
+from settings import DEFAULT_LANGUAGE, INSTRUMENTATION_ENABLED, SCORING_LUT, SHOW_CACHE_STATS
+from charts import show_donut, show_hatas_pont, show_summary, show_trend
+from tables import profile_table_styler, vrio_table_styler
 
 # --- Konfigurációk és beállítások ---
+# Újrafuttatásonkénti időmérés (instrumentation.py), csak RBVKKV_INSTRUMENT=1 esetén
+start_rerun()
 st.set_page_config(
     layout="wide",
     page_title="RBV Kkv Indikátor",
     page_icon="📊"
 )
+# RBVKKV_SCORING_LUT=1: a keresőtábla memórialeképezése induláskor (folyamatonként egyszer), a pontozás
+# ezután egyetlen indexelés (lookup_table.lut_score_profile)
+if SCORING_LUT:
+    with stage("lut_load"): get_table()
 
 # Roboto betűtípus és egyéb CSS
 st.markdown("""
@@ -41,64 +60,16 @@ st.markdown("""
 
 st.title("A Kkv-k Nemzetköziesedési Szimulátora az RBV Elmélet Alapján")
 
-# --- Tényezők definíciói és magyarázatok ---
-factor_definitions = {
-    "Innovációs képesség": {
-        1: "Nagyon alacsony: Nincs kapacitás új termékek/szolgáltatások fejlesztésére.", 2: "Alacsony: Kisebb, alkalmi fejlesztésekre képes.",
-        3: "Közepes: Folyamatosan fejleszti termékeit, de nincs piaci áttörés.", 4: "Magas: Képes innovatív megoldásokat fejleszteni, ami versenyelőnyt ad.",
-        5: "Kiemelkedő: Piacvezető innovációk, gyakori áttörések."
-    },
-    "Humántőke és szakértelem": {
-        1: "Nagyon alacsony: Hiányzik a nemzetközi tapasztalat és nyelvtudás.", 2: "Alacsony: Korlátozott számú, nemzetközi tapasztalattal rendelkező munkatárs.",
-        3: "Közepes: Képzett munkaerő, alapvető nyelvtudás, de hiányzik a mélyebb szakértelem.", 4: "Magas: Magasan képzett, nyelvtudó csapat, nemzetközi tapasztalattal.",
-        5: "Kiemelkedő: Kiemelkedő szakértelemmel és globális hálózattal rendelkező menedzsment."
-    },
-    "Pénzügyi stabilitás": {
-        1: "Nagyon alacsony: Instabil pénzügyi helyzet, forráshiányos.", 2: "Alacsony: Nehezen jut finanszírozáshoz, korlátozott befektetési képesség.",
-        3: "Közepes: Stabil pénzügyi háttér, de nagyobb beruházásokhoz külső forrás kell.", 4: "Magas: Kedvező finanszírozási feltételek, képes nagyobb külpiaci beruházásokra.",
-        5: "Kiemelkedő: Kiváló pénzügyi helyzet, jelentős saját források, könnyű forrásbevonás."
-    },
-    "Kapcsolati háló és partneri együttműködések": {
-        1: "Nagyon alacsony: Nincs nemzetközi kapcsolati háló.", 2: "Alacsony: Korlátozott, alkalmi külföldi kapcsolatok.",
-        3: "Közepes: Alapvető nemzetközi kapcsolatok, de stratégiai partnerek hiánya.", 4: "Magas: Erős nemzetközi kapcsolati háló, stabil partneri együttműködések.",
-        5: "Kiemelkedő: Széleskörű globális hálózat, aktív stratégiai szövetségek."
-    },
-    "Technológiai fejlettség": {
-        1: "Nagyon alacsony: Elavult technológia, digitális eszközök hiánya.", 2: "Alacsony: Alapvető digitális eszközök, de nem integrált rendszerek.",
-        3: "Közepes: Modern technológia, de nem élenjáró, digitális folyamatok részben automatizáltak.", 4: "Magas: Aktívan alkalmaz digitális megoldásokat, e-kereskedelmi csatornák.",
-        5: "Kiemelkedő: Piacvezető technológia, teljes digitális transzformáció, AI/automatizálás."
-    },
-    "Korlátozott pénzügyi források (Gátló)": {
-        1: "Nagyon alacsony akadály: Nincs jelentős korlát, könnyen finanszírozható a terjeszkedés.", 2: "Alacsony akadály: Kisebb finanszírozási kihívások, de megoldhatók.",
-        3: "Közepes akadály: Jelentős, de kezelhető pénzügyi korlátok.", 4: "Magas akadály: Nehézkes a finanszírozás, lassítja a terjeszkedést.",
-        5: "Kiemelkedő akadály: Krónikus forráshiány, meggátolja a külpiacra lépést."
-    },
-    "Piaci ismeretek hiánya (Gátló)": {
-        1: "Nagyon alacsony akadály: Mélyreható piacismeretek a célországokról.", 2: "Alacsony akadály: Alapvető piacismeret, kisebb hiányosságokkal.",
-        3: "Közepes akadály: Hiányos piacismeretek, de piackutatással pótolható.", 4: "Magas akadály: Jelentős piaci ismerethiány, nagy kockázat.",
-        5: "Kiemelkedő akadály: Teljes piaci ismerethiány, sikertelen piacra lépés."
-    },
-    "Hiányos digitális kompetenciák (Gátló)": {
-        1: "Nagyon alacsony akadály: Kiváló digitális kompetenciák, online jelenlét.", 2: "Alacsony akadály: Alapvető digitális tudás, de van hova fejlődni.",
-        3: "Közepes akadály: Részben fejlett digitális kompetenciák, de elmaradás a versenytársaktól.", 4: "Magas akadály: Hiányos digitális eszközök, marketingstratégiák.",
-        5: "Kiemelkedő akadály: Teljes digitális lemaradás, online jelenlét hiánya."
-    },
-    "Vezetési és stratégiai hiányosságok (Gátló)": {
-        1: "Nagyon alacsony akadály: Erős, rugalmas menedzsment, jól meghatározott stratégia.", 2: "Alacsony akadály: Kompetens vezetés, kisebb stratégiai finomításra szorul.",
-        3: "Közepes akadály: Alapvető stratégiai tervezés, de hiányzik a nemzetközi fókusz.", 4: "Magas akadály: Rossz vezetési döntések, rugalmatlan stratégia a külpiacokon.",
-        5: "Kiemelkedő akadály: Nincs nemzetközi stratégia, rossz kockázatkezelés."
-    }
-}
-
 # Session state inicializálása
-if 'selected_factors' not in st.session_state:
-    st.session_state.selected_factors = {factor_name: None for factor_name in factor_definitions.keys()}
-if 'current_page' not in st.session_state: 
-    st.session_state.current_page = "Bevezető" 
+with stage("session_state"):
+    if 'selected_factors' not in st.session_state:
+        st.session_state.selected_factors = {factor_name: None for factor_name in factor_definitions.keys()}
+    if 'current_page' not in st.session_state: 
+        st.session_state.current_page = "Bevezető" 
 
 # Oldalsáv navigáció
 st.sidebar.header("Navigáció")
-page_options = ["Bevezető", "Főoldal (Kkv Profil)", "Kkv Jellemzők Beállítása", "Nemzetköziesedési Potenciál", "VRIO Elemzés", "Beszámoló", "Gyakorlati Javaslatok"]
+page_options = ["Bevezető", "Főoldal (Kkv Profil)", "Kkv Jellemzők Beállítása", "Nemzetköziesedési Potenciál", "VRIO Elemzés", "Érzékenységvizsgálat", "Beszámoló", "Gyakorlati Javaslatok", "Idősoros Követés", "Portfólió Szegmentáció"]
 
 try:
     current_page_index = page_options.index(st.session_state.current_page)
@@ -117,6 +88,25 @@ if selected_page_from_radio != st.session_state.current_page:
     st.session_state.current_page = selected_page_from_radio
     st.rerun() 
 
+# Pontozási modell választása (scoring_models.py, a models/ könyvtár JSON fájljai)
+scoring_registry = get_registry()
+scoring_model = scoring_registry.default
+if len(scoring_registry) > 1:
+    st.sidebar.markdown("---")
+    selected_model_name = st.sidebar.selectbox("Pontozási modell", scoring_registry.names, format_func=lambda name: scoring_registry.get(name).label, key="scoring_model")
+    scoring_model = scoring_registry.get(selected_model_name)
+    st.sidebar.caption(scoring_model.description)
+
+# A tényezők, a beszámoló és a javaslatok nyelve (content.py, a content/ könyvtár nyelvi csomagjai);
+# a csomagok lefordítva, folyamatonként egyszer töltődnek be, így a nyelvváltás csak kikeresés
+content_languages = available_languages()
+if len(content_languages) > 1:
+    st.sidebar.markdown("---")
+    st.sidebar.selectbox("Nyelv / Language", content_languages, index=content_languages.index(DEFAULT_LANGUAGE) if DEFAULT_LANGUAGE in content_languages else 0,
+                         format_func=lambda language: get_bundle(language).label, key="language")
+language = st.session_state.get("language", DEFAULT_LANGUAGE)
+content_bundle = get_bundle(language)
+
 st.sidebar.markdown("---") 
 st.sidebar.caption("Készítette: Győrfi Attila")
 
@@ -125,65 +115,21 @@ page = st.session_state.current_page
 # --- Globális ellenőrzés és számítások ---
 all_factors_selected = all(value is not None for value in st.session_state.selected_factors.values())
 nemzetkoziesedesi_potencial_num = 0.0
-s_innovacio, s_humantoke, s_penzugyi_stabilitas, s_kapcsolati_halo, s_technologiai_fejlettseg = 0,0,0,0,0
-s_korlatozott_penzugyi_forrasok, s_piaci_ismeretek_hianya, s_hianyos_digitalis_kompetenciak, s_vezetesi_strategiai_hianyossagok = 0,0,0,0
+hatas_pontok = [0.0] * len(FACTOR_KEYS)
 innovacio, humantoke, penzugyi_stabilitas, kapcsolati_halo, technologiai_fejlettseg = (None,) * 5
 korlatozott_penzugyi_forrasok, piaci_ismeretek_hianya, hianyos_digitalis_kompetenciak, vezetesi_strategiai_hianyossagok = (None,) * 4
 
 
 if all_factors_selected:
-    innovacio = st.session_state.selected_factors["Innovációs képesség"]
-    humantoke = st.session_state.selected_factors["Humántőke és szakértelem"]
-    penzugyi_stabilitas = st.session_state.selected_factors["Pénzügyi stabilitás"]
-    kapcsolati_halo = st.session_state.selected_factors["Kapcsolati háló és partneri együttműködések"]
-    technologiai_fejlettseg = st.session_state.selected_factors["Technológiai fejlettség"]
-    korlatozott_penzugyi_forrasok = st.session_state.selected_factors["Korlátozott pénzügyi források (Gátló)"]
-    piaci_ismeretek_hianya = st.session_state.selected_factors["Piaci ismeretek hiánya (Gátló)"]
-    hianyos_digitalis_kompetenciak = st.session_state.selected_factors["Hiányos digitális kompetenciák (Gátló)"]
-    vezetesi_strategiai_hianyossagok = st.session_state.selected_factors["Vezetési és stratégiai hiányosságok (Gátló)"]
-
-    s_innovacio = (innovacio - 1) / 4; s_humantoke = (humantoke - 1) / 4; s_penzugyi_stabilitas = (penzugyi_stabilitas - 1) / 4
-    s_kapcsolati_halo = (kapcsolati_halo - 1) / 4; s_technologiai_fejlettseg = (technologiai_fejlettseg - 1) / 4
-    s_korlatozott_penzugyi_forrasok = 1 - (korlatozott_penzugyi_forrasok - 1) / 4
-    s_piaci_ismeretek_hianya = 1 - (piaci_ismeretek_hianya - 1) / 4
-    s_hianyos_digitalis_kompetenciak = 1 - (hianyos_digitalis_kompetenciak - 1) / 4
-    s_vezetesi_strategiai_hianyossagok = 1 - (vezetesi_strategiai_hianyossagok - 1) / 4
-    avg_support = (s_innovacio + s_humantoke + s_penzugyi_stabilitas + s_kapcsolati_halo + s_technologiai_fejlettseg) / 5
-    avg_barrier_negated = (s_korlatozott_penzugyi_forrasok + s_piaci_ismeretek_hianya + s_hianyos_digitalis_kompetenciak + s_vezetesi_strategiai_hianyossagok) / 4
-    nemzetkoziesedesi_potencial_num = (avg_support * 0.6 + avg_barrier_negated * 0.4) * 100
-    nemzetkoziesedesi_potencial_num = max(0, min(100, nemzetkoziesedesi_potencial_num))
+    (innovacio, humantoke, penzugyi_stabilitas, kapcsolati_halo, technologiai_fejlettseg,
+     korlatozott_penzugyi_forrasok, piaci_ismeretek_hianya, hianyos_digitalis_kompetenciak,
+     vezetesi_strategiai_hianyossagok) = (st.session_state.selected_factors[factor_name] for factor_name in FACTOR_KEYS)
+    # A potenciál és a "Hatás Pont" értékek a közös pontozó motorból (scoring.py) származnak,
+    # profilonként a munkamenetek között megosztott gyorsítótárból
+    with stage("scoring"):
+        nemzetkoziesedesi_potencial_num, hatas_pontok = cached_score_profile(st.session_state.selected_factors, scoring_model)
 
 # --- Stílusfüggvények ---
-def get_rating_style_main_profile(value):
-    color = "black"; background_color = 'transparent'; font_weight = "normal"
-    if pd.notnull(value) and isinstance(value, (int, float)):
-        font_weight = "bold"
-        if value == 1: background_color = '#f8d7da'; color = '#721c24'
-        elif value == 2: background_color = '#f5c6cb'; color = '#721c24'
-        elif value == 3: background_color = '#fff3cd'; color = '#856404'
-        elif value == 4: background_color = '#d4edda'; color = '#155724'
-        elif value == 5: background_color = '#c3e6cb'; color = '#155724'
-    return f'background-color: {background_color}; color: {color}; font-weight: {font_weight};'
-
-def get_description_style_main_profile(rating_value):
-    color = 'black'
-    if pd.notnull(rating_value) and isinstance(rating_value, (int, float)):
-        if rating_value == 1: color = '#721c24'
-        elif rating_value == 2: color = '#721c24'
-        elif rating_value == 3: color = '#856404'
-        elif rating_value == 4: color = '#155724'
-        elif rating_value == 5: color = '#155724'
-    return f'color: {color};'
-
-def style_main_profile_row_cells(row):
-    factor_style = 'text-align: left; font-weight: bold; border: 1px solid #ddd; padding: 8px; vertical-align: top;'
-    rating_value = row['Értékelés (1-5)'] # Ez lehet None vagy szám
-    rating_cell_color_props = get_rating_style_main_profile(rating_value)
-    rating_cell_style = f'{rating_cell_color_props} text-align: center; border: 1px solid #ddd; padding: 8px; vertical-align: top;'
-    desc_cell_color_props = get_description_style_main_profile(rating_value)
-    desc_cell_style = f'{desc_cell_color_props} text-align: left; border: 1px solid #ddd; padding: 8px; vertical-align: top; word-break: break-word; white-space: normal;'
-    return [factor_style, rating_cell_style, desc_cell_style]
-
 def get_score_text_style(score_value, is_barrier=False, is_selected=False):
     color = "black" 
     font_weight = "normal"
@@ -199,6 +145,70 @@ def get_score_text_style(score_value, is_barrier=False, is_selected=False):
             else: color = "green"
     return f"color: {color}; font-weight: {font_weight};"
 
+@st.cache_resource
+def get_factor_option_markup(language):
+    # A beállítási oldal szintleírásainak HTML sorai (tényező, szint, kiválasztott-e) szerint; nyelvenként, folyamatonként egyszer készül el
+    markup = {}
+    for factor_name, (_, descriptions) in factor_texts(language).items():
+        for val_option in range(1, 6):
+            for is_selected_option in (False, True):
+                style_str = get_score_text_style(val_option, "(Gátló)" in factor_name, is_selected=is_selected_option)
+                markup[(factor_name, val_option, is_selected_option)] = f"&nbsp;&nbsp;&nbsp;&nbsp;<span style='{style_str}'>{val_option}: {descriptions[val_option]}</span>"
+    return markup
+
+# --- Tényezőszerkesztő ---
+# A selectbox on_change visszahívása frissíti a selected_factors szótárt, és csak a szerkesztő
+# fragment fut újra (a módosított widget és az összefoglaló diagram), nem a teljes szkript a
+# CSS-sel, a globális számításokkal és az oldalsávval. Régebbi Streamlit verzión az
+# experimental_fragment, annak hiányában a teljes újrafuttatás marad.
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+FACTOR_SELECTBOX_OPTIONS = ["-"] + list(range(1, 6))
+
+def get_factor_selectbox_key(factor_name):
+    return f"sb_factor_details_{factor_name.replace(' ', '_').replace('(', '').replace(')', '')}"
+
+def on_factor_change(factor_name, widget_key):
+    selected_option = st.session_state[widget_key]
+    st.session_state.selected_factors[factor_name] = None if selected_option == "-" else int(selected_option)
+
+@fragment
+def factor_editor():
+    # A fragment önálló újrafuttatása saját "factor_editor" rerunként mérődik
+    with fragment_rerun("factor_editor"):
+        render_factor_editor()
+
+def render_factor_editor():
+    selected_factors = st.session_state.selected_factors
+    if any(value is None for value in selected_factors.values()):
+        st.info("Még nem minden jellemzőt értékelt. Kérjük, válasszon minden tényezőhöz egy értéket (1-5) a folytatáshoz.")
+    cols = st.columns(2); mid_point = (len(FACTOR_KEYS) + 1) // 2
+    editor_language = st.session_state.get("language", DEFAULT_LANGUAGE)
+    with stage("factor_markup"):
+        factor_option_markup = get_factor_option_markup(editor_language)
+        display_names = factor_texts(editor_language)
+    for i, factor_name in enumerate(FACTOR_KEYS):
+        current_col = cols[0] if i < mid_point else cols[1]
+        with current_col, stage("factor_widgets"):
+            st.markdown(f"#### **{display_names[factor_name][0]}**") # MÓDOSÍTVA: Nagyobb, vastag cím
+            current_value_for_factor = selected_factors.get(factor_name)
+            current_selectbox_index = FACTOR_SELECTBOX_OPTIONS.index(current_value_for_factor) if current_value_for_factor in FACTOR_SELECTBOX_OPTIONS else 0 # Alapértelmezett a "-"
+            widget_key = get_factor_selectbox_key(factor_name)
+            st.selectbox(label=f"Értékelés - {factor_name}", options=FACTOR_SELECTBOX_OPTIONS, index=current_selectbox_index, key=widget_key,
+                         on_change=on_factor_change, args=(factor_name, widget_key), label_visibility="collapsed")
+
+            st.markdown("<u>Választható szintek és leírásuk:</u>", unsafe_allow_html=True)
+            for val_option in range(1, 6):
+                is_selected_option = (selected_factors.get(factor_name) == val_option)
+                st.markdown(factor_option_markup[(factor_name, val_option, is_selected_option)], unsafe_allow_html=True)
+            st.markdown("<br>", unsafe_allow_html=True) 
+    st.markdown("---")
+    if all(value is not None for value in selected_factors.values()):
+        st.subheader("A beállítások összefoglaló diagramja:")
+        try:
+            show_summary(selected_factors.items(), editor_language)
+        except Exception as e_diag: st.error(f"Hiba az összefoglaló diagram megjelenítése közben: {e_diag}")
+    else: st.info("A beállítások összefoglaló diagramja akkor jelenik meg, ha minden tényezőt értékelt.")
+
 # --- Oldalak megjelenítése ---
 if page == "Bevezető":
     st.header("Bevezető és Módszertan")
@@ -241,20 +251,13 @@ if page == "Bevezető":
 elif page == "Főoldal (Kkv Profil)":
     st.header("Kkv Profil Összefoglaló")
     st.write("Az alábbiakban táblázatos formában láthatja a jelenleg beállított kkv jellemzőket. Az értékeléshez és a részletes beszámolóhoz navigáljon a megfelelő oldalra.")
-    profile_data_for_style = []
-    any_factor_not_set_on_main = False
-    for factor_name_key in factor_definitions.keys():
-        value = st.session_state.selected_factors.get(factor_name_key)
-        if value is None: any_factor_not_set_on_main = True
-        description_text = factor_definitions[factor_name_key].get(value, "Még nem értékelt").split(': ',1)[1] if value is not None else "Még nem értékelt"
-        profile_data_for_style.append({"Tényező": factor_name_key, "Értékelés (1-5)": value, "Rövid Leírás": description_text})
-    df_profile_for_style = pd.DataFrame(profile_data_for_style)
-    styled_profile_styler = df_profile_for_style.style.apply(style_main_profile_row_cells, axis=1).hide(axis="index")
-    def format_rating(val): return "-" if pd.isnull(val) else int(val)
-    st.dataframe(styled_profile_styler.format({"Értékelés (1-5)": format_rating}), use_container_width=True, 
-                 column_config={"Tényező": st.column_config.TextColumn("Tényező", width="medium"), 
-                                "Értékelés (1-5)": st.column_config.TextColumn("Értékelés", width="small"),
-                                "Rövid Leírás": st.column_config.TextColumn("Leírás", width="large")})
+    any_factor_not_set_on_main = not all_factors_selected
+    # A táblázat és a cellastílusok előre kiszámított CSS tömbökből állnak össze (tables.py)
+    with stage("styler"):
+        st.dataframe(profile_table_styler(st.session_state.selected_factors, language), use_container_width=True, 
+                     column_config={"Tényező": st.column_config.TextColumn("Tényező", width="medium"), 
+                                    "Értékelés (1-5)": st.column_config.TextColumn("Értékelés", width="small"),
+                                    "Rövid Leírás": st.column_config.TextColumn("Leírás", width="large")})
     if any_factor_not_set_on_main:
         st.info("A részletes beszámoló megtekintéséhez kérjük, először értékelje az összes tényezőt a 'Kkv Jellemzők Beállítása' oldalon.")
     if st.button("Részletes Beszámoló Megtekintése", key="show_report_btn_main", disabled=any_factor_not_set_on_main):
@@ -264,72 +267,81 @@ elif page == "Kkv Jellemzők Beállítása":
     st.header("Kkv Jellemzők Beállítása")
     st.write("Minden tényezőt értékeljen 1-től 5-ig terjedő skálán. Az értékeléséhez tartozó részletes magyarázat alább látható, a kiválasztott szintnek megfelelő színnel és félkövérrel kiemelve.")
     st.markdown("---")
-    if any(value is None for value in st.session_state.selected_factors.values()):
-        st.info("Még nem minden jellemzőt értékelt. Kérjük, válasszon minden tényezőhöz egy értéket (1-5) a folytatáshoz.")
-    cols = st.columns(2); factor_keys = list(factor_definitions.keys()); num_factors = len(factor_keys); mid_point = (num_factors + 1) // 2
-    for i, factor_name in enumerate(factor_keys):
-        current_col = cols[0] if i < mid_point else cols[1]
-        with current_col:
-            st.markdown(f"#### **{factor_name}**") # MÓDOSÍTVA: Nagyobb, vastag cím
-            current_value_for_factor = st.session_state.selected_factors.get(factor_name)
-            selectbox_options_display = ["-"] + list(range(1, 6))
-            current_selectbox_index = 0 # Alapértelmezett a "-"
-            if current_value_for_factor is not None:
-                try: current_selectbox_index = selectbox_options_display.index(current_value_for_factor)
-                except ValueError: pass # Marad 0, ha az érték valamiért nem valid
-            
-            selected_option_from_sb = st.selectbox(label=f"Értékelés - {factor_name}", options=selectbox_options_display, index=current_selectbox_index, 
-                                                   key=f"sb_factor_details_{factor_name.replace(' ', '_').replace('(', '').replace(')', '')}", label_visibility="collapsed")
-            
-            actual_selected_value_for_highlighting = None
-            if selected_option_from_sb == "-":
-                if st.session_state.selected_factors.get(factor_name) is not None: # Csak akkor frissítünk és futtatunk újra, ha None-ra változott
-                    st.session_state.selected_factors[factor_name] = None
-                    st.rerun()
-            else:
-                new_val = int(selected_option_from_sb)
-                if st.session_state.selected_factors.get(factor_name) != new_val:
-                    st.session_state.selected_factors[factor_name] = new_val
-                    st.rerun()
-                actual_selected_value_for_highlighting = new_val
-            
-            st.markdown("<u>Választható szintek és leírásuk:</u>", unsafe_allow_html=True)
-            is_barrier_factor = "(Gátló)" in factor_name
-            for val_option in range(1, 6):
-                full_desc_text = factor_definitions[factor_name][val_option]
-                display_text_option = f"{val_option}: {full_desc_text}"
-                is_selected_option = (actual_selected_value_for_highlighting == val_option)
-                style_str = get_score_text_style(val_option, is_barrier_factor, is_selected=is_selected_option)
-                st.markdown(f"&nbsp;&nbsp;&nbsp;&nbsp;<span style='{style_str}'>{display_text_option}</span>", unsafe_allow_html=True)
-            st.markdown("<br>", unsafe_allow_html=True) 
-    st.markdown("---")
-    if all_factors_selected:
-        st.subheader("A beállítások összefoglaló diagramja:")
-        try:
-            # ... (diagram kódja változatlan) ...
-            df_summary_display = pd.DataFrame(st.session_state.selected_factors.items(), columns=['Tényező', 'Értékelés'])
-            fig_summary_display, ax_summary_display = plt.subplots(figsize=(10, 6)) 
-            colors_summary_display = []
-            for index, row_disp in df_summary_display.iterrows():
-                score_disp = row_disp['Értékelés']; is_barrier_disp = "(Gátló)" in row_disp['Tényező']
-                color_to_append_disp = '#ffc107'
-                if is_barrier_disp:
-                    if score_disp <= 2: color_to_append_disp = '#28a745' 
-                    elif score_disp >= 4: color_to_append_disp = '#dc3545'
-                else:
-                    if score_disp <= 2: color_to_append_disp = '#dc3545'
-                    elif score_disp >= 4: color_to_append_disp = '#28a745'
-                colors_summary_display.append(color_to_append_disp)
-            sns.barplot(x='Értékelés', y='Tényező', data=df_summary_display, palette=colors_summary_display, ax=ax_summary_display, orient='h')
-            ax_summary_display.set_xlabel("Értékelés (1-5)"); ax_summary_display.set_ylabel("Tényező"); ax_summary_display.set_title("Kkv Jellemzők Jelenlegi Értékelései")
-            ax_summary_display.set_xlim(0, 5.5); ax_summary_display.xaxis.set_major_locator(mticker.MultipleLocator(1))
-            for i_disp, v_disp in enumerate(df_summary_display['Értékelés']): ax_summary_display.text(v_disp + 0.1, i_disp, str(v_disp), color='black', va='center', fontweight='bold')
-            plt.tight_layout(); st.pyplot(fig_summary_display); plt.close(fig_summary_display)
-        except Exception as e_diag: st.error(f"Hiba az összefoglaló diagram megjelenítése közben: {e_diag}")
-    else: st.info("A beállítások összefoglaló diagramja akkor jelenik meg, ha minden tényezőt értékelt.")
+    # Csak a szerkesztő fragment fut újra egy-egy értékelés módosításakor
+    factor_editor()
     st.markdown("---")
 
-analysis_pages = ["Nemzetköziesedési Potenciál", "VRIO Elemzés", "Beszámoló", "Gyakorlati Javaslatok"]
+elif page == "Idősoros Követés":
+    st.header("Idősoros Követés")
+    st.write("Ugyanannak a kkv-nak az időről időre (pl. negyedévente) megismételt értékelései alapján követhető a nemzetköziesedési potenciál és az egyes tényezők hatásának alakulása.")
+    # Az értékelések tömören, a trendek és a negyedéves átlagok előre aggregálva tárolódnak (history.py)
+    try:
+        history = get_history()
+        history_company = st.text_input("Cég neve vagy azonosítója", key="history_company").strip()
+        if not history_company:
+            st.info("Adja meg a követett cég nevét vagy azonosítóját.")
+        else:
+            col_date, col_add = st.columns([0.5, 0.5])
+            with col_date: assessed_on = st.date_input("Az értékelés dátuma", key="history_date")
+            with col_add:
+                st.markdown("<br>", unsafe_allow_html=True)
+                add_to_history = st.button("A jelenlegi értékelés hozzáadása az idősorhoz", key="history_add", disabled=not all_factors_selected)
+            if not all_factors_selected:
+                st.info("Új értékelés hozzáadásához előbb értékelje az összes tényezőt a 'Kkv Jellemzők Beállítása' oldalon.")
+            if add_to_history:
+                history.add(history_company, st.session_state.selected_factors, datetime(assessed_on.year, assessed_on.month, assessed_on.day, 12, tzinfo=timezone.utc).timestamp())
+                st.success(f"Az értékelés hozzáadva ({assessed_on:%Y-%m-%d}).")
+            with stage("history"): trend = history.trend(history_company)
+            if trend is None:
+                st.info("Ehhez a céghez még nincs tárolt értékelés.")
+            else:
+                if not scoring_model.is_reference: st.caption("Az idősor potenciáljai az alapmodell szerint számolódnak.")
+                col1, col2, col3 = st.columns(3)
+                with col1: st.metric(label="Értékelések száma", value=trend.count)
+                with col2: st.metric(label="Legutóbbi potenciál", value=f"{trend.latest_potential:.1f} %",
+                                     delta=None if trend.previous_potential is None else f"{trend.latest_potential - trend.previous_potential:+.1f} %")
+                with col3: st.metric(label="Trend", value="-" if trend.potential_slope is None else f"{trend.potential_slope:+.2f} pont/negyedév")
+                with stage("history"): series = history.quarterly_series(history_company)
+                show_trend(series.labels, series.potential, series.hatas_pont, language)
+                if trend.hatas_pont_slopes is not None:
+                    st.dataframe(
+                        [{"Tényező": factor_name, "Legutóbbi értékelés": trend.latest_ratings[factor_name],
+                          "Hatás Pont trend": f"{slope:+.2f} pont/negyedév"}
+                         for factor_name, slope in zip(FACTOR_KEYS, trend.hatas_pont_slopes)],
+                        use_container_width=True, hide_index=True)
+    except Exception as e_history: st.error(f"Hiba az idősor betöltése közben: {e_history}")
+
+elif page == "Portfólió Szegmentáció":
+    st.header("Portfólió Szegmentáció")
+    st.write("A tárolt kkv értékelések csoportosítása a kilenc tényező normalizált értékei alapján (k-közép klaszterezés). Minden szegmenst a benne leggyakoribb VRIO mintázat jellemez.")
+    # Az azonos profilok összevonva, előfordulásukkal súlyozva klasztereződnek (segments.py)
+    try:
+        segment_count = st.slider("Szegmensek száma", min_value=2, max_value=12, value=DEFAULT_SEGMENTS, key="segment_count")
+        with stage("segments"): segmentation = cached_segment_store(get_store(), segment_count)
+        if segmentation is None:
+            st.info("A szegmentáláshoz még nincs elég tárolt értékelés. Az értékelések a 'Nemzetköziesedési Potenciál' oldalon vagy a batch.py --store kapcsolójával menthetők.")
+        else:
+            st.caption(f"{segmentation.total} tárolt értékelés, {segmentation.distinct} különböző profil. A potenciálok az alapmodell szerint számolódnak.")
+            st.dataframe(
+                [{"Szegmens": segment.id, "Jellemző VRIO mintázat": segment.label, "Értékelések": segment.size,
+                  "Arány": f"{segment.share:.1%}", "Átlagos potenciál": f"{segment.mean_potential:.1f} %",
+                  **{f"{tier_label.capitalize()} kategória": f"{share:.0%}" for tier_label, share in segment.tier_shares.items()}}
+                 for segment in segmentation.segments],
+                use_container_width=True, hide_index=True)
+            if all_factors_selected:
+                own_segment = segmentation.segments[segmentation.assign(st.session_state.selected_factors)[0] - 1]
+                st.success(f"A jelenlegi értékelés a(z) {own_segment.id}. szegmensbe tartozik ({own_segment.label}).")
+            segment_id = st.selectbox("Szegmens részletei", [segment.id for segment in segmentation.segments],
+                                      format_func=lambda segment_id: f"{segment_id}. szegmens", key="segment_detail")
+            segment = segmentation.segments[segment_id - 1]
+            st.markdown(f"**Jellemző VRIO mintázat** (a szegmens {segment.vrio_share:.0%}-ánál, pl. a leggyakoribb ilyen profilnál):")
+            st.dataframe(vrio_table_styler(get_vrio_table_data(*segment.representative[:5]), language), use_container_width=True)
+            st.markdown("**A szegmens középpontja** (átlagos értékelések):")
+            st.dataframe([{"Tényező": factor_name, "Átlagos értékelés": f"{rating:.1f}"} for factor_name, rating in segment.center_ratings.items()],
+                         use_container_width=True, hide_index=True)
+    except Exception as e_segments: st.error(f"Hiba a szegmentálás közben: {e_segments}")
+
+analysis_pages = ["Nemzetköziesedési Potenciál", "VRIO Elemzés", "Érzékenységvizsgálat", "Beszámoló", "Gyakorlati Javaslatok"]
 if page in analysis_pages:
     if not all_factors_selected:
         st.warning("Kérjük, először értékelje az összes tényezőt a 'Kkv Jellemzők Beállítása' oldalon a folytatáshoz!")
@@ -341,156 +353,130 @@ if page in analysis_pages:
             col1, col2 = st.columns([0.6, 0.4]) 
             with col1: st.metric(label="Aktuális Nemzetköziesedési Potenciál", value=f"{nemzetkoziesedesi_potencial_num:.1f} %")
             with col2:
-                labels_pie = 'Elért', 'Hátralévő'; sizes_pie = [nemzetkoziesedesi_potencial_num, 100 - nemzetkoziesedesi_potencial_num]
-                explode_pie = (0.05, 0) if 0 < nemzetkoziesedesi_potencial_num < 100 else (0,0)
-                color_reached = '#D3D3D3'; 
-                if nemzetkoziesedesi_potencial_num < 40: color_reached = '#dc3545' 
-                elif nemzetkoziesedesi_potencial_num < 70: color_reached = '#ffc107' 
-                else: color_reached = '#28a745' 
-                fig_pie, ax_pie = plt.subplots(figsize=(2.5, 2.5)); ax_pie.pie(sizes_pie, explode=explode_pie, labels=None, autopct=None, startangle=90, colors=[color_reached, '#E9E9E9'], wedgeprops = {"edgecolor":"white", 'linewidth': 0.5, 'antialiased': True}); ax_pie.axis('equal')
-                centre_circle = plt.Circle((0,0),0.75,fc='white'); fig_pie.gca().add_artist(centre_circle)
-                ax_pie.text(0, 0, f"{nemzetkoziesedesi_potencial_num:.0f}%", ha='center', va='center', fontsize=16, fontweight='bold', color=color_reached)
-                st.pyplot(fig_pie, use_container_width=False); plt.close(fig_pie)
+                show_donut(nemzetkoziesedesi_potencial_num)
+            st.write("---"); st.subheader("Bizonytalansági Mód (Monte Carlo)")
+            if st.toggle("Az értékelések bizonytalanságának figyelembevétele", key="mc_mode"):
+                noise_probability = st.slider("Egy fokozatnyi eltérés valószínűsége tényezőnként", min_value=0.0, max_value=1.0, value=DEFAULT_NOISE_PROBABILITY, step=0.05, key="mc_noise_probability")
+                with stage("montecarlo"): mc_result = cached_simulate(st.session_state.selected_factors, noise_probability, model=scoring_model)
+                st.markdown(f"**{mc_result.confidence:.0%}-os intervallum:** {mc_result.ci_low:.1f} % – {mc_result.ci_high:.1f} % (várható érték: {mc_result.mean:.1f} %, {mc_result.samples:_} minta alapján)".replace("_", " "))
+                tier_columns = st.columns(len(mc_result.tier_probabilities))
+                for tier_column, (tier_label, probability) in zip(tier_columns, mc_result.tier_probabilities.items()):
+                    with tier_column: st.metric(label=f"{tier_label.capitalize()} potenciál valószínűsége", value=f"{probability:.1%}")
             st.write("---"); st.subheader("Tényezők Hozzájárulása (Súlyozott Elemzés)")
-            factors_for_viz = pd.DataFrame({'Tényező': ['Innováció', 'Humántőke', 'Pénzügyi stab.', 'Kapcs. háló', 'Tech. fejlettség', 'Pénzügyi korl.', 'Piaci ism. hiánya', 'Digit. komp. hiánya', 'Strat. hiány.'],
-                'Hatás Pont': [s_innovacio * 10, s_humantoke * 10, s_penzugyi_stabilitas * 10, s_kapcsolati_halo * 10, s_technologiai_fejlettseg * 10, (1 - s_korlatozott_penzugyi_forrasok) * -10, (1 - s_piaci_ismeretek_hianya) * -10, (1 - s_hianyos_digitalis_kompetenciak) * -10, (1 - s_vezetesi_strategiai_hianyossagok) * -10]})
-            colors_potential = ['#28a745' if x >= 0 else '#dc3545' for x in factors_for_viz['Hatás Pont']] 
-            fig_pot, ax_pot = plt.subplots(figsize=(10, 4)) 
-            sns.barplot(x='Hatás Pont', y='Tényező', data=factors_for_viz, palette=colors_potential, ax=ax_pot)
-            ax_pot.set_title('Az egyes tényezők hatása a nemzetköziesedési potenciálra', fontsize=14); ax_pot.set_xlabel('Hatás Pontszám', fontsize=10); ax_pot.set_ylabel('Tényező', fontsize=10)
-            ax_pot.set_xlim(-10.5, 10.5); ax_pot.tick_params(axis='x', labelsize=8); ax_pot.tick_params(axis='y', labelsize=8); plt.tight_layout(); st.pyplot(fig_pot); plt.close(fig_pot)
+            show_hatas_pont(hatas_pontok, language)
+            st.write("---"); st.subheader("Összehasonlítás a Referencia-populációval")
+            # A percentilisek előre aggregált gyakoriságokból számolódnak (population.py)
+            try:
+                with stage("population"): population, is_stored_population = reference_population(get_store())
+                if scoring_model.is_reference:
+                    potential_percentile = population.potential_percentile(nemzetkoziesedesi_potencial_num)
+                    st.metric(label="Potenciál percentilis", value=f"{potential_percentile:.0f}.")
+                else:
+                    # A referencia-populáció potenciáljai az alapképlettel készültek, így csak a tényezők vethetők össze
+                    st.info("A potenciál percentilise csak az alapmodellel számolható; alább a tényezőnkénti összehasonlítás látható.")
+                st.caption(f"Referencia: {population.total} tárolt értékelés." if is_stored_population else "Referencia: az összes lehetséges profil (még kevés a tárolt értékelés).")
+                st.dataframe(
+                    [{"Tényező": factor_name, "Értékelés": st.session_state.selected_factors[factor_name],
+                      "Percentilis": f"{percentile:.0f}.",
+                      # Gátló tényezőnél az alacsonyabb értékelés a kedvezőbb
+                      "Kedvezőbb, mint a populáció": f"{(100 - percentile if is_barrier else percentile):.0f} %-a"}
+                     for factor_name, is_barrier, percentile in zip(FACTOR_KEYS, IS_BARRIER, population.factor_percentiles(st.session_state.selected_factors))],
+                    use_container_width=True, hide_index=True)
+            except Exception as e_population: st.error(f"Hiba a referencia-populáció betöltése közben: {e_population}")
+            st.write("---"); st.subheader("Értékelés Mentése")
+            company_name = st.text_input("Cég neve vagy azonosítója (opcionális)", key="store_company")
+            if st.button("Értékelés mentése", key="store_save"):
+                # A profil és a kiszámított pontszámok az SQLite értékelés-tárolóba kerülnek (store.py)
+                try:
+                    assessment_id = get_store().save(st.session_state.selected_factors, company_name.strip() or None)
+                    st.success(f"Az értékelés elmentve (azonosító: {assessment_id}).")
+                except Exception as e_store: st.error(f"Hiba az értékelés mentése közben: {e_store}")
         elif page == "VRIO Elemzés":
             st.header("VRIO-modell elemzés"); st.info("A VRIO-modell... '✓' ... '✗' ...") # ... (tartalom változatlan) ...
-            vrio_data_bool = get_vrio_table_data(innovacio, humantoke, penzugyi_stabilitas, kapcsolati_halo, technologiai_fejlettseg)
-            df_vrio = pd.DataFrame(vrio_data_bool, columns=['Erőforrás', 'Értékes', 'Ritka', 'Utánozhatatlan', 'Szervezett'])
-            styled_df_vrio_styler = df_vrio.style.applymap(highlight_vrio_cells, subset=['Értékes', 'Ritka', 'Utánozhatatlan', 'Szervezett']).set_properties(**{'text-align': 'center', 'font-weight': 'bold'}, subset=['Értékes', 'Ritka', 'Utánozhatatlan', 'Szervezett']).set_properties(**{'text-align': 'left', 'font-weight': 'bold'}, subset=['Erőforrás']).hide(axis="index")
-            formatter_vrio = {col: (lambda x: "✓" if x else "✗") for col in ['Értékes', 'Ritka', 'Utánozhatatlan', 'Szervezett']}
-            st.dataframe(styled_df_vrio_styler.format(formatter_vrio), use_container_width=True, column_config={"Erőforrás": st.column_config.TextColumn(width="large"), "Értékes": st.column_config.TextColumn(width="small"), "Ritka": st.column_config.TextColumn(width="small"), "Utánozhatatlan": st.column_config.TextColumn(width="small"), "Szervezett": st.column_config.TextColumn(width="small")})
+            with stage("vrio"): vrio_data_bool = get_vrio_table_data(innovacio, humantoke, penzugyi_stabilitas, kapcsolati_halo, technologiai_fejlettseg)
+            with stage("styler"): st.dataframe(vrio_table_styler(vrio_data_bool, language), use_container_width=True, column_config={"Erőforrás": st.column_config.TextColumn(width="large"), "Értékes": st.column_config.TextColumn(width="small"), "Ritka": st.column_config.TextColumn(width="small"), "Utánozhatatlan": st.column_config.TextColumn(width="small"), "Szervezett": st.column_config.TextColumn(width="small")})
             st.markdown("<br>", unsafe_allow_html=True)
+        elif page == "Érzékenységvizsgálat":
+            st.header("Érzékenységvizsgálat és \"Mi lenne, ha\" Szimuláció")
+            st.info("Az alábbi táblázat megmutatja, mennyivel változna a nemzetköziesedési potenciál, ha egy-egy tényező értékelése egy fokozattal csökkenne vagy nőne (a többi tényező változatlansága mellett).")
+            # A változások a ±1 lépéses profilok egyetlen vektorizált újrapontozásából számolódnak (sensitivity.py)
+            with stage("sensitivity"): _, sensitivity_rows = sensitivity_table(st.session_state.selected_factors, scoring_model)
+            st.dataframe(
+                [{"Tényező": factor_name, "Jelenlegi érték": value,
+                  "-1 fokozat": "-" if delta_minus is None else f"{delta_minus:+.1f} %",
+                  "+1 fokozat": "-" if delta_plus is None else f"{delta_plus:+.1f} %"}
+                 for factor_name, value, delta_minus, delta_plus in sensitivity_rows],
+                use_container_width=True, hide_index=True)
+            st.markdown("---")
+            st.subheader("Legkevesebb lépés a következő kategóriához")
+            with stage("sensitivity"): targets = tier_targets(st.session_state.selected_factors, scoring_model)
+            if not targets:
+                st.success("A potenciál már a legmagasabb kategóriában van.")
+            for threshold, plan in targets.items():
+                if plan is None:
+                    st.warning(f"A(z) {threshold} % a tényezők javításával sem érhető el."); continue
+                steps, target_potential = plan
+                st.markdown(f"**{threshold} % eléréséhez {len(steps)} fokozatnyi javítás szükséges** (várható potenciál: {target_potential:.1f} %):")
+                for factor_name, (from_value, to_value) in summarize_steps(steps).items():
+                    st.markdown(f"* {factor_name}: {from_value} → {to_value}")
+            st.markdown("---")
+            st.subheader("\"Mi lenne, ha\" szimuláció")
+            whatif_factor = st.selectbox("Tényező", FACTOR_KEYS, key="whatif_factor")
+            whatif_value = st.slider("Új értékelés", min_value=1, max_value=5, value=int(st.session_state.selected_factors[whatif_factor]), key=f"whatif_value_{whatif_factor}")
+            whatif_potential = what_if(st.session_state.selected_factors, {whatif_factor: whatif_value}, scoring_model)
+            st.metric(label="Szimulált Nemzetköziesedési Potenciál", value=f"{whatif_potential:.1f} %", delta=f"{whatif_potential - nemzetkoziesedesi_potencial_num:+.1f} %")
         elif page == "Beszámoló":
-            st.header("Részletes Eredmény Beszámoló"); st.markdown("---") # ... (tartalom a korábban megadott, bővített szöveggel) ...
-            st.write("Ez az oldal összefoglalja és értelmezi a nemzetköziesedési szimulátorban beállított értékek és a számított potenciál alapján levonható főbb következtetéseket.")
-            st.subheader("1. Nemzetköziesedési Potenciál Értékelése")
+            potential_title, factors_title, vrio_title, summary_title = content_bundle.section_titles
+            st.header(content_bundle.report_title); st.markdown("---") # ... (tartalom a korábban megadott, bővített szöveggel) ...
+            st.write(content_bundle.report_intro)
+            # A szövegek előre lefordított sablonokból állnak össze (report.py), profilonként és nyelvenként gyorsítótárazva
+            with stage("report_text"): beszamolo = cached_build_report(st.session_state.selected_factors, scoring_model, language)
+            st.subheader(potential_title)
             col_report1, col_report2 = st.columns([0.7, 0.3])
             with col_report1:
-                st.metric(label="Kiszámított Nemzetköziesedési Potenciál", value=f"{nemzetkoziesedesi_potencial_num:.1f} %")
-                potencial_text = ""
-                if nemzetkoziesedesi_potencial_num < 40: potencial_text = "Ez **alacsony** nemzetköziesedési potenciált jelez. Vállalkozásának jelenleg jelentős belső fejlesztésekre és a gátló tényezők csökkentésére van szüksége a sikeres nemzetközi piacra lépéshez. Az alacsony pontszám arra utal, hogy több kulcsfontosságú területen is elmaradás tapasztalható, ami kockázatossá teszi a külpiaci nyitást megfelelő felkészülés nélkül."
-                elif nemzetkoziesedesi_potencial_num < 70: potencial_text = "Ez **közepes** nemzetköziesedési potenciált mutat. Vállalkozása rendelkezik bizonyos erősségekkel, amelyekre építhet, de vannak még leküzdendő akadályok és fejleszthető területek. A nemzetközi sikeresség érdekében érdemes a gyengeségekre koncentrálni és a meglévő előnyöket tudatosan kiaknázni, mielőtt nagyobb léptékű nemzetközi terjeszkedésbe kezdene."
-                else: potencial_text = "Ez **magas** nemzetköziesedési potenciált jelez. Vállalkozása erős alapokkal rendelkezik a nemzetközi terjeszkedéshez, és jó esélyekkel indulhat a külpiacokon. A magas pontszám azt sugallja, hogy a belső erőforrások és a külső környezet kevésbé gátló tényezői együttesen kedvező helyzetet teremtenek a sikeres nemzetközi jelenléthez."
-                st.markdown(potencial_text)
+                st.metric(label=content_bundle.potential_label, value=f"{nemzetkoziesedesi_potencial_num:.1f} %")
+                st.markdown(beszamolo.potencial_text)
             with col_report2: 
-                labels_pie_rep = 'Elért', 'Hátralévő'; sizes_pie_rep = [nemzetkoziesedesi_potencial_num, 100 - nemzetkoziesedesi_potencial_num]
-                explode_pie_rep = (0.05, 0) if 0 < nemzetkoziesedesi_potencial_num < 100 else (0,0)
-                color_reached_rep = '#D3D3D3'; 
-                if nemzetkoziesedesi_potencial_num < 40: color_reached_rep = '#dc3545'
-                elif nemzetkoziesedesi_potencial_num < 70: color_reached_rep = '#ffc107'
-                else: color_reached_rep = '#28a745'
-                fig_pie_rep, ax_pie_rep = plt.subplots(figsize=(2.5, 2.5)); ax_pie_rep.pie(sizes_pie_rep, explode=explode_pie_rep, labels=None, autopct=None, startangle=90, colors=[color_reached_rep, '#E9E9E9'], wedgeprops = {"edgecolor":"white", 'linewidth': 0.5, 'antialiased': True}); ax_pie_rep.axis('equal')
-                centre_circle_rep = plt.Circle((0,0),0.75,fc='white'); fig_pie_rep.gca().add_artist(centre_circle_rep)
-                ax_pie_rep.text(0, 0, f"{nemzetkoziesedesi_potencial_num:.0f}%", ha='center', va='center', fontsize=16, fontweight='bold', color=color_reached_rep)
-                st.pyplot(fig_pie_rep, use_container_width=False); plt.close(fig_pie_rep)
-            st.markdown("---")
-            st.subheader("2. Főbb Tényezők Részletes Elemzése")
-            támogató_factors = {k:v for k,v in st.session_state.selected_factors.items() if "(Gátló)" not in k and v is not None}
-            gátló_factors = {k:v for k,v in st.session_state.selected_factors.items() if "(Gátló)" in k and v is not None}
-            erős_támogatók = sorted([ (k,v) for k,v in támogató_factors.items() if v >= 4], key=lambda item: item[1], reverse=True)
-            if erős_támogatók:
-                st.markdown("**Erősségek – Kiemelkedő erőforrások, amelyekre építhet a nemzetközi piacokon:**")
-                text_block_strong = "Az elemzés alapján vállalkozása több területen is erős pozíciókkal rendelkezik, amelyek megalapozhatják a nemzetközi sikert. "
-                for factor, value in erős_támogatók[:2]: 
-                    factor_desc_detail = factor_definitions[factor][value].split(': ',1)[1]
-                    text_block_strong += f"Különösen figyelemre méltó a(z) **{factor.lower()}** ({value}/5), amely azt jelenti, hogy vállalata {factor_desc_detail.lower()} Ez komoly versenyelőnyt biztosíthat a külpiacokon, és érdemes erre a képességre tudatosan építeni a nemzetközi stratégiát. "
-                st.markdown(text_block_strong)
-            else: st.markdown("**Erősségek – Kiemelkedő erőforrások:** Jelenleg nincsenek 4-es vagy 5-ös értékelésű támogató erőforrásai. Ez azt jelzi, hogy bár lehetnek stabilan működő területek, a kiemelkedő, nehezen másolható versenyelőnyök még fejlesztésre szorulnak. Érdemes lenne azonosítani és fejleszteni azokat a belső képességeket, amelyekre a nemzetközi terjeszkedés épülhet, vagy a meglévő közepes erőforrásokat magasabb szintre emelni.")
-            st.markdown("<br>", unsafe_allow_html=True)
-            gyenge_támogatók = sorted([ (k,v) for k,v in támogató_factors.items() if v <= 2], key=lambda item: item[1])
-            if gyenge_támogatók:
-                st.markdown("**Fejlesztendő területek – Erőforrások, amelyekre érdemes fókuszálni:**")
-                text_block_weak = "Az értékelés rávilágított néhány olyan belső erőforrásra, amelyek további fejlesztést igényelnek a sikeres nemzetköziesedés érdekében, mivel jelenlegi szintjük korlátozhatja a külpiaci érvényesülést. "
-                for factor, value in gyenge_támogatók[:2]:
-                    factor_desc_detail = factor_definitions[factor][value].split(': ',1)[1]
-                    text_block_weak += f"A(z) **{factor.lower()}** ({value}/5) területén jelentős előrelépésre van szükség, mivel jelenleg vállalata {factor_desc_detail.lower()} Ennek megerősítése kulcsfontosságú lehet a külpiaci versenyképesség javításához és a kockázatok csökkentéséhez. "
-                st.markdown(text_block_weak)
-            else: st.markdown("**Fejlesztendő területek – Erőforrások:** Úgy tűnik, nincsenek kifejezetten alacsony (1-es vagy 2-es) pontszámú támogató erőforrásai, ami pozitív. Azonban a közepes erőforrások további erősítése és a potenciális gyengeségek proaktív kezelése továbbra is fontos lehet a hosszú távú siker érdekében.")
-            st.markdown("<br>", unsafe_allow_html=True)
-            alacsony_gátlók = sorted([ (k,v) for k,v in gátló_factors.items() if v <= 2], key=lambda item: item[1])
-            if alacsony_gátlók:
-                st.markdown("**Kedvező külső tényezők – Alacsony szintű akadályok:**")
-                text_block_low_barrier = "Bizonyos gátló tényezők esetében vállalkozása kedvező helyzetben van, ami megkönnyítheti a nemzetközi piacra lépést és csökkentheti a kapcsolódó kockázatokat. "
-                for factor, value in alacsony_gátlók[:2]:
-                    factor_desc_detail = factor_definitions[factor][value].split(': ',1)[1]
-                    clean_factor_name = factor.replace(' (Gátló)','').lower()
-                    text_block_low_barrier += f"Például a(z) **{clean_factor_name}** ({value}/5) területén alacsony akadályokkal kell szembenéznie, hiszen {factor_desc_detail.lower()} Ezt érdemes kihasználni a stratégiaalkotás során, és fókuszálni azokra a piacokra, ahol ezek a kedvező feltételek érvényesülnek. "
-                st.markdown(text_block_low_barrier)
-            else: st.markdown("**Kedvező külső tényezők – Alacsony szintű akadályok:** Az elemzés nem tárt fel kiemelkedően alacsony (1-es vagy 2-es) pontszámú gátló tényezőket. Ez azt jelenti, hogy több területen is lehetnek kezelendő kihívások, amelyekre fel kell készülni, és proaktívan kell kezelni a potenciális nehézségeket.")
-            st.markdown("<br>", unsafe_allow_html=True)
-            magas_gátlók = sorted([ (k,v) for k,v in gátló_factors.items() if v >= 4], key=lambda item: item[1], reverse=True)
-            if magas_gátlók:
-                st.markdown("**Kritikus kihívások – Jelentős akadályok, amelyekre kiemelt figyelmet kell fordítani:**")
-                text_block_high_barrier = "Vannak olyan tényezők, amelyek jelenleg komoly akadályt gördíthetnek a nemzetközi terjeszkedés útjába, és amelyek kezelése elengedhetetlen a sikerhez. Ezek figyelmen kívül hagyása jelentős kockázatokat hordozhat. "
-                for factor, value in magas_gátlók[:2]:
-                    factor_desc_detail = factor_definitions[factor][value].split(': ',1)[1]
-                    clean_factor_name = factor.replace(' (Gátló)','').lower()
-                    text_block_high_barrier += f"Különösen nagy kihívást jelenthet a(z) **{clean_factor_name}** ({value}/5), mivel {factor_desc_detail.lower()} Ezen akadályok csökkentése vagy kiküszöbölése, illetve a rájuk adott stratégiai válasz prioritást kell, hogy élvezzen a nemzetköziesedési tervek kidolgozása során. "
-                st.markdown(text_block_high_barrier)
-            else: st.markdown("**Kritikus kihívások – Jelentős akadályok:** Az értékelés alapján úgy tűnik, nincsenek kiemelkedően magas (4-es vagy 5-ös) pontszámú gátló tényezői, ami biztató. Ez csökkenti a közvetlen, súlyos kockázatokat, de a közepes szintű akadályokra is figyelmet kell fordítani és stratégiát kell kidolgozni azok hatékony kezelésére.")
-            st.markdown("---")
-            st.subheader("3. VRIO Elemzés Kulcsfontosságú Megállapításai")
-            vrio_data = get_vrio_table_data(innovacio, humantoke, penzugyi_stabilitas, kapcsolati_halo, technologiai_fejlettseg)
-            vrio_paragraphs = []
-            for row in vrio_data:
-                eroforras, v, r, i, o = row; sentence_parts = []
-                if v: sentence_parts.append("értékesnek minősül, mivel hozzájárul a vevői értékteremtéshez vagy a költséghatékonysághoz")
-                else: sentence_parts.append("jelenlegi formájában nem feltétlenül tekinthető közvetlenül értékesnek a nemzetközi versenyben, vagy fejlesztésre szorul ezen a téren")
-                if r: sentence_parts.append("ritka a piacon, azaz kevés versenytárs rendelkezik hasonlóval")
-                else: sentence_parts.append("nem tekinthető ritkának, így mások is hozzáférhetnek vagy rendelkezhetnek vele")
-                if i: sentence_parts.append("nehezen másolható vagy helyettesíthető a versenytársak által, ami védelmet nyújthat")
-                else: sentence_parts.append("viszonylag könnyen utánozható vagy helyettesíthető lehet, ami csökkenti a belőle származó előnyt")
-                if o: sentence_parts.append("és vállalata szervezeti felépítése, folyamatai és kultúrája támogatják annak hatékony kihasználását és a benne rejlő érték maximalizálását")
-                else: sentence_parts.append("azonban a szervezeti felkészültség, a belső folyamatok vagy a vállalati kultúra hiányosságai korlátozhatják a benne rejlő potenciál teljes körű kiaknázását, még ha az erőforrás önmagában értékes is lenne")
-                vrio_desc = f"A(z) **{eroforras.lower()}** az elemzés alapján {', '.join(sentence_parts)}."
-                if v and r and i and o: vrio_desc += " Mindezek alapján ez az erőforrás **tartós versenyelőnyt** biztosíthat Önnek a nemzetközi piacokon, amelyre hosszú távon is építhet stratégiát, mivel nehezen támadható és fenntartható."
-                elif v and r and o: vrio_desc += " Ezáltal **ideiglenes versenyelőnyt** jelenthet, amíg a versenytársak nem képesek hasonló erőforrást vagy képességet kiépíteni. Fontos a folyamatos fejlesztés és az előny megőrzésére irányuló törekvés."
-                elif v and o: vrio_desc += " Így **versenyparitást** érhet el a piacon, de önmagában ez nem garantál kiemelkedő, megkülönböztetett pozíciót. Más tényezőkkel kombinálva lehet erősebb."
-                else: vrio_desc += " Ez a jelenlegi formájában és kiaknázottságában **versenyhátrányt** is jelenthet, vagy kevésbé bír relevanciával a nemzetközi siker szempontjából. Érdemes megfontolni ezen erőforrás fejlesztését vagy alternatívák keresését."
-                vrio_paragraphs.append(vrio_desc)
-            for par in vrio_paragraphs: st.markdown(par); st.markdown(" ") 
+                show_donut(nemzetkoziesedesi_potencial_num)
             st.markdown("---")
-            st.subheader("4. Összegzés és Javasolt Következő Lépések")
-            st.markdown("Ez a szimuláció egy pillanatképet adott vállalkozása nemzetköziesedési felkészültségéről...")
-            st.markdown("A konkrét, személyre szabott teendőkért... **tekintse meg a 'Gyakorlati Javaslatok' oldalt**...")
-            st.markdown("Ne feledje, a nemzetköziesedés egy folyamatos... Sok sikert kívánunk!")
+            with stage("report_send"):
+                st.subheader(factors_title)
+                for group_index, blocks in enumerate(beszamolo.factor_blocks):
+                    for block in blocks: st.markdown(block)
+                    if group_index < len(beszamolo.factor_blocks) - 1: st.markdown("<br>", unsafe_allow_html=True)
+                st.markdown("---")
+                st.subheader(vrio_title)
+                for par in beszamolo.vrio_paragraphs: st.markdown(par); st.markdown(" ") 
+                st.markdown("---")
+                st.subheader(summary_title)
+                for summary_text in content_bundle.summary_texts: st.markdown(summary_text)
+                st.markdown("---")
+            with stage("pdf"): show_pdf_download(st.session_state.selected_factors, key="pdf_download_report", model=scoring_model, language=language)
 
         elif page == "Gyakorlati Javaslatok":
-            st.header("Gyakorlati Javaslatok a Nemzetköziesedéshez")
+            st.header(content_bundle.recommendations_title)
             box_style = get_status_box_style(nemzetkoziesedesi_potencial_num) 
-            message_javaslat = ""; javaslat_reszlet = ""
-            # MÓDOSÍTVA: Részletesebb javaslatok
-            javaslat_alacsony_text = """
-            * **Pénzügyi alapok megerősítése:** Alaposan vizsgálja meg a rendelkezésre álló kedvezményes hitelkonstrukciókat, hazai és uniós pályázati lehetőségeket (pl. GINOP Plusz, Horizon Europe keretprogramok, EIC Accelerator), valamint a kockázati tőkebefektetési opciókat, amelyek segíthetnek a nemzetköziesedés kezdeti, tőkeigényes szakaszának finanszírozásában. Készítsen részletes, több forgatókönyvre épülő pénzügyi tervet a várható költségekről, a szükséges befektetésekről és a lehetséges megtérülési időről.
-            * **Piaci ismeretek és kompetenciák bővítése:** Kezdjen mélyreható, célzott piackutatást a potenciális célországokról. Ez foglalja magában a versenytársak alapos elemzését, a helyi fogyasztói igények és preferenciák megértését, valamint a jogi, adózási és kereskedelmi szabályozási környezet részletes feltárását. Fontolja meg nemzetközi tapasztalattal rendelkező tanácsadók vagy piackutató cégek bevonását, akik helyismerettel rendelkeznek.
-            * **Digitális felkészültség és online jelenlét erősítése:** Fektessen be modern, többnyelvű e-kereskedelmi platformokba, ha termékeit online kívánja értékesíteni. Fejlessze célzott online marketing stratégiáját (keresőoptimalizálás - SEO, nemzetközi közösségi média kampányok, célzott hirdetések, releváns tartalommarketing), és biztosítsa a megfelelő digitális infrastruktúrát (pl. CRM rendszer, ügyfélszolgálati eszközök) a nemzetközi vevők hatékony kiszolgálásához.
-            * **Belső erőforrások és képességek fejlesztése:** Azonosítsa azokat a kulcsfontosságú belső erőforrásokat (pl. innovációs kapacitás, humántőke), amelyek jelenleg alacsony szinten állnak, és dolgozzon ki egy tervet ezek fejlesztésére. Ez magában foglalhatja képzéseket, új technológiák bevezetését vagy a belső folyamatok újraszervezését.
-            """
-            javaslat_kozepes_text = """
-            * **Innováció és termékfejlesztés nemzetközi fókusszal:** Folyamatosan fejlessze termékeit és szolgáltatásait úgy, hogy azok megfeleljenek a kiválasztott célpiacok specifikus igényeinek és elvárásainak. Keresse aktívan a K+F együttműködési lehetőségeket hazai és nemzetközi partnerekkel, vegyen részt iparági innovációs programokban, és kövesse figyelemmel a globális technológiai és piaci trendeket. Fontolja meg termékei adaptálását (pl. csomagolás, funkciók, nyelvi lokalizáció).
-            * **Humántőke célzott fejlesztése:** Biztosítson célzott képzéseket és nyelvi kurzusokat munkatársainak, különös tekintettel a nemzetközi üzleti kommunikációra, tárgyalástechnikára és a célországok kulturális sajátosságaira. Fontolja meg nemzetközi tapasztalattal rendelkező szakemberek alkalmazását kulcspozíciókba, vagy vegyen igénybe külső tanácsadást a nemzetközi menedzsmenti ismeretek bővítésére.
-            * **Kapcsolati háló tudatos építése és partnerkeresés:** Vegyen részt aktívan releváns nemzetközi üzleti fórumokon, szakmai kiállításokon és vásárokon a potenciális partnerek (disztribútorok, ügynökök, vevők) felkutatása érdekében. Csatlakozzon nemzetközi szakmai szervezetekhez és kereskedelmi kamarákhoz, használja ki a diplomáciai képviseletek által nyújtott üzletfejlesztési lehetőségeket.
-            * **Gátló tényezők proaktív kezelése:** Azonosítsa azokat a gátló tényezőket, amelyek közepes vagy magas kockázatot jelentenek, és dolgozzon ki stratégiákat ezek csökkentésére vagy kezelésére. Ez lehet például a pénzügyi források diverzifikálása, a piaci ismeretek mélyítése célzott kutatásokkal, vagy a digitális kompetenciák fejlesztése.
-            """
-            javaslat_magas_text = """
-            * **Stratégiai partnerségek és szövetségek kialakítása:** Keressen hosszú távú, kölcsönösen előnyös stratégiai szövetségeket és partnerségeket a célpiacokon, mint például megbízható disztribútorok, helyi gyártási partnerek, vagy hozzon létre közös vállalatokat. Ezek a kapcsolatok jelentősen segíthetik a piaci behatolást, a helyi ismeretek megszerzését és a működési kockázatok megosztását.
-            * **Folyamatos innováció és piacvezető pozícióra törekvés:** Maradjon a technológiai és piaci trendek élén, fektessen be a legújabb megoldásokba, és gyűjtsön aktívan, rendszeresen vevői visszajelzéseket a termékek és szolgáltatások folyamatos tökéletesítése, valamint új piaci igények azonosítása érdekében. Törekedjen arra, hogy megkülönböztesse magát a versenytársaktól és erősítse piaci pozícióját.
-            * **Kockázatkezelési stratégiák finomítása és diverzifikáció:** Fejlessze tovább és alkalmazza következetesen a nemzetközi kereskedelemmel járó komplex kockázatok (pl. devizaárfolyam-ingadozás, politikai és gazdasági instabilitás a célországokban, kintlévőségek kezelése, logisztikai kihívások) kezelésére vonatkozó stratégiákat. Fontolja meg exportbiztosítások és egyéb pénzügyi kockázatcsökkentő eszközök használatát. Vizsgálja meg a piaci diverzifikáció lehetőségét több ország vagy régió felé a kockázatok porlasztása érdekében.
-            * **Márkaépítés és nemzetközi jelenlét erősítése:** Fektessen be a nemzetközi márkaismertség növelésébe és a pozitív vállalati imázs kialakításába a célpiacokon. Használja hatékonyan a digitális marketing eszközöket, és vegyen részt presztízsértékű nemzetközi eseményeken a láthatóság növelése érdekében.
-            """
-            if nemzetkoziesedesi_potencial_num < 40:
-                message_javaslat = "Alacsony nemzetköziesedési potenciál. Erős fókuszra van szükség a belső erőforrások fejlesztésére!"
-                st.markdown(f'<div style="{box_style}">{message_javaslat}</div>', unsafe_allow_html=True); st.markdown(javaslat_alacsony_text)
-            elif 40 <= nemzetkoziesedesi_potencial_num < 70:
-                message_javaslat = "Közepes nemzetköziesedési potenciál. Vannak erősségei, de a gátló tényezők leküzdése kritikus!"
-                st.markdown(f'<div style="{box_style}">{message_javaslat}</div>', unsafe_allow_html=True); st.markdown(javaslat_kozepes_text)
-            else: 
-                message_javaslat = "Magas nemzetköziesedési potenciál! Fókuszáljon a fenntartható növekedésre és a piacvezető pozíció megszerzésére."
-                st.markdown(f'<div style="{box_style}">{message_javaslat}</div>', unsafe_allow_html=True); st.markdown(javaslat_magas_text)
+            # A javaslatok szövegei kategóriánként a nyelvi csomagban vannak
+            potencial_tier = get_potential_tier(nemzetkoziesedesi_potencial_num)
+            st.markdown(f'<div style="{box_style}">{content_bundle.javaslat_messages[potencial_tier]}</div>', unsafe_allow_html=True); st.markdown(content_bundle.javaslat_texts[potencial_tier])
+            st.markdown("---")
+            with stage("pdf"): show_pdf_download(st.session_state.selected_factors, key="pdf_download_javaslatok", model=scoring_model, language=language)
+
+# --- Gyorsítótár statisztika (az oldal felépítése után, hogy az aktuális futás is benne legyen) ---
+if SHOW_CACHE_STATS:
+    # Folyamatszintű gyorsítótárak (cache.py): elemszám, találati arány, becsült memória
+    with st.sidebar.expander("Gyorsítótár statisztika"):
+        st.dataframe(
+            [{"Gyorsítótár": name, "Elemek": f"{stats['entries']}/{stats['maxsize']}", "Találati arány": f"{stats['hit_rate']:.0%}",
+              "Memória (kB)": round(stats["bytes"] / 1024, 1)}
+             for name, stats in cache_stats().items()],
+            use_container_width=True, hide_index=True)
+
+# --- Időmérés lezárása: naplósor és oldalankénti összesítés (instrumentation.py) ---
+finish_rerun(page)
+if INSTRUMENTATION_ENABLED:
+    with st.sidebar.expander("Időmérés (aktuális oldal)"):
+        st.dataframe(
+            [{"Szakasz": name, "Futások": values["count"], "Átlag (ms)": round(values["mean_ms"], 1), "Max (ms)": round(values["max_ms"], 1)}
+             for name, values in sorted(page_stats().get(page, {}).items(), key=lambda item: -item[1]["mean_ms"])],
+            use_container_width=True, hide_index=True)
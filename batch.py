@@ -0,0 +1,277 @@
+"""
+Kkv profilok kötegelt pontozása parancssorból, Streamlit indítása nélkül.
+
+Használat:
+    python batch.py bemenet.csv kimenet.csv
+    python batch.py bemenet.parquet kimenet.parquet --chunksize 200000
+    python batch.py bemenet.csv kimenet.csv --lut
+    python batch.py bemenet.csv kimenet.csv --vrio-rules alternativ_kalibracio.json
+    python batch.py bemenet.csv kimenet.csv --store assessments.sqlite3 --id-column ceg
+    python batch.py bemenet.csv kimenet.csv --all-models
+
+A --lut kapcsolóval a pontozás az előre kiszámított keresőtáblából (lookup_table.py)
+történik, soronkénti újraszámolás helyett. A --vrio-rules kapcsolóval alternatív
+VRIO szabálytábla (vrio_rules.json szerkezetű) adható meg. A --store kapcsolóval az
+érvényes sorok a pontszámokkal együtt az értékelés-tárolóba (store.py) is bekerülnek.
+Az --all-models kapcsolóval minden pontozási modell (scoring_models.py, models/*.json)
+potenciálja és kategóriája külön oszlopba kerül; ez darabonként egyetlen mátrixszorzás.
+
+A bemenet oszlopai a tényezők teljes nevei (factor_definitions kulcsai) vagy a rövid
+kódok (FACTOR_CODES) lehetnek; a többi oszlop (pl. cégazonosító) változatlanul továbbmegy.
+A fájl darabokban (chunk) kerül feldolgozásra, így a memóriahasználat a bemenet
+méretétől független. A nem szám, hiányzó vagy 1-5 tartományon kívüli értéket tartalmazó
+sorok érvénytelenként, üres eredményoszlopokkal kerülnek a kimenetbe.
+"""
+import argparse
+import sys
+import time
+from contextlib import nullcontext
+
+import numpy as np
+import pandas as pd
+
+from lookup_table import load_table, lookup, unpack_vrio_mask
+from scoring import TIER_LABELS, frame_ratings, get_potential_tier, resolve_factor_columns, score_profiles
+from scoring_models import get_registry
+from store import AssessmentStore
+from vrio import VERDICT_LABELS, VRIO_CRITERIA, get_rule_set, load_rules
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def vrio_output_columns(rule_set):
+    return [f"{resource} - {criterion}" for resource in rule_set.resources for criterion in VRIO_CRITERIA]
+
+
+def verdict_output_columns(rule_set):
+    return [f"{resource} - Versenyelőny" for resource in rule_set.resources]
+
+
+def output_schema(df, rule_set, registry=None, input_schema=None):
+    """
+    A Parquet kimenet rögzített sémája. Az eredményoszlopok típusa akkor is rögzített, ha a darab
+    minden sora érvénytelen; a tényezőoszlopok számként kerülnek ki. A többi átmenő oszlop Parquet
+    bemenetnél (input_schema) a bemeneti típussal, CSV bemenetnél szövegként, hogy egy későbbi
+    darab eltérő értékei (pl. "1001" után "A-3") se vesszenek el.
+    """
+    import pyarrow as pa
+    result_types = {"Nemzetköziesedési potenciál": pa.float64(), "Kategória": pa.string()}
+    if registry is not None:
+        for name in registry.names:
+            result_types[f"Nemzetköziesedési potenciál ({name})"] = pa.float64()
+            result_types[f"Kategória ({name})"] = pa.string()
+    result_types.update({column: pa.bool_() for column in vrio_output_columns(rule_set)})
+    result_types.update({column: pa.string() for column in verdict_output_columns(rule_set)})
+    factor_columns = set(resolve_factor_columns(df.columns))
+    input_names = set(input_schema.names) if input_schema is not None else set()
+    fields = []
+    for column in df.columns:
+        if column in result_types:
+            fields.append(pa.field(column, result_types[column]))
+        elif column in factor_columns:
+            fields.append(pa.field(column, pa.float64()))
+        elif column in input_names and not pa.types.is_null(input_schema.field(column).type):
+            fields.append(pa.field(column, input_schema.field(column).type))
+        else:
+            fields.append(pa.field(column, pa.string()))
+    return pa.schema(fields)
+
+
+def _input_schema(path):
+    # Parquet bemenet Arrow sémája (az átmenő oszlopok típusához); CSV-nél None
+    if not str(path).lower().endswith(".parquet"):
+        return None
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Parquet bemenethez a 'pyarrow' csomag szükséges (pip install pyarrow).")
+    return pq.read_schema(path)
+
+
+def _as_text(column):
+    # Szövegoszlop értékei: a hiányzó érték üres marad, minden más szöveggé alakul
+    return column.map(lambda value: None if pd.isna(value) else str(value)).astype(object)
+
+
+def score_chunk(df, table=None, rule_set=None, registry=None):
+    """
+    Egy DataFrame darab pontozása. Visszaadja a kiegészített DataFrame-et és az érvénytelen sorok számát.
+    Ha a keresőtábla (table) meg van adva, abból olvassuk ki az eredményeket; a pontozási modellek
+    regiszterének (registry) megadásakor minden modell eredménye is bekerül.
+    """
+    rule_set = rule_set or get_rule_set()
+    ratings, valid = frame_ratings(df)
+
+    out = df.copy()
+    potential = np.full(len(df), np.nan)
+    tier = np.full(len(df), None, dtype=object)
+    vrio_columns = vrio_output_columns(rule_set)
+    verdict_columns = verdict_output_columns(rule_set)
+    vrio = np.full((len(df), len(vrio_columns)), None, dtype=object)
+    verdicts = np.full((len(df), len(verdict_columns)), None, dtype=object)
+
+    if len(ratings) and table is not None:
+        lut_potential, lut_tier, lut_vrio = lookup(table, ratings)
+        potential[valid] = lut_potential
+        tier[valid] = np.asarray(TIER_LABELS, dtype=object)[lut_tier]
+        flags = unpack_vrio_mask(lut_vrio, len(rule_set.resources))
+    elif len(ratings):
+        result = score_profiles(ratings)
+        potential[valid] = result.potential
+        tier[valid] = np.asarray(TIER_LABELS, dtype=object)[get_potential_tier(result.potential)]
+        flags = rule_set.evaluate(ratings)
+    if len(ratings):
+        vrio[valid] = flags.reshape(len(ratings), -1)
+        verdicts[valid] = np.asarray(VERDICT_LABELS, dtype=object)[rule_set.verdicts(flags)]
+
+    out["Nemzetköziesedési potenciál"] = potential
+    out["Kategória"] = tier
+    if registry is not None:
+        model_potentials = np.full((len(df), len(registry)), np.nan)
+        model_tiers = np.full((len(df), len(registry)), None, dtype=object)
+        if len(ratings):
+            model_potentials[valid] = registry.score_all(ratings)
+            model_tiers[valid] = np.asarray(TIER_LABELS, dtype=object)[get_potential_tier(model_potentials[valid])]
+        for model_index, name in enumerate(registry.names):
+            out[f"Nemzetköziesedési potenciál ({name})"] = model_potentials[:, model_index]
+            out[f"Kategória ({name})"] = model_tiers[:, model_index]
+    for col_index, column in enumerate(vrio_columns):
+        out[column] = vrio[:, col_index]
+    for col_index, column in enumerate(verdict_columns):
+        out[column] = verdicts[:, col_index]
+    return out, int((~valid).sum())
+
+
+def _input_row_count(path):
+    # Parquet-nél a metaadatokból; CSV-nél a sortörések száma a fejléc nélkül (az idézőjelen
+    # belüli sortörések miatt felső becslés, ami a tömeges betöltés eldöntéséhez elég)
+    if str(path).lower().endswith(".parquet"):
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).metadata.num_rows
+    lines = 0
+    last = b"\n"
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            lines += block.count(b"\n")
+            last = block[-1:]
+    return max(lines + (last != b"\n") - 1, 0)
+
+
+def _iter_input_chunks(path, chunksize):
+    if str(path).lower().endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet bemenethez a 'pyarrow' csomag szükséges (pip install pyarrow).")
+        parquet_file = pq.ParquetFile(path)
+        for record_batch in parquet_file.iter_batches(batch_size=chunksize):
+            yield record_batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+class _ChunkWriter:
+    # CSV-hez hozzáfűzés, Parquet-hez egy nyitott ParquetWriter darabonként. A Parquet séma az első
+    # darabból a schema_for függvénnyel készül, és minden további darab erre a sémára alakul: a
+    # tényezőoszlopok számmá (a nem szám érték üres), a szöveges oszlopok szöveggé. Más oszlopnál
+    # a sémába nem illő érték hibát ad, nem vész el csendben.
+    def __init__(self, path, schema_for=None):
+        self.path = str(path)
+        self.is_parquet = self.path.lower().endswith(".parquet")
+        self.schema_for = schema_for
+        self._parquet_writer = None
+        self._schema = None
+        self._first = True
+
+    def write(self, df):
+        if self.is_parquet:
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise SystemExit("Parquet kimenethez a 'pyarrow' csomag szükséges (pip install pyarrow).")
+            if self._parquet_writer is None:
+                self._schema = self.schema_for(df) if self.schema_for else pa.Table.from_pandas(df, preserve_index=False).schema
+                self._parquet_writer = pq.ParquetWriter(self.path, self._schema)
+            factor_columns = set(resolve_factor_columns(df.columns))
+            conversions = {}
+            for field in self._schema:
+                column = df[field.name]
+                if field.name in factor_columns:
+                    # Hibás tényezőérték (pl. szöveg) üresként kerül ki; a sor érvénytelen
+                    if column.dtype == object:
+                        conversions[field.name] = pd.to_numeric(column, errors="coerce")
+                elif pa.types.is_string(field.type) and pd.api.types.infer_dtype(column, skipna=True) not in ("string", "empty"):
+                    conversions[field.name] = _as_text(column)
+            if conversions:
+                df = df.assign(**conversions)
+            self._parquet_writer.write_table(pa.Table.from_pandas(df, schema=self._schema, preserve_index=False))
+        else:
+            df.to_csv(self.path, mode="w" if self._first else "a", header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def store_chunk(store, scored, id_column=None):
+    """
+    Egy pontozott darab érvényes sorainak mentése az értékelés-tárolóba; a mentett sorok száma.
+    """
+    ratings, valid = frame_ratings(scored)
+    if not valid.any():
+        return 0
+    companies = scored.loc[valid, id_column].tolist() if id_column else None
+    return store.save_many(ratings, companies, scored.loc[valid, "Nemzetköziesedési potenciál"].to_numpy())
+
+
+def run(input_path, output_path, chunksize=DEFAULT_CHUNKSIZE, use_lut=False, rules_path=None, store_path=None,
+        id_column=None, all_models=False, log=sys.stderr):
+    rule_set = load_rules(rules_path) if rules_path else get_rule_set()
+    registry = get_registry() if all_models else None
+    table = load_table(rule_set=rule_set) if use_lut else None
+    store = AssessmentStore(store_path) if store_path else None
+    input_schema = _input_schema(input_path) if str(output_path).lower().endswith(".parquet") else None
+    writer = _ChunkWriter(output_path, schema_for=lambda df: output_schema(df, rule_set, registry, input_schema))
+    total_rows = 0
+    total_invalid = 0
+    started = time.perf_counter()
+    # Nagy bemenetnél (a store.is_bulk_load szabálya szerint, a teljes sorszámmal) az indexek a
+    # futás végén egyszer épülnek újra; kis bemenetnél a meglévő indexek maradnak
+    bulk = store is not None and store.is_bulk_load(_input_row_count(input_path))
+    bulk_load = store.bulk_load() if bulk else nullcontext()
+    with bulk_load:
+        try:
+            for chunk in _iter_input_chunks(input_path, chunksize):
+                scored, invalid = score_chunk(chunk, table, rule_set, registry)
+                writer.write(scored)
+                if store is not None:
+                    store_chunk(store, scored, id_column)
+                total_rows += len(chunk)
+                total_invalid += invalid
+                print(f"{total_rows} sor feldolgozva...", file=log)
+        finally:
+            writer.close()
+    elapsed = time.perf_counter() - started
+    print(f"Kész: {total_rows} sor, {total_invalid} érvénytelen, {elapsed:.2f} s", file=log)
+    return total_rows, total_invalid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kkv profilok kötegelt pontozása (potenciál, VRIO, kategória).")
+    parser.add_argument("input", help="Bemeneti CSV vagy Parquet fájl")
+    parser.add_argument("output", help="Kimeneti CSV vagy Parquet fájl")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Egyszerre feldolgozott sorok száma")
+    parser.add_argument("--lut", action="store_true", help="Pontozás az előre kiszámított keresőtáblából")
+    parser.add_argument("--vrio-rules", help="Alternatív VRIO szabálytábla (JSON)")
+    parser.add_argument("--store", help="Az eredmények mentése ebbe az SQLite értékelés-tárolóba")
+    parser.add_argument("--id-column", help="A tárolóba cégazonosítóként mentett oszlop")
+    parser.add_argument("--all-models", action="store_true", help="Pontozás az összes pontozási modellel is (models/*.json)")
+    args = parser.parse_args(argv)
+    run(args.input, args.output, chunksize=args.chunksize, use_lut=args.lut, rules_path=args.vrio_rules,
+        store_path=args.store, id_column=args.id_column, all_models=args.all_models)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Terheléses teszt: N szimulált felhasználó egyszerre, egyetlen app.py folyamatban.
+
+Minden felhasználó egy külön szálon futó Streamlit AppTest munkamenet, amely végigjárja
+a szokásos utat: a "Kkv Jellemzők Beállítása" oldalon egyenként beállítja a kilenc
+tényezőt, majd megnyitja az összes elemző oldalt (app.py analysis_pages). Minden
+interakció egy újrafuttatás (rerun); ezek idejét mérjük, és a végén p50/p95/p99
+késleltetést, valamint átbocsátást (rerun/s) jelentünk, oldalanként is.
+
+A szálak ugyanazon a folyamaton osztoznak, mint a valódi szerver munkamenetei, így a
+folyamatszintű gyorsítótárak és a GIL hatása is látszik a mérésben. Az AppTest magában
+nem szálbiztos (futásonként globális Runtime példányt állít be és töröl, és minden futásnál
+újrafordítja a szkriptet), ezért a mérés előtt egyetlen közös Runtime-ot és ScriptCache-t
+állítunk be, ahogyan a valódi szerver is egyet használ az összes munkamenethez.
+Ez a Streamlit belső (nem nyilvános) felépítésére épül, ezért csak a SUPPORTED_STREAMLIT
+verzióval ellenőrzött; más verzión, vagy ha a felülírt belső elemek hiányoznak, a mérés
+hibaüzenettel leáll (--any-streamlit: más verzión is megkísérli).
+
+Használat (a repó gyökeréből):
+    python benchmarks/loadtest.py --users 8 [--rounds 2] [--same-profile] [--seed 1]
+"""
+import argparse
+import contextlib
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from factors import FACTOR_KEYS  # noqa: E402
+
+APP_PATH = os.path.join(REPO_ROOT, "app.py")
+SETTINGS_PAGE = "Kkv Jellemzők Beállítása"
+# Az app.py analysis_pages listája
+ANALYSIS_PAGES = ["Nemzetköziesedési Potenciál", "VRIO Elemzés", "Érzékenységvizsgálat", "Beszámoló", "Gyakorlati Javaslatok"]
+PERCENTILES = (50, 95, 99)
+# A közös Runtime / ScriptCache felülírása ezzel a Streamlit verzióval (fő.al) ellenőrzött
+SUPPORTED_STREAMLIT = "1.65"
+
+_config_patch = None
+
+
+class UserResult:
+    """
+    Egy szimulált felhasználó mérései: (lépés, másodperc) párok és az esetleges hiba.
+    """
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.timings = []
+        self.error = None
+
+
+def check_streamlit_version(allow_other=False):
+    """
+    A telepített Streamlit verzió ellenőrzése; nem támogatott verziónál SystemExit.
+    """
+    import streamlit
+
+    version = ".".join(streamlit.__version__.split(".")[:2])
+    if version != SUPPORTED_STREAMLIT and not allow_other:
+        raise SystemExit(f"A terheléses teszt a Streamlit belső felépítésére épül, és csak a {SUPPORTED_STREAMLIT}.x "
+                         f"verzióval ellenőrzött (telepítve: {streamlit.__version__}). "
+                         f"Telepítse: pip install 'streamlit=={SUPPORTED_STREAMLIT}.*', vagy futtassa --any-streamlit kapcsolóval.")
+
+
+def prepare_concurrent_apptest():
+    """
+    Közös Runtime, ScriptCache és konfiguráció az összes szálon futó AppTest munkamenethez.
+    Ha a felülírt belső elemek hiányoznak (más Streamlit verzió), SystemExit.
+    """
+    from unittest.mock import MagicMock
+
+    try:
+        from streamlit.runtime import Runtime
+        from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+        from streamlit.runtime.dataframe_source_manager import DataframeSourceManager
+        from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+        from streamlit.runtime.media_file_manager import MediaFileManager
+        from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+        from streamlit.testing.v1 import app_test, local_script_runner
+        from streamlit.testing.v1.util import patch_config_options
+    except ImportError as e:
+        raise SystemExit(f"Nem támogatott Streamlit verzió: hiányzó belső modul ({e}); támogatott: {SUPPORTED_STREAMLIT}.x")
+    patched = {"Runtime": Runtime, "app_test": app_test, "local_script_runner": local_script_runner}
+    missing = [f"{owner}.{name}" for owner, name in (("Runtime", "instance"), ("Runtime", "exists"), ("app_test", "ScriptCache"),
+                                                     ("local_script_runner", "ScriptCache"), ("app_test", "patch_config_options"))
+               if not hasattr(patched[owner], name)]
+    if missing:
+        raise SystemExit(f"Nem támogatott Streamlit verzió: hiányzó belső elem(ek): {', '.join(missing)}; támogatott: {SUPPORTED_STREAMLIT}.x")
+
+    shared_runtime = MagicMock(spec=Runtime)
+    shared_runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    shared_runtime.cache_storage_manager = MemoryCacheStorageManager()
+    shared_runtime.dataframe_source_mgr = DataframeSourceManager()
+    Runtime.instance = classmethod(lambda cls: shared_runtime)
+    Runtime.exists = classmethod(lambda cls: True)
+
+    shared_script_cache = ScriptCache()
+    # Az app.py fordítása előre, egy szálon: az első rerunok egyidejű ast.parse hívásai
+    # (Python 3.11) "AST constructor recursion depth mismatch" hibával elszállhatnak
+    shared_script_cache.get_bytecode(APP_PATH)
+    app_test.ScriptCache = lambda: shared_script_cache
+    local_script_runner.ScriptCache = lambda: shared_script_cache
+
+    # A konfiguráció felülírása egyszer, a teljes mérésre (szálanként nem lenne szálbiztos);
+    # a kontextuskezelőre mutató hivatkozást meg kell tartani, különben a felülírás megszűnik
+    global _config_patch
+    _config_patch = patch_config_options({"global.appTest": True})
+    _config_patch.__enter__()
+    app_test.patch_config_options = lambda overrides: contextlib.nullcontext()
+
+
+def _timed_run(result, step, action):
+    started = time.perf_counter()
+    at = action()
+    result.timings.append((step, time.perf_counter() - started))
+    if at.exception:
+        raise RuntimeError(f"{step}: {at.exception[0].message}")
+    return at
+
+
+def simulate_user(result, profile, rounds, start_barrier):
+    """
+    Egy felhasználó teljes útja; a start_barrier a szálak egyidejű indulását biztosítja.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    try:
+        start_barrier.wait()
+        at = AppTest.from_file(APP_PATH, default_timeout=300)
+        _timed_run(result, "Bevezető", at.run)
+        _timed_run(result, SETTINGS_PAGE, lambda: at.sidebar.radio(key="navigation_radio").set_value(SETTINGS_PAGE).run())
+        for factor_name, value in zip(FACTOR_KEYS, profile):
+            selectbox = next(sb for sb in at.selectbox if sb.label == f"Értékelés - {factor_name}")
+            _timed_run(result, "Tényező beállítása", lambda: selectbox.set_value(value).run())
+        if [at.session_state.selected_factors[factor_name] for factor_name in FACTOR_KEYS] != list(profile):
+            raise RuntimeError("A tényezők beállítása nem sikerült, az elemző oldalak nem mérhetők.")
+        for _ in range(rounds):
+            for page in ANALYSIS_PAGES:
+                _timed_run(result, page, lambda: at.sidebar.radio(key="navigation_radio").set_value(page).run())
+    except Exception as e:
+        result.error = e
+
+
+def run_load_test(users, rounds=1, same_profile=False, seed=None):
+    rng = random.Random(seed)
+    shared_profile = [rng.randint(1, 5) for _ in FACTOR_KEYS]
+    results = [UserResult(user_id) for user_id in range(users)]
+    start_barrier = threading.Barrier(users)
+    threads = []
+    for result in results:
+        profile = shared_profile if same_profile else [rng.randint(1, 5) for _ in FACTOR_KEYS]
+        thread = threading.Thread(target=simulate_user, args=(result, profile, rounds, start_barrier), name=f"loadtest-user-{result.user_id}")
+        threads.append(thread)
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - started
+
+
+def _percentile_row(label, samples):
+    values = np.percentile(np.asarray(samples) * 1000, PERCENTILES)
+    return f"{label:<32} {len(samples):>6} " + " ".join(f"{value:>9.1f}" for value in values)
+
+
+def report(results, elapsed, out=sys.stdout):
+    all_samples = [seconds for result in results for _, seconds in result.timings]
+    by_step = defaultdict(list)
+    for result in results:
+        for step, seconds in result.timings:
+            by_step[step].append(seconds)
+    errors = [result for result in results if result.error is not None]
+
+    print(f"Felhasználók: {len(results)}, hibás: {len(errors)}, teljes idő: {elapsed:.2f} s", file=out)
+    if not all_samples:
+        return
+    print(f"Átbocsátás: {len(all_samples) / elapsed:.2f} rerun/s", file=out)
+    print(f"{'Lépés':<32} {'db':>6} " + " ".join(f"{f'p{p} (ms)':>9}" for p in PERCENTILES), file=out)
+    print(_percentile_row("Összes rerun", all_samples), file=out)
+    for step, samples in by_step.items():
+        print(_percentile_row(step, samples), file=out)
+    for result in errors:
+        print(f"Hiba ({result.user_id}. felhasználó): {result.error}", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Terheléses teszt szimulált, egyidejű Streamlit munkamenetekkel.")
+    parser.add_argument("--users", type=int, default=4, help="Egyidejű szimulált felhasználók száma")
+    parser.add_argument("--rounds", type=int, default=1, help="Hányszor járja végig egy felhasználó az elemző oldalakat")
+    parser.add_argument("--same-profile", action="store_true", help="Minden felhasználó ugyanazt a profilt állítja be")
+    parser.add_argument("--seed", type=int, default=None, help="Véletlenmag a profilokhoz")
+    parser.add_argument("--any-streamlit", action="store_true", help=f"Futtatás a {SUPPORTED_STREAMLIT}.x-től eltérő Streamlit verzión is")
+    args = parser.parse_args(argv)
+
+    check_streamlit_version(args.any_streamlit)
+    prepare_concurrent_apptest()
+    results, elapsed = run_load_test(args.users, args.rounds, args.same_profile, args.seed)
+    report(results, elapsed)
+    return 1 if any(result.error is not None for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,370 @@
+"""
+Regressziós ellenőrzés a teljes tényezőtérre és teljesítménymérés a pontozás, a stílusfüggvények
+és a diagramok útvonalára.
+
+Ellenőrzés ("check"): mind az 5^9 = 1 953 125 lehetséges profil potenciálját, kategóriáját,
+"Hatás Pont" értékeit és VRIO jelzőit (versenyelőny kategóriáival) összeveti a tárolt
+mintával (golden/factor_space.json). A minta blokkonkénti SHA-256 kivonatokat tartalmaz
+(egy blokk = az első három tényező egy rögzített értékhármasa, 5^6 profil), így eltérés esetén
+a hibás blokk is látszik. A utils.py és a charts.py színező/stílusfüggvényei csak a potenciáltól,
+egy értékeléstől vagy egy VRIO jelzőtől függnek, ezért ezek kimenete minden lehetséges bemenetre
+szó szerint a mintában van. Végül véletlen profilokon a profilonkénti útvonalak (score_profile,
+get_vrio_table_data, a keresőtábla) is összevetésre kerülnek a vektorizált eredménnyel.
+
+Mérés ("bench"): a pytest-benchmark kimenetéhez hasonló statisztikák (min, medián, átlag,
+szórás, műveletek/s) esetenként, opcionálisan elmentve (--save) vagy egy korábbi mentéssel
+összevetve (--compare), így egy gyorsítás helyessége és haszna is kimutatható.
+
+Használat (a repó gyökeréből):
+    python benchmarks/regression_benchmark.py check [--sample 2000]
+    python benchmarks/regression_benchmark.py record
+    python benchmarks/regression_benchmark.py bench [--rounds 5] [--filter diagram] [--save ki.json] [--compare elozo.json]
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np  # noqa: E402
+
+from charts import (  # noqa: E402
+    donut_png,
+    donut_spec,
+    figure_cache,
+    get_potential_color,
+    get_summary_bar_color,
+    hatas_pont_png,
+    hatas_pont_spec,
+    potential_label,
+    summary_png,
+    summary_spec,
+    trend_png,
+    trend_spec,
+)
+from factors import FACTOR_KEYS  # noqa: E402
+from lookup_table import TABLE_SIZE, index_to_ratings, load_table, lookup, pack_vrio_flags  # noqa: E402
+from scoring import cached_score_profile, get_potential_tier, score_profile, score_profiles  # noqa: E402
+from utils import (  # noqa: E402
+    get_description_style_main_profile,
+    get_factor_explanation_box_style,
+    get_rating_style_main_profile,
+    get_status_box_style,
+    get_vrio_table_data,
+    highlight_vrio_cells,
+    style_main_profile_row_cells,
+)
+from vrio import get_rule_set  # noqa: E402
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden", "factor_space.json")
+GOLDEN_VERSION = 1
+
+# Egy blokk az első BLOCK_PREFIX tényező rögzített értékeivel: 5^6 = 15 625 profil, összesen 125 blokk
+BLOCK_PREFIX = 3
+BLOCK_SIZE = TABLE_SIZE // 5 ** BLOCK_PREFIX
+# Egyszerre ennyi blokk kerül kiszámításra (a memóriahasználat korlátozására)
+CHUNK_BLOCKS = 25
+# A potenciál 0,5 többszöröse; a kerekítés a lebegőpontos összegzési sorrend változását semlegesíti
+VALUE_DECIMALS = 6
+DIGEST_LENGTH = 16
+FIELDS = ("potential", "tier", "hatas_pont", "vrio", "verdicts")
+RATINGS = (1, 2, 3, 4, 5)
+
+
+# --- A teljes tényezőtér kiszámítása és kivonatolása ---
+def _block_values(ratings, rule_set):
+    result = score_profiles(ratings)
+    flags, verdicts = rule_set.evaluate_with_verdicts(ratings)
+    return {
+        "potential": np.round(result.potential, VALUE_DECIMALS),
+        "tier": get_potential_tier(result.potential),
+        "hatas_pont": np.round(result.hatas_pont, VALUE_DECIMALS),
+        "vrio": pack_vrio_flags(flags),
+        "verdicts": verdicts,
+    }
+
+
+def _digest(values):
+    return hashlib.sha256(np.ascontiguousarray(values).tobytes()).hexdigest()[:DIGEST_LENGTH]
+
+
+def factor_space_digests(rule_set=None, log=sys.stderr):
+    """
+    A teljes tényezőtér blokkonkénti kivonatai mezőnként, valamint az előforduló potenciálértékek.
+    """
+    rule_set = rule_set or get_rule_set()
+    digests = {field: [] for field in FIELDS}
+    potentials = set()
+    tier_counts = np.zeros(3, dtype=np.int64)
+    for chunk_start in range(0, TABLE_SIZE, CHUNK_BLOCKS * BLOCK_SIZE):
+        ratings = index_to_ratings(np.arange(chunk_start, min(chunk_start + CHUNK_BLOCKS * BLOCK_SIZE, TABLE_SIZE)))
+        values = _block_values(ratings, rule_set)
+        for offset in range(0, len(ratings), BLOCK_SIZE):
+            for field in FIELDS:
+                # A VRIO maszk és a kategóriák típusa rögzített, hogy a kivonat ne függjön a belső dtype-tól
+                block = values[field][offset:offset + BLOCK_SIZE]
+                digests[field].append(_digest(block.astype("<f8" if block.dtype.kind == "f" else "<i8")))
+        potentials.update(np.unique(values["potential"]).tolist())
+        tier_counts += np.bincount(values["tier"], minlength=3)
+        print(f"{min(chunk_start + CHUNK_BLOCKS * BLOCK_SIZE, TABLE_SIZE)} / {TABLE_SIZE} profil...", file=log)
+    return digests, sorted(potentials), tier_counts.tolist()
+
+
+def style_tables(potentials):
+    """
+    A színező és stílusfüggvények kimenete minden lehetséges bemenetükre.
+    """
+    return {
+        "get_status_box_style": {repr(p): get_status_box_style(p) for p in potentials},
+        "get_potential_color": {repr(p): get_potential_color(p) for p in potentials},
+        "potential_label": {repr(p): potential_label(p) for p in potentials},
+        "highlight_vrio_cells": {str(flag).lower(): highlight_vrio_cells(flag) for flag in (True, False)},
+        "style_main_profile_row_cells": {str(value): style_main_profile_row_cells({"Értékelés (1-5)": value}) for value in (None,) + RATINGS},
+        "get_rating_style_main_profile": {str(value): get_rating_style_main_profile(value) for value in (None,) + RATINGS},
+        "get_description_style_main_profile": {str(value): get_description_style_main_profile(value) for value in (None,) + RATINGS},
+        "get_factor_explanation_box_style": {f"{value}/{str(is_barrier).lower()}": get_factor_explanation_box_style(value, is_barrier)
+                                             for is_barrier in (False, True) for value in RATINGS},
+        "get_summary_bar_color": {f"{value}/{str(is_barrier).lower()}": get_summary_bar_color(value, is_barrier)
+                                  for is_barrier in (False, True) for value in RATINGS},
+    }
+
+
+def snapshot(rule_set=None, log=sys.stderr):
+    """
+    A tárolandó minta: a tényezőtér kivonatai, a kategóriák gyakorisága és a stílustáblák.
+    """
+    digests, potentials, tier_counts = factor_space_digests(rule_set, log)
+    return {
+        "version": GOLDEN_VERSION,
+        "profiles": TABLE_SIZE,
+        "block_prefix": BLOCK_PREFIX,
+        "value_decimals": VALUE_DECIMALS,
+        "tier_counts": tier_counts,
+        "digests": digests,
+        "styles": style_tables(potentials),
+    }
+
+
+def _block_label(block):
+    prefix = index_to_ratings(block * BLOCK_SIZE)[0][:BLOCK_PREFIX]
+    return ", ".join(f"{factor_name} = {value}" for factor_name, value in zip(FACTOR_KEYS, prefix))
+
+
+def compare_snapshots(expected, actual):
+    """
+    A két minta eltéréseinek szöveges listája (üres lista: egyeznek).
+    """
+    if expected.get("version") != actual["version"] or expected.get("block_prefix") != actual["block_prefix"]:
+        return [f"A minta formátuma eltér (verzió {expected.get('version')}); rögzítse újra: python benchmarks/regression_benchmark.py record"]
+    problems = []
+    if expected["tier_counts"] != actual["tier_counts"]:
+        problems.append(f"Kategóriák gyakorisága: {expected['tier_counts']} helyett {actual['tier_counts']}")
+    for field in FIELDS:
+        blocks = [block for block, (old, new) in enumerate(zip(expected["digests"][field], actual["digests"][field])) if old != new]
+        if blocks:
+            problems.append(f"{field}: {len(blocks)} eltérő blokk, az első: {_block_label(blocks[0])}")
+    for name in sorted(set(expected["styles"]) | set(actual["styles"])):
+        table, new_table = expected["styles"].get(name, {}), actual["styles"].get(name, {})
+        changed = sorted(set(table) ^ set(new_table)) + [key for key in table if key in new_table and table[key] != new_table[key]]
+        if changed:
+            problems.append(f"{name}: {len(changed)} eltérő bemenet, pl. {changed[0]}: {table.get(changed[0])!r} -> {new_table.get(changed[0])!r}")
+    return problems
+
+
+def check_scalar_paths(samples=2000, seed=0, rule_set=None):
+    """
+    A profilonkénti útvonalak (score_profile, get_vrio_table_data, keresőtábla) egyezése a vektorizált eredménnyel.
+    """
+    rule_set = rule_set or get_rule_set()
+    rng = random.Random(seed)
+    indices = np.array([rng.randrange(TABLE_SIZE) for _ in range(samples)])
+    ratings = index_to_ratings(indices)
+    expected = _block_values(ratings, rule_set)
+    lut_potential, lut_tier, lut_vrio = lookup(load_table(rule_set=rule_set), ratings)
+    problems = []
+    if not (np.array_equal(np.round(lut_potential, VALUE_DECIMALS), expected["potential"])
+            and np.array_equal(lut_tier, expected["tier"]) and np.array_equal(lut_vrio, expected["vrio"])):
+        problems.append("A keresőtábla (lookup_table.py) eltér a pontozó motortól")
+    # A kijelzett felirat a kerekítés előtti értékekből: a 6 tizedesre kerekített összevetés
+    # nem venné észre, ha a két útvonal másképp jelenne meg
+    raw_potential = score_profiles(ratings).potential
+    for row, (lut_value, raw_value) in enumerate(zip(lut_potential.tolist(), raw_potential.tolist())):
+        if potential_label(lut_value) != potential_label(raw_value):
+            problems.append(f"A fánkdiagram felirata eltér a keresőtábla útján: {ratings[row].tolist()} "
+                            f"({potential_label(lut_value)} helyett {potential_label(raw_value)})")
+            break
+    flags = rule_set.evaluate(ratings)
+    for row, profile in enumerate(ratings.tolist()):
+        potential, hatas_pont = score_profile(profile)
+        if round(potential, VALUE_DECIMALS) != expected["potential"][row] or not np.array_equal(np.round(hatas_pont, VALUE_DECIMALS), expected["hatas_pont"][row]):
+            problems.append(f"score_profile eltér: {profile}")
+            break
+        table_flags = [resource_flags[1:] for resource_flags in get_vrio_table_data(*profile[:5])]
+        if not np.array_equal(np.array(table_flags, dtype=bool), flags[row]):
+            problems.append(f"get_vrio_table_data eltér: {profile}")
+            break
+    return problems
+
+
+def load_golden(path=GOLDEN_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def record(path=GOLDEN_PATH):
+    data = snapshot()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+        f.write("\n")
+    print(f"Minta elmentve: {path} ({data['profiles']} profil, kategóriák: {data['tier_counts']})")
+
+
+def check(path=GOLDEN_PATH, samples=2000):
+    started = time.perf_counter()
+    problems = compare_snapshots(load_golden(path), snapshot())
+    problems += check_scalar_paths(samples)
+    elapsed = time.perf_counter() - started
+    for problem in problems:
+        print(f"ELTÉRÉS: {problem}")
+    if problems:
+        return 1
+    print(f"Rendben: mind a {TABLE_SIZE} profil és a stílustáblák egyeznek a mintával ({elapsed:.1f} s).")
+    return 0
+
+
+# --- Teljesítménymérés ---
+class BenchmarkCase:
+    """
+    Egy mért eset: név, csoport, a mért függvény, a körönkénti hívásszám és a kör előtti előkészítés.
+    """
+    __slots__ = ("name", "group", "func", "number", "setup")
+
+    def __init__(self, name, group, func, number=1, setup=None):
+        self.name = name
+        self.group = group
+        self.func = func
+        self.number = number
+        self.setup = setup
+
+
+def benchmark_cases(seed=1):
+    rng = random.Random(seed)
+    profile = {factor_name: rng.randint(1, 5) for factor_name in FACTOR_KEYS}
+    ratings = tuple(profile.values())
+    all_ratings = index_to_ratings(np.arange(TABLE_SIZE))
+    rule_set = get_rule_set()
+    potential, hatas_pont = score_profile(ratings)
+    all_potentials = score_profiles(all_ratings).potential
+    trend = ([f"2025 Q{quarter}" for quarter in range(1, 5)], [potential - 6, potential - 3, potential - 1, potential], [hatas_pont] * 4)
+    row = {"Értékelés (1-5)": 3}
+    return [
+        BenchmarkCase("score_profiles, teljes tér", "pontozás", lambda: score_profiles(all_ratings)),
+        BenchmarkCase("score_profile, egy profil", "pontozás", lambda: score_profile(ratings), number=1000),
+        BenchmarkCase("cached_score_profile, találat", "pontozás", lambda: cached_score_profile(profile), number=1000),
+        BenchmarkCase("get_potential_tier, teljes tér", "pontozás", lambda: get_potential_tier(all_potentials)),
+        BenchmarkCase("VRIO jelzők, teljes tér", "pontozás", lambda: rule_set.evaluate_with_verdicts(all_ratings)),
+        # Explicit szabálytáblával a get_vrio_table_data nem használ gyorsítótárat
+        BenchmarkCase("get_vrio_table_data, gyorsítótár nélkül", "pontozás", lambda: get_vrio_table_data(*ratings[:5], rule_set=rule_set), number=1000),
+        BenchmarkCase("get_status_box_style", "stílus", lambda: get_status_box_style(potential), number=10000),
+        BenchmarkCase("highlight_vrio_cells", "stílus", lambda: highlight_vrio_cells(True), number=10000),
+        BenchmarkCase("style_main_profile_row_cells", "stílus", lambda: style_main_profile_row_cells(row), number=10000),
+        BenchmarkCase("get_factor_explanation_box_style", "stílus", lambda: get_factor_explanation_box_style(2, True), number=10000),
+        BenchmarkCase("donut_png, renderelés", "diagram", lambda: donut_png(potential), setup=figure_cache.clear),
+        BenchmarkCase("hatas_pont_png, renderelés", "diagram", lambda: hatas_pont_png(hatas_pont), setup=figure_cache.clear),
+        BenchmarkCase("summary_png, renderelés", "diagram", lambda: summary_png(profile.items()), setup=figure_cache.clear),
+        BenchmarkCase("trend_png, renderelés", "diagram", lambda: trend_png(*trend), setup=figure_cache.clear),
+        BenchmarkCase("donut_png, gyorsítótárból", "diagram", lambda: donut_png(potential), number=1000),
+        BenchmarkCase("donut_spec (Vega-Lite)", "diagram", lambda: donut_spec(potential), number=1000),
+        BenchmarkCase("hatas_pont_spec (Vega-Lite)", "diagram", lambda: hatas_pont_spec(hatas_pont), number=100),
+        BenchmarkCase("summary_spec (Vega-Lite)", "diagram", lambda: summary_spec(profile.items()), number=100),
+        BenchmarkCase("trend_spec (Vega-Lite)", "diagram", lambda: trend_spec(*trend), number=100),
+    ]
+
+
+def run_case(case, rounds):
+    """
+    Körönként egy hívássorozat; a statisztikák egy hívásra vetítve (másodperc).
+    """
+    case.func()  # bemelegítés (lusta importok, gyorsítótárak)
+    timings = []
+    for _ in range(rounds):
+        if case.setup is not None:
+            case.setup()
+        started = time.perf_counter()
+        for _ in range(case.number):
+            case.func()
+        timings.append((time.perf_counter() - started) / case.number)
+    return {
+        "group": case.group,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "stddev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "rounds": rounds,
+        "calls": case.number,
+    }
+
+
+def _format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e3), ("µs", 1e6)):
+        if seconds * scale >= 1:
+            return f"{seconds * scale:8.2f} {unit:2s}"
+    return f"{seconds * 1e9:8.2f} ns"
+
+
+def bench(rounds=5, name_filter=None, save_path=None, compare_path=None):
+    baseline = {}
+    if compare_path:
+        with open(compare_path, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    results = {}
+    print(f"{'Eset':42s} {'min':>11s} {'medián':>11s} {'átlag':>11s} {'szórás':>11s} {'művelet/s':>12s}" + ("  medián / korábbi" if baseline else ""))
+    for case in benchmark_cases():
+        if name_filter and name_filter not in case.name and name_filter != case.group:
+            continue
+        stats = run_case(case, rounds)
+        results[case.name] = stats
+        line = (f"{case.name:42s} {_format_time(stats['min'])} {_format_time(stats['median'])} {_format_time(stats['mean'])} "
+                f"{_format_time(stats['stddev'])} {1 / stats['median']:12.1f}")
+        if case.name in baseline:
+            line += f"  {stats['median'] / baseline[case.name]['median']:6.2f}x"
+        print(line)
+    if save_path:
+        with open(save_path, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "numpy": np.__version__, "results": results}, f, ensure_ascii=False, indent=1)
+        print(f"Eredmények elmentve: {save_path}")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Regressziós ellenőrzés a teljes tényezőtérre és teljesítménymérés.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    check_parser = subparsers.add_parser("check", help="A tényezőtér és a stílustáblák összevetése a tárolt mintával")
+    check_parser.add_argument("--golden", default=GOLDEN_PATH)
+    check_parser.add_argument("--sample", type=int, default=2000, help="A profilonkénti útvonalakkal ellenőrzött véletlen profilok száma")
+    record_parser = subparsers.add_parser("record", help="A minta újrarögzítése (szándékos viselkedésváltozás után)")
+    record_parser.add_argument("--golden", default=GOLDEN_PATH)
+    bench_parser = subparsers.add_parser("bench", help="Teljesítménymérés")
+    bench_parser.add_argument("--rounds", type=int, default=5, help="Körök száma esetenként")
+    bench_parser.add_argument("--filter", help="Csak a nevében ezt tartalmazó vagy ilyen csoportú esetek (pontozás, stílus, diagram)")
+    bench_parser.add_argument("--save", help="Az eredmények mentése JSON fájlba")
+    bench_parser.add_argument("--compare", help="Összevetés egy korábban mentett eredménnyel")
+    args = parser.parse_args(argv)
+    if args.command == "check":
+        return check(args.golden, args.sample)
+    if args.command == "record":
+        record(args.golden)
+        return 0
+    bench(args.rounds, args.filter, args.save, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
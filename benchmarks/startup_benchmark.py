@@ -0,0 +1,98 @@
+"""
+Indulási idő mérése: mennyibe kerül az alkalmazás első oldala a matplotlib/seaborn
+lusta betöltése mellett, illetve ha azokat induláskor azonnal importálnánk.
+
+Minden mérés friss Python folyamatban fut (hideg indulás), az eredmény a mediánok.
+
+Használat (a repó gyökeréből):
+    python benchmarks/startup_benchmark.py [--repeat 5]
+"""
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+import textwrap
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_ROOT, "app.py")
+
+
+def app_imports(path=APP_PATH):
+    """
+    Az app.py modulszintű importjai egyetlen import utasításként, a forrásból (ast) kiolvasva.
+    A függvényeken belüli (lusta) importok kimaradnak.
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    modules = []
+    pending = list(tree.body)
+    while pending:
+        node = pending.pop(0)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)):
+            continue
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules.append(node.module)
+        pending[:0] = list(ast.iter_child_nodes(node))
+    return "import " + ", ".join(dict.fromkeys(modules))
+
+
+# Az app.py által induláskor importált modulok
+APP_IMPORTS = app_imports()
+EAGER_PLOTTING_IMPORTS = "import matplotlib.pyplot, matplotlib.ticker, seaborn"
+
+# Az első oldal ("Bevezető") teljes lefuttatása Streamlit AppTest-tel
+FIRST_PAGE_SCRIPT = textwrap.dedent("""
+    import sys, time
+    started = time.perf_counter()
+    {eager}
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file("app.py", default_timeout=120).run()
+    elapsed = time.perf_counter() - started
+    assert not at.exception, at.exception
+    print(elapsed, int("matplotlib" in sys.modules))
+""")
+
+
+def _run(code):
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    return result.stdout.strip().splitlines()[-1].split()
+
+
+def time_imports(statement, repeat):
+    code = f"import time; t = time.perf_counter(); {statement}; print(time.perf_counter() - t)"
+    return statistics.median(float(_run(code)[0]) for _ in range(repeat))
+
+
+def time_first_page(eager, repeat):
+    code = FIRST_PAGE_SCRIPT.format(eager=EAGER_PLOTTING_IMPORTS if eager else "")
+    samples = [_run(code) for _ in range(repeat)]
+    return statistics.median(float(s[0]) for s in samples), any(s[1] == "1" for s in samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hidegindulási idő: lusta vs. azonnali matplotlib/seaborn import.")
+    parser.add_argument("--repeat", type=int, default=5, help="Ismétlések száma mérésenként")
+    args = parser.parse_args(argv)
+
+    lazy_imports = time_imports(APP_IMPORTS, args.repeat)
+    eager_imports = time_imports(f"{APP_IMPORTS}; {EAGER_PLOTTING_IMPORTS}", args.repeat)
+    print(f"Modulimport (lusta):      {lazy_imports * 1000:8.1f} ms")
+    print(f"Modulimport (azonnali):   {eager_imports * 1000:8.1f} ms")
+
+    lazy_page, lazy_loaded_mpl = time_first_page(False, args.repeat)
+    eager_page, _ = time_first_page(True, args.repeat)
+    print(f"Első oldal (lusta):       {lazy_page * 1000:8.1f} ms  (matplotlib betöltve: {'igen' if lazy_loaded_mpl else 'nem'})")
+    print(f"Első oldal (azonnali):    {eager_page * 1000:8.1f} ms")
+    print(f"Megtakarítás:             {(eager_page - lazy_page) * 1000:8.1f} ms")
+    if lazy_loaded_mpl:
+        print("FIGYELEM: a 'Bevezető' oldal betöltötte a matplotlibet, a lusta import nem érvényesül.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Mikro-benchmark: a táblázatok korábbi, cellánkénti Styler útvonala és az előre
+kiszámított CSS tömbökre épülő útvonal (tables.py) összehasonlítása.
+
+Mindkét útvonal a Styler teljes kiszámításáig fut (_compute, ezt hívja az st.dataframe is),
+és a mérés előtt ellenőrizzük, hogy a cellastílusok és a megjelenített értékek azonosak.
+
+Használat (a repó gyökeréből):
+    python benchmarks/table_benchmark.py [--number 200]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from factors import FACTOR_KEYS, factor_definitions
+from tables import NOT_RATED_TEXT, profile_table_styler, table_cache, vrio_table_styler
+from utils import get_vrio_table_data, highlight_vrio_cells, style_main_profile_row_cells
+from vrio import VRIO_CRITERIA
+
+
+# --- A korábbi app.py útvonalak változatlanul ---
+def legacy_profile_styler(selected_factors):
+    profile_data_for_style = []
+    for factor_name_key in factor_definitions.keys():
+        value = selected_factors.get(factor_name_key)
+        description_text = factor_definitions[factor_name_key].get(value, NOT_RATED_TEXT).split(': ',1)[1] if value is not None else NOT_RATED_TEXT
+        profile_data_for_style.append({"Tényező": factor_name_key, "Értékelés (1-5)": value, "Rövid Leírás": description_text})
+    df_profile_for_style = pd.DataFrame(profile_data_for_style)
+    styled_profile_styler = df_profile_for_style.style.apply(style_main_profile_row_cells, axis=1).hide(axis="index")
+    def format_rating(val): return "-" if pd.isnull(val) else int(val)
+    return styled_profile_styler.format({"Értékelés (1-5)": format_rating})
+
+
+def legacy_vrio_styler(vrio_data_bool):
+    df_vrio = pd.DataFrame(vrio_data_bool, columns=['Erőforrás'] + VRIO_CRITERIA)
+    styled_df_vrio_styler = df_vrio.style.map(highlight_vrio_cells, subset=VRIO_CRITERIA).set_properties(**{'text-align': 'center', 'font-weight': 'bold'}, subset=VRIO_CRITERIA).set_properties(**{'text-align': 'left', 'font-weight': 'bold'}, subset=['Erőforrás']).hide(axis="index")
+    formatter_vrio = {col: (lambda x: "✓" if x else "✗") for col in VRIO_CRITERIA}
+    return styled_df_vrio_styler.format(formatter_vrio)
+
+
+def _rendered(styler):
+    # Cellastílusok és a megjelenített szövegek, összehasonlítható formában
+    styler._compute()
+    ctx = {cell: sorted(props) for cell, props in styler.ctx.items()}
+    display = [[str(styler._display_funcs[(r, c)](styler.data.iat[r, c])) for c in range(styler.data.shape[1])] for r in range(styler.data.shape[0])]
+    return ctx, display
+
+
+def _random_profile(rng, allow_missing):
+    return {k: (None if allow_missing and rng.random() < 0.2 else rng.randint(1, 5)) for k in FACTOR_KEYS}
+
+
+def check_equivalence(samples=200, seed=0):
+    rng = random.Random(seed)
+    for _ in range(samples):
+        profile = _random_profile(rng, allow_missing=True)
+        assert _rendered(legacy_profile_styler(profile)) == _rendered(profile_table_styler(profile)), profile
+        vrio_data = get_vrio_table_data(*(rng.randint(1, 5) for _ in range(5)))
+        assert _rendered(legacy_vrio_styler(vrio_data)) == _rendered(vrio_table_styler(vrio_data)), vrio_data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Styler táblázatok: cellánkénti vs. előre kiszámított stílusok.")
+    parser.add_argument("--number", type=int, default=200, help="Ismétlések száma")
+    args = parser.parse_args(argv)
+
+    check_equivalence()
+    print("Ellenőrzés: a két útvonal cellastílusai és szövegei azonosak.")
+
+    profile = _random_profile(random.Random(1), allow_missing=False)
+    vrio_data = get_vrio_table_data(*(profile[k] for k in FACTOR_KEYS[:5]))
+    cases = [
+        ("Kkv profil, cellánkénti Styler", lambda: legacy_profile_styler(profile)._compute()),
+        ("Kkv profil, előre kiszámított", lambda: profile_table_styler(profile)._compute()),
+        ("VRIO, cellánkénti Styler", lambda: legacy_vrio_styler(vrio_data)._compute()),
+        ("VRIO, előre kiszámított", lambda: vrio_table_styler(vrio_data)._compute()),
+    ]
+    table_cache.clear()
+    for label, func in cases:
+        elapsed = min(timeit.repeat(func, number=args.number, repeat=3)) / args.number
+        print(f"{label:34s} {elapsed * 1e6:10.1f} µs/futás")
+
+
+if __name__ == "__main__":
+    main()
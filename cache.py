@@ -0,0 +1,138 @@
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+# --- Korlátos méretű LRU gyorsítótár találat/tévesztés számlálókkal ---
+# A Streamlit munkamenetek ugyanabban a folyamatban, külön szálakon futnak,
+# ezért minden művelet zár alatt történik. A névvel létrehozott gyorsítótárak a
+# folyamatszintű nyilvántartásba kerülnek, így a statisztikáik egy helyen lekérdezhetők.
+
+_registry = OrderedDict()
+_registry_lock = threading.Lock()
+
+
+def estimate_size(value):
+    """
+    Egy gyorsítótárazott érték becsült memóriaigénye bájtban.
+    """
+    if isinstance(value, (bytes, bytearray, str)):
+        return sys.getsizeof(value)
+    if isinstance(value, Future):
+        return estimate_size(value.result()) if value.done() and value.exception() is None else sys.getsizeof(value)
+    nbytes = getattr(value, "nbytes", None)  # numpy tömb
+    if isinstance(nbytes, int):
+        return nbytes
+    memory_usage = getattr(value, "memory_usage", None)  # pandas DataFrame
+    if callable(memory_usage):
+        return int(memory_usage(deep=True).sum())
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value.values())
+    slots = getattr(type(value), "__slots__", None)
+    if slots:
+        return sys.getsizeof(value) + sum(estimate_size(getattr(value, slot, None)) for slot in slots)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """
+    Legfeljebb maxsize elemet (és opcionálisan maxbytes becsült bájtot) tároló gyorsítótár;
+    telítettség esetén a legrégebben használt elem távozik.
+    """
+
+    def __init__(self, maxsize=128, name=None, maxbytes=None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        if name is not None:
+            with _registry_lock:
+                _registry[name] = self
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        size = estimate_size(value)
+        with self._lock:
+            self.nbytes -= self._sizes.pop(key, 0)
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._sizes[key] = size
+            self.nbytes += size
+            while len(self._data) > self.maxsize or (self.maxbytes is not None and self.nbytes > self.maxbytes and len(self._data) > 1):
+                evicted_key, _ = self._data.popitem(last=False)
+                self.nbytes -= self._sizes.pop(evicted_key)
+                self.evictions += 1
+
+    def get_or_create(self, key, factory):
+        """
+        Visszaadja a kulcshoz tartozó értéket; tévesztés esetén a factory() eredményét tárolja el.
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def discard(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+            self.nbytes -= self._sizes.pop(key, 0)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "bytes": self.nbytes,
+                "maxbytes": self.maxbytes,
+            }
+
+
+def cache_stats():
+    """
+    A nyilvántartott (névvel létrehozott) gyorsítótárak statisztikái: {név: stats()}.
+    """
+    with _registry_lock:
+        caches = list(_registry.items())
+    return {name: cache.stats() for name, cache in caches}
+
+
+def clear_caches():
+    with _registry_lock:
+        caches = list(_registry.values())
+    for cache in caches:
+        cache.clear()
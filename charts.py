@@ -0,0 +1,367 @@
+import math
+import threading
+from io import BytesIO
+
+import pandas as pd
+import streamlit as st
+
+from cache import LRUCache
+from content import get_bundle
+from factors import BARRIER_MARKER, FACTOR_CODES, factor_texts
+from instrumentation import stage
+from scoring import TIER_THRESHOLDS
+from settings import CHART_BACKEND, DEFAULT_LANGUAGE, FIGURE_CACHE_MAX_MB, FIGURE_CACHE_SIZE
+
+# --- Diagramok renderelése PNG bájtokká, profil szerinti gyorsítótárazással ---
+# Egy adott profilhoz mindig ugyanaz a kép tartozik, ezért a kész PNG-t tároljuk el,
+# és találat esetén a matplotlib egyáltalán nem fut le.
+# A matplotlib és a seaborn importja lassú, ezért csak az első tényleges rendereléskor
+# töltjük be őket (_load_plotting); a diagram nélküli oldalak így nem fizetik meg az árát.
+# A "vega" háttérrel (settings.CHART_BACKEND) ugyanezek a diagramok deklaratív Vega-Lite
+# specifikációként mennek a böngészőnek, a szerver egyáltalán nem raszterizál.
+
+figure_cache = LRUCache(maxsize=FIGURE_CACHE_SIZE, name="figures", maxbytes=FIGURE_CACHE_MAX_MB * 1024 * 1024)
+# A pyplot globális állapotot használ, ezért egyszerre csak egy szál renderelhet
+# (Streamlit munkamenetek és a háttérben futó PDF export)
+_render_lock = threading.Lock()
+
+# Ugyanazok a mentési beállítások, amelyeket az st.pyplot is használ
+SAVEFIG_OPTIONS = {"format": "png", "bbox_inches": "tight", "dpi": 200}
+
+# --- Diagramfeliratok a nyelvi csomagból (content.py, "charts" szakasz és rövid tényezőnevek) ---
+def _factor_labels(bundle):
+    return tuple(bundle.factor_short_names[code] for code in FACTOR_CODES)
+
+
+def _hatas_pont_texts(language):
+    # (cím, x tengely, y tengely, tényezőfeliratok)
+    bundle = get_bundle(language)
+    return bundle.hatas_pont_title, bundle.hatas_pont_axis, bundle.factor_axis, _factor_labels(bundle)
+
+
+def _summary_texts(language):
+    # (cím, x tengely, y tengely)
+    bundle = get_bundle(language)
+    return bundle.summary_title, bundle.rating_axis, bundle.factor_axis
+
+
+def _trend_texts(language):
+    # (cím, potenciál tengely, "Hatás Pont" tengely, negyedév tengely, tényezőfeliratok)
+    bundle = get_bundle(language)
+    return bundle.trend_title, bundle.potential_axis, bundle.hatas_pont_axis, bundle.quarter_axis, _factor_labels(bundle)
+
+
+def _summary_items(factor_items, language):
+    # (megjelenített név, értékelés, gátló-e) hármasok; a gátló jelölés a belső tényezőnévből
+    display_names = factor_texts(language)
+    return tuple((display_names[name][0] if name in display_names else name, int(score), BARRIER_MARKER in name)
+                 for name, score in factor_items)
+
+
+_plotting_modules = None
+
+
+def _load_plotting():
+    """
+    A matplotlib.pyplot, matplotlib.ticker és seaborn modulok lusta betöltése (plt, mticker, sns).
+    """
+    global _plotting_modules
+    if _plotting_modules is None:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        import matplotlib.ticker as mticker
+        import seaborn as sns
+        _plotting_modules = (plt, mticker, sns)
+    return _plotting_modules
+
+
+def _figure_to_png(fig):
+    plt, _, _ = _load_plotting()
+    buffer = BytesIO()
+    with stage("png_serialize"):
+        fig.savefig(buffer, **SAVEFIG_OPTIONS)
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def potential_label(potencial_score):
+    # A fánkdiagram felirata: egészre, a fél pont felfelé kerekítve. A lebegőpontos zaj előbb
+    # levágásra kerül, így a képlet (pl. 54.50000000000001) és a keresőtábla (pontosan 54.5)
+    # útja ugyanazt a feliratot adja
+    return f"{math.floor(round(float(potencial_score), 6) + 0.5)}%"
+
+
+def get_potential_color(potencial_score):
+    # A fánkdiagram "Elért" szeletének színe a kategória szerint
+    if potencial_score < 40: return '#dc3545'
+    elif potencial_score < 70: return '#ffc107'
+    return '#28a745'
+
+
+def get_summary_bar_color(score, is_barrier):
+    color = '#ffc107'
+    if is_barrier:
+        if score <= 2: color = '#28a745'
+        elif score >= 4: color = '#dc3545'
+    else:
+        if score <= 2: color = '#dc3545'
+        elif score >= 4: color = '#28a745'
+    return color
+
+
+def _render_donut(potencial_score):
+    plt, _, _ = _load_plotting()
+    sizes_pie = [potencial_score, 100 - potencial_score]
+    explode_pie = (0.05, 0) if 0 < potencial_score < 100 else (0, 0)
+    color_reached = get_potential_color(potencial_score)
+    fig_pie, ax_pie = plt.subplots(figsize=(2.5, 2.5)); ax_pie.pie(sizes_pie, explode=explode_pie, labels=None, autopct=None, startangle=90, colors=[color_reached, '#E9E9E9'], wedgeprops = {"edgecolor":"white", 'linewidth': 0.5, 'antialiased': True}); ax_pie.axis('equal')
+    centre_circle = plt.Circle((0,0),0.75,fc='white'); fig_pie.gca().add_artist(centre_circle)
+    ax_pie.text(0, 0, potential_label(potencial_score), ha='center', va='center', fontsize=16, fontweight='bold', color=color_reached)
+    return _figure_to_png(fig_pie)
+
+
+def _render_hatas_pont(hatas_pontok, texts):
+    plt, _, sns = _load_plotting()
+    title, x_label, y_label, labels = texts
+    factors_for_viz = pd.DataFrame({'Tényező': list(labels), 'Hatás Pont': list(hatas_pontok)})
+    colors_potential = ['#28a745' if x >= 0 else '#dc3545' for x in factors_for_viz['Hatás Pont']]
+    fig_pot, ax_pot = plt.subplots(figsize=(10, 4))
+    sns.barplot(x='Hatás Pont', y='Tényező', data=factors_for_viz, palette=colors_potential, ax=ax_pot)
+    ax_pot.set_title(title, fontsize=14); ax_pot.set_xlabel(x_label, fontsize=10); ax_pot.set_ylabel(y_label, fontsize=10)
+    ax_pot.set_xlim(-10.5, 10.5); ax_pot.tick_params(axis='x', labelsize=8); ax_pot.tick_params(axis='y', labelsize=8); plt.tight_layout()
+    return _figure_to_png(fig_pot)
+
+
+def _render_summary(summary_items, texts):
+    plt, mticker, sns = _load_plotting()
+    title, x_label, y_label = texts
+    df_summary_display = pd.DataFrame([(name, score) for name, score, _ in summary_items], columns=['Tényező', 'Értékelés'])
+    colors_summary_display = [get_summary_bar_color(score, is_barrier) for _, score, is_barrier in summary_items]
+    fig_summary_display, ax_summary_display = plt.subplots(figsize=(10, 6))
+    sns.barplot(x='Értékelés', y='Tényező', data=df_summary_display, palette=colors_summary_display, ax=ax_summary_display, orient='h')
+    ax_summary_display.set_xlabel(x_label); ax_summary_display.set_ylabel(y_label); ax_summary_display.set_title(title)
+    ax_summary_display.set_xlim(0, 5.5); ax_summary_display.xaxis.set_major_locator(mticker.MultipleLocator(1))
+    for i_disp, v_disp in enumerate(df_summary_display['Értékelés']): ax_summary_display.text(v_disp + 0.1, i_disp, str(v_disp), color='black', va='center', fontweight='bold')
+    plt.tight_layout()
+    return _figure_to_png(fig_summary_display)
+
+
+def _render_trend(labels, potentials, hatas_series, texts):
+    plt, _, _ = _load_plotting()
+    title, potential_label, hatas_label, _, factor_labels = texts
+    fig_trend, (ax_potential, ax_hatas) = plt.subplots(2, 1, figsize=(10, 7), sharex=True, gridspec_kw={"height_ratios": [2, 3]})
+    positions = range(len(labels))
+    ax_potential.plot(positions, potentials, marker='o', color='#1f77b4', linewidth=2)
+    for threshold in TIER_THRESHOLDS: ax_potential.axhline(threshold, color='#999999', linestyle='--', linewidth=0.8)
+    ax_potential.set_ylim(0, 100); ax_potential.set_ylabel(potential_label, fontsize=10); ax_potential.set_title(title, fontsize=13)
+    for factor_index, label in enumerate(factor_labels):
+        ax_hatas.plot(positions, [row[factor_index] for row in hatas_series], marker='.', linewidth=1.2, label=label)
+    ax_hatas.axhline(0, color='black', linewidth=0.6); ax_hatas.set_ylim(-10.5, 10.5); ax_hatas.set_ylabel(hatas_label, fontsize=10)
+    ax_hatas.set_xticks(list(positions)); ax_hatas.set_xticklabels(labels, rotation=45, ha='right', fontsize=8)
+    ax_hatas.legend(fontsize=7, ncol=3, loc='upper center', bbox_to_anchor=(0.5, -0.25)); plt.tight_layout()
+    return _figure_to_png(fig_trend)
+
+
+def _cached_render(key, render, *args):
+    def locked_render():
+        with _render_lock:
+            return render(*args)
+    return figure_cache.get_or_create(key, locked_render)
+
+
+def donut_png(potencial_score):
+    """
+    A potenciál fánkdiagramja PNG-ként; kulcs a két tizedesre kerekített potenciál.
+    """
+    key = ("donut", round(float(potencial_score), 2))
+    return _cached_render(key, _render_donut, potencial_score)
+
+
+def hatas_pont_png(hatas_pontok, language=DEFAULT_LANGUAGE):
+    """
+    A "Hatás Pont" oszlopdiagram PNG-ként; kulcs a nyelv és a 9 hozzájárulás.
+    """
+    key = ("hatas_pont", language, tuple(round(float(x), 4) for x in hatas_pontok))
+    return _cached_render(key, _render_hatas_pont, hatas_pontok, _hatas_pont_texts(language))
+
+
+def summary_png(factor_items, language=DEFAULT_LANGUAGE):
+    """
+    A beállítások összefoglaló diagramja PNG-ként; kulcs a nyelv és a (tényező, értékelés) párok sora.
+    """
+    summary_items = _summary_items(factor_items, language)
+    key = ("summary", language, summary_items)
+    return _cached_render(key, _render_summary, summary_items, _summary_texts(language))
+
+
+def _trend_key(labels, potentials, hatas_series):
+    return (tuple(labels), tuple(round(float(x), 4) for x in potentials),
+            tuple(tuple(round(float(x), 4) for x in row) for row in hatas_series))
+
+
+def trend_png(labels, potentials, hatas_series, language=DEFAULT_LANGUAGE):
+    """
+    Az idősor trenddiagramja (potenciál és a 9 "Hatás Pont" negyedéves átlaga) PNG-ként.
+    """
+    key = ("trend", language) + _trend_key(labels, potentials, hatas_series)
+    return _cached_render(key, _render_trend, *key[2:], _trend_texts(language))
+
+
+# --- Vega-Lite specifikációk (a színszabályok megegyeznek a matplotlib változattal) ---
+def donut_spec(potencial_score):
+    color_reached = get_potential_color(potencial_score)
+    return {
+        "width": 250, "height": 250,
+        "data": {"values": [
+            {"Szelet": "Elért", "Érték": potencial_score, "Sorrend": 0},
+            {"Szelet": "Hátralévő", "Érték": 100 - potencial_score, "Sorrend": 1},
+        ]},
+        "layer": [
+            {
+                "mark": {"type": "arc", "innerRadius": 75, "outerRadius": 110, "stroke": "white", "strokeWidth": 0.5},
+                "encoding": {
+                    "theta": {"field": "Érték", "type": "quantitative", "stack": True},
+                    "order": {"field": "Sorrend", "type": "ordinal"},
+                    "color": {"field": "Szelet", "type": "nominal", "legend": None,
+                              "scale": {"domain": ["Elért", "Hátralévő"], "range": [color_reached, "#E9E9E9"]}},
+                    "tooltip": [{"field": "Szelet"}, {"field": "Érték", "format": ".1f"}],
+                },
+            },
+            {
+                "mark": {"type": "text", "fontSize": 22, "fontWeight": "bold", "color": color_reached},
+                "encoding": {"text": {"value": potential_label(potencial_score)}},
+            },
+        ],
+        "view": {"stroke": None},
+    }
+
+
+def hatas_pont_spec(hatas_pontok, language=DEFAULT_LANGUAGE):
+    title, x_label, y_label, labels = _hatas_pont_texts(language)
+    values = [{"Tényező": label, "Hatás Pont": float(x), "Szín": '#28a745' if x >= 0 else '#dc3545'}
+              for label, x in zip(labels, hatas_pontok)]
+    return {
+        "title": title,
+        "height": 320,
+        "data": {"values": values},
+        "mark": "bar",
+        "encoding": {
+            "x": {"field": "Hatás Pont", "type": "quantitative", "title": x_label, "scale": {"domain": [-10.5, 10.5]}},
+            "y": {"field": "Tényező", "type": "nominal", "sort": None, "title": y_label},
+            "color": {"field": "Szín", "type": "nominal", "scale": None, "legend": None},
+            "tooltip": [{"field": "Tényező", "title": y_label}, {"field": "Hatás Pont", "title": x_label, "format": ".1f"}],
+        },
+    }
+
+
+def summary_spec(factor_items, language=DEFAULT_LANGUAGE):
+    title, x_label, y_label = _summary_texts(language)
+    values = [{"Tényező": name, "Értékelés": score, "Szín": get_summary_bar_color(score, is_barrier)}
+              for name, score, is_barrier in _summary_items(factor_items, language)]
+    y_encoding = {"field": "Tényező", "type": "nominal", "sort": None, "title": y_label}
+    return {
+        "title": title,
+        "height": 400,
+        "data": {"values": values},
+        "layer": [
+            {
+                "mark": "bar",
+                "encoding": {
+                    "x": {"field": "Értékelés", "type": "quantitative", "title": x_label,
+                          "scale": {"domain": [0, 5.5]}, "axis": {"tickMinStep": 1}},
+                    "y": y_encoding,
+                    "color": {"field": "Szín", "type": "nominal", "scale": None, "legend": None},
+                },
+            },
+            {
+                "mark": {"type": "text", "align": "left", "dx": 5, "fontWeight": "bold", "color": "black"},
+                "encoding": {
+                    "x": {"field": "Értékelés", "type": "quantitative"},
+                    "y": y_encoding,
+                    "text": {"field": "Értékelés", "type": "quantitative"},
+                },
+            },
+        ],
+    }
+
+
+def trend_spec(labels, potentials, hatas_series, language=DEFAULT_LANGUAGE):
+    title, potential_label, hatas_label, quarter_label, factor_labels = _trend_texts(language)
+    factor_title = get_bundle(language).factor_axis
+    x_encoding = {"field": "Negyedév", "type": "ordinal", "sort": list(labels), "title": quarter_label}
+    potential_values = [{"Negyedév": label, "Potenciál": float(x)} for label, x in zip(labels, potentials)]
+    hatas_values = [{"Negyedév": label, "Tényező": factor_label, "Hatás Pont": float(x)}
+                    for label, row in zip(labels, hatas_series) for factor_label, x in zip(factor_labels, row)]
+    return {
+        "title": title,
+        "vconcat": [
+            {
+                "height": 200, "width": 700,
+                "layer": [
+                    {
+                        "data": {"values": potential_values},
+                        "mark": {"type": "line", "point": True},
+                        "encoding": {"x": x_encoding,
+                                     "y": {"field": "Potenciál", "type": "quantitative", "title": potential_label, "scale": {"domain": [0, 100]}},
+                                     "tooltip": [{"field": "Negyedév", "title": quarter_label},
+                                                 {"field": "Potenciál", "title": potential_label, "format": ".1f"}]},
+                    },
+                    {
+                        "data": {"values": [{"Határ": threshold} for threshold in TIER_THRESHOLDS]},
+                        "mark": {"type": "rule", "strokeDash": [4, 4], "color": "#999999"},
+                        "encoding": {"y": {"field": "Határ", "type": "quantitative"}},
+                    },
+                ],
+            },
+            {
+                "height": 260, "width": 700,
+                "data": {"values": hatas_values},
+                "mark": {"type": "line", "point": True},
+                "encoding": {"x": x_encoding,
+                             "y": {"field": "Hatás Pont", "type": "quantitative", "title": hatas_label, "scale": {"domain": [-10.5, 10.5]}},
+                             "color": {"field": "Tényező", "type": "nominal", "sort": list(factor_labels), "title": factor_title},
+                             "tooltip": [{"field": "Negyedév", "title": quarter_label}, {"field": "Tényező", "title": factor_title},
+                                         {"field": "Hatás Pont", "title": hatas_label, "format": ".1f"}]},
+            },
+        ],
+    }
+
+
+# --- Megjelenítés a beállított háttérrel ---
+# A mérési szakaszok (instrumentation.py): chart_<név> a diagram előállítása (gyorsítótár-találattal
+# vagy rendereléssel), ezen belül png_serialize a savefig, chart_send az elem elküldése a böngészőnek.
+def show_donut(potencial_score):
+    if CHART_BACKEND == "vega":
+        with stage("chart_donut"): spec = donut_spec(potencial_score)
+        with stage("chart_send"): st.vega_lite_chart(spec, use_container_width=False)
+    else:
+        with stage("chart_donut"): png = donut_png(potencial_score)
+        with stage("chart_send"): st.image(png)
+
+
+def show_hatas_pont(hatas_pontok, language=DEFAULT_LANGUAGE):
+    if CHART_BACKEND == "vega":
+        with stage("chart_hatas_pont"): spec = hatas_pont_spec(hatas_pontok, language)
+        with stage("chart_send"): st.vega_lite_chart(spec, use_container_width=True)
+    else:
+        with stage("chart_hatas_pont"): png = hatas_pont_png(hatas_pontok, language)
+        with stage("chart_send"): st.image(png, use_container_width=True)
+
+
+def show_summary(factor_items, language=DEFAULT_LANGUAGE):
+    if CHART_BACKEND == "vega":
+        with stage("chart_summary"): spec = summary_spec(factor_items, language)
+        with stage("chart_send"): st.vega_lite_chart(spec, use_container_width=True)
+    else:
+        with stage("chart_summary"): png = summary_png(factor_items, language)
+        with stage("chart_send"): st.image(png, use_container_width=True)
+
+
+def show_trend(labels, potentials, hatas_series, language=DEFAULT_LANGUAGE):
+    if CHART_BACKEND == "vega":
+        with stage("chart_trend"): spec = trend_spec(labels, potentials, hatas_series, language)
+        with stage("chart_send"): st.vega_lite_chart(spec, use_container_width=True)
+    else:
+        with stage("chart_trend"): png = trend_png(labels, potentials, hatas_series, language)
+        with stage("chart_send"): st.image(png, use_container_width=True)
@@ -0,0 +1,251 @@
+"""
+Nyelvi tartalomcsomagok: a tényezők szintleírásai, a beszámoló szövegsablonjai és a gyakorlati javaslatok.
+
+A forrás nyelvenként egy verziózott JSON fájl (content/<nyelv>.json). Fordításkor a csomagot
+ellenőrizzük, és kész Python értékekké (tuple, dict, összefűzött szövegek) alakítjuk, majd
+pickle fájlba mentjük (.content_cache/<nyelv>-<hash>.pickle). A hash a JSON tartalmából és a
+fordító verziójából készül, így a forrás módosításakor új fájl készül. Futás közben a csomag
+folyamatonként egyszer töltődik be (get_bundle); ha a lefordított fájl hiányzik, betöltéskor
+készül el.
+
+A tényezőket a rövid kódjuk (FACTOR_CODES), a VRIO erőforrásokat a szabálytábla (forrás nyelvű)
+neve azonosítja. A forrásnyelvi (magyar) csomag tényezőnevei egyben a belső azonosítók
+(session state kulcsok, pontozási modellek tényezősúlyai), ezért ezek nem módosíthatók.
+
+Használat:
+    python content.py build [--language en]
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import pickle
+from functools import lru_cache
+
+from settings import CONTENT_CACHE_DIR, CONTENT_DIR, DEFAULT_LANGUAGE
+
+# A belső azonosítók nyelve; a többi csomagot ehhez ellenőrizzük
+SOURCE_LANGUAGE = "hu"
+# A fordítás kimenetének verziója: változásakor minden csomag újrafordul
+COMPILER_VERSION = 2
+
+NUM_LEVELS = 5
+NUM_TIERS = 3
+NUM_VRIO_CRITERIA = 4
+NUM_VERDICTS = 4
+NUM_REPORT_SECTIONS = 4
+FACTOR_GROUP_FIELDS = ("header", "intro", "sentence", "empty")
+CHART_FIELDS = ("hatas_pont_title", "hatas_pont_axis", "factor_axis", "summary_title", "rating_axis",
+                "trend_title", "potential_axis", "quarter_axis")
+
+
+class ContentBundle:
+    """
+    Lefordított nyelvi csomag: a szövegek kész, csak olvasandó értékekként.
+    """
+
+    def __init__(self, language, label, version, barrier_marker, factor_names, factor_short_names, factor_levels, vrio_resources,
+                 report, charts, recommendations):
+        self.language = language
+        self.label = label
+        self.version = version
+        self.barrier_marker = barrier_marker
+        self.factor_names = factor_names      # tényezőkód -> megjelenített név
+        self.factor_short_names = factor_short_names  # tényezőkód -> rövid név (diagramfeliratok)
+        self.factor_levels = factor_levels    # tényezőkód -> {szint (1-5): leírás}
+        self.vrio_resources = vrio_resources  # szabálytáblabeli erőforrásnév -> megjelenített név
+        self.report_title = report["title"]
+        self.report_intro = report["intro"]
+        self.section_titles = tuple(report["section_titles"])
+        self.potential_label = report["potential_label"]
+        self.model_label = report["model_label"]
+        self.potential_texts = tuple(report["potential_texts"])
+        self.factor_groups = {key: dict(texts) for key, texts in report["factor_groups"].items()}
+        self.vrio_paragraph = report["vrio_paragraph"]
+        self.vrio_sentence_parts = tuple(tuple(parts) for parts in report["vrio_sentence_parts"])
+        self.vrio_verdicts = tuple(report["vrio_verdicts"])  # a vrio.VERDICT_* kódok sorrendjében
+        self.vrio_columns = tuple(report["vrio_columns"])    # az erőforrás és a 4 VRIO kritérium oszlopfejléce
+        self.summary_texts = tuple(report["summary"])
+        self.hatas_pont_title = charts["hatas_pont_title"]
+        self.hatas_pont_axis = charts["hatas_pont_axis"]
+        self.factor_axis = charts["factor_axis"]
+        self.summary_title = charts["summary_title"]
+        self.rating_axis = charts["rating_axis"]
+        self.trend_title = charts["trend_title"]
+        self.potential_axis = charts["potential_axis"]
+        self.quarter_axis = charts["quarter_axis"]
+        self.recommendations_title = recommendations["title"]
+        self.javaslat_messages = tuple(recommendations["messages"])
+        # Kategóriánként egyetlen Markdown lista (soronként egy javaslat)
+        self.javaslat_texts = tuple("\n".join(items) + "\n" for items in recommendations["items"])
+
+    @classmethod
+    def from_fields(cls, fields):
+        # A pickle fájl csak az attribútumokat tartalmazza (osztályhivatkozás nélkül), így a
+        # parancssorból (__main__) fordított csomag is betölthető
+        bundle = cls.__new__(cls)
+        bundle.__dict__.update(fields)
+        return bundle
+
+    def resource_name(self, resource):
+        """
+        A VRIO erőforrás megjelenített neve; ismeretlen (pl. alternatív szabálytáblabeli) erőforrásnál változatlan.
+        """
+        return self.vrio_resources.get(resource, resource)
+
+
+def _require(condition, language, message):
+    if not condition:
+        raise ValueError(f"Hibás nyelvi csomag ({language}): {message}")
+
+
+def _texts(value, count, language, what):
+    _require(isinstance(value, list) and len(value) == count and all(isinstance(text, str) for text in value),
+             language, f"a(z) '{what}' {count} szövegből álló lista kell legyen")
+    return value
+
+
+def compile_bundle(spec):
+    """
+    Nyelvi csomag leírása (a content/*.json szerkezete) -> ContentBundle. Hibás leírás esetén ValueError.
+    """
+    language = spec.get("language")
+    _require(isinstance(language, str) and language, language, "kötelező a nyelv kódja ('language')")
+    _require(isinstance(spec.get("version"), int), language, "kötelező az egész számú verzió ('version')")
+
+    factor_names, factor_short_names, factor_levels = {}, {}, {}
+    _require(isinstance(spec.get("factors"), dict) and spec["factors"], language, "hiányzó 'factors'")
+    for code, factor in spec["factors"].items():
+        _require(isinstance(factor.get("name"), str), language, f"hiányzó tényezőnév: '{code}'")
+        _require(isinstance(factor.get("short_name"), str), language, f"hiányzó rövid tényezőnév: '{code}'")
+        levels = factor.get("levels", {})
+        _require(sorted(levels) == [str(level) for level in range(1, NUM_LEVELS + 1)], language, f"a(z) '{code}' tényezőnek 1-{NUM_LEVELS} szintleírás kell")
+        for level, description in levels.items():
+            _require(isinstance(description, str) and ": " in description, language, f"a szintleírás formátuma 'Szint: leírás' ({code} / {level})")
+        factor_names[code] = factor["name"]
+        factor_short_names[code] = factor["short_name"]
+        factor_levels[code] = {int(level): levels[level] for level in sorted(levels)}
+
+    report = spec.get("report", {})
+    _texts(report.get("section_titles"), NUM_REPORT_SECTIONS, language, "report.section_titles")
+    _texts(report.get("potential_texts"), NUM_TIERS, language, "report.potential_texts")
+    _texts(report.get("vrio_verdicts"), NUM_VERDICTS, language, "report.vrio_verdicts")
+    _texts(report.get("vrio_columns"), NUM_VRIO_CRITERIA + 1, language, "report.vrio_columns")
+    for key in ("title", "intro", "potential_label", "model_label", "vrio_paragraph"):
+        _require(isinstance(report.get(key), str), language, f"hiányzó 'report.{key}'")
+    _require(isinstance(report.get("summary"), list), language, "hiányzó 'report.summary'")
+    _require(isinstance(report.get("vrio_sentence_parts"), list) and len(report["vrio_sentence_parts"]) == NUM_VRIO_CRITERIA,
+             language, f"a 'report.vrio_sentence_parts' {NUM_VRIO_CRITERIA} elemű kell legyen")
+    for parts in report["vrio_sentence_parts"]:
+        _texts(parts, 2, language, "report.vrio_sentence_parts")
+    for key, texts in report.get("factor_groups", {}).items():
+        _require(set(texts) == set(FACTOR_GROUP_FIELDS), language, f"a(z) '{key}' tényezőcsoport mezői: {', '.join(FACTOR_GROUP_FIELDS)}")
+
+    charts = spec.get("charts", {})
+    for key in CHART_FIELDS:
+        _require(isinstance(charts.get(key), str), language, f"hiányzó 'charts.{key}'")
+
+    recommendations = spec.get("recommendations", {})
+    _require(isinstance(recommendations.get("title"), str), language, "hiányzó 'recommendations.title'")
+    _texts(recommendations.get("messages"), NUM_TIERS, language, "recommendations.messages")
+    _require(isinstance(recommendations.get("items"), list) and len(recommendations["items"]) == NUM_TIERS, language,
+             f"a 'recommendations.items' {NUM_TIERS} listából álló lista kell legyen")
+
+    return ContentBundle(language, spec.get("label", language), spec["version"], spec.get("barrier_marker", ""),
+                         factor_names, factor_short_names, factor_levels, dict(spec.get("vrio_resources", {})), report, charts, recommendations)
+
+
+def check_against_source(bundle, source):
+    """
+    A csomag ugyanazokat a tényezőket és tényezőcsoportokat fedi-e le, mint a forrásnyelvi csomag.
+    """
+    _require(set(bundle.factor_names) == set(source.factor_names), bundle.language,
+             f"a tényezőkódok eltérnek a(z) '{source.language}' csomagétól")
+    _require(set(bundle.factor_groups) == set(source.factor_groups), bundle.language,
+             f"a tényezőcsoportok eltérnek a(z) '{source.language}' csomagétól")
+
+
+def bundle_source_path(language, content_dir=CONTENT_DIR):
+    return os.path.join(content_dir, f"{language}.json")
+
+
+def available_languages(content_dir=CONTENT_DIR):
+    """
+    A könyvtár nyelvi csomagjai; a forrásnyelv az első.
+    """
+    languages = sorted(os.path.splitext(os.path.basename(path))[0] for path in glob.glob(os.path.join(content_dir, "*.json")))
+    return sorted(languages, key=lambda language: language != SOURCE_LANGUAGE)
+
+
+def _source_digest(raw):
+    digest = hashlib.sha256()
+    digest.update(f"{COMPILER_VERSION}\n".encode("utf-8"))
+    digest.update(raw)
+    return digest.hexdigest()[:16]
+
+
+def _read_source(language, content_dir):
+    path = bundle_source_path(language, content_dir)
+    if not os.path.exists(path):
+        raise ValueError(f"Ismeretlen nyelv: '{language}' (nincs {path})")
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def compiled_path(language, content_dir=CONTENT_DIR, cache_dir=CONTENT_CACHE_DIR, raw=None):
+    raw = _read_source(language, content_dir) if raw is None else raw
+    return os.path.join(cache_dir, f"{language}-{_source_digest(raw)}.pickle")
+
+
+def build_bundle(language, content_dir=CONTENT_DIR, cache_dir=CONTENT_CACHE_DIR):
+    """
+    A csomag fordítása és mentése; visszaadja a lefordított fájl elérési útját.
+    """
+    raw = _read_source(language, content_dir)
+    bundle = compile_bundle(json.loads(raw.decode("utf-8")))
+    _require(bundle.language == language, language, f"a fájlban megadott nyelv: '{bundle.language}'")
+    if language != SOURCE_LANGUAGE:
+        check_against_source(bundle, load_bundle(SOURCE_LANGUAGE, content_dir, cache_dir))
+    path = compiled_path(language, content_dir, cache_dir, raw)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(vars(bundle), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_bundle(language, content_dir=CONTENT_DIR, cache_dir=CONTENT_CACHE_DIR):
+    """
+    A lefordított csomag betöltése; ha nincs (vagy a forrás azóta változott), előbb lefordítja.
+    """
+    path = compiled_path(language, content_dir, cache_dir)
+    if not os.path.exists(path):
+        path = build_bundle(language, content_dir, cache_dir)
+    with open(path, "rb") as f:
+        return ContentBundle.from_fields(pickle.load(f))
+
+
+@lru_cache(maxsize=None)
+def get_bundle(language=DEFAULT_LANGUAGE):
+    """
+    A nyelvi csomag folyamatonként egyszer betöltve.
+    """
+    return load_bundle(language)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="A nyelvi tartalomcsomagok fordítása (content/*.json -> pickle).")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--language", help="Csak ezt a nyelvet (alapértelmezés: mind)")
+    parser.add_argument("--content-dir", default=CONTENT_DIR)
+    parser.add_argument("--cache-dir", default=CONTENT_CACHE_DIR)
+    args = parser.parse_args(argv)
+    for language in [args.language] if args.language else available_languages(args.content_dir):
+        path = build_bundle(language, args.content_dir, args.cache_dir)
+        print(f"Nyelvi csomag lefordítva ({language}): {path}")
+
+
+if __name__ == "__main__":
+    main()
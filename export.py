@@ -0,0 +1,148 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from cache import LRUCache
+from charts import donut_png, hatas_pont_png
+from content import get_bundle
+from factors import FACTOR_KEYS
+from report import cached_build_report
+from scoring import cached_score_profile, get_potential_tier
+from settings import DEFAULT_LANGUAGE, PDF_WORKERS
+from utils import get_vrio_table_data
+
+# --- PDF beszámoló export háttérszálon, profil szerinti gyorsítótárazással ---
+# A PDF összeállítása (szöveg, VRIO táblázat, diagramok) nem a Streamlit szálán fut:
+# a ThreadPoolExecutor-ba küldött feladat Future-jét profilonként eltároljuk, így azonos
+# profilhoz a kész dokumentum újra felhasználható, és a felület közben nem blokkol.
+# A PDF csak a felhasználó kérésére (gombnyomásra) készül el: az oldal megnyitása nem indít
+# háttérmunkát, és "vega" diagram háttérnél sem tölti be a matplotlibet.
+
+_pdf_executor = ThreadPoolExecutor(max_workers=PDF_WORKERS, thread_name_prefix="pdf-export")
+pdf_cache = LRUCache(maxsize=64, name="pdf")
+
+PDF_FILE_NAME = "rbv_kkv_beszamolo.pdf"
+
+
+def _unicode_font_paths():
+    # A magyar ékezetekhez (ő, ű) Unicode betűtípus kell; a matplotlib csomag DejaVu fontjait használjuk
+    import matplotlib
+    font_dir = os.path.join(matplotlib.get_data_path(), "fonts", "ttf")
+    return os.path.join(font_dir, "DejaVuSans.ttf"), os.path.join(font_dir, "DejaVuSans-Bold.ttf")
+
+
+def _profile_key(selected_factors, model=None, language=DEFAULT_LANGUAGE):
+    return getattr(model, "name", None), language, tuple(int(selected_factors[factor_name]) for factor_name in FACTOR_KEYS)
+
+
+def build_report_pdf(selected_factors, model=None, language=DEFAULT_LANGUAGE):
+    """
+    A "Beszámoló" és a "Gyakorlati Javaslatok" tartalma egyetlen PDF dokumentumként (bájtok).
+    A model a pontozási modell (scoring_models.ScoringModel); None esetén az alapképlet.
+    A szövegek a language nyelvi csomagjából származnak.
+    """
+    try:
+        from fpdf import FPDF
+    except ImportError:
+        raise ImportError("A PDF exporthoz az 'fpdf2' csomag szükséges (pip install fpdf2).")
+
+    potential, hatas_pontok = cached_score_profile(selected_factors, model)
+    report = cached_build_report(selected_factors, model, language)
+    bundle = get_bundle(language)
+    potential_title, factors_title, vrio_title, summary_title = bundle.section_titles
+    vrio_data = get_vrio_table_data(*(selected_factors[factor_name] for factor_name in FACTOR_KEYS[:5]))
+
+    regular_font, bold_font = _unicode_font_paths()
+    pdf = FPDF(format="A4")
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_font("DejaVu", "", regular_font)
+    pdf.add_font("DejaVu", "B", bold_font)
+    pdf.add_page()
+
+    def heading(text, size=13):
+        pdf.ln(2)
+        pdf.set_font("DejaVu", "B", size)
+        pdf.multi_cell(0, 8, text, new_x="LMARGIN", new_y="NEXT")
+        pdf.set_font("DejaVu", "", 10)
+
+    def paragraph(text):
+        pdf.multi_cell(0, 5, text, markdown=True, align="L", new_x="LMARGIN", new_y="NEXT")
+        pdf.ln(2)
+
+    heading(bundle.report_title, size=16)
+    paragraph(bundle.report_intro)
+
+    heading(potential_title)
+    paragraph(f"**{bundle.potential_label}:** {potential:.1f} %")
+    if model is not None and not model.is_reference:
+        paragraph(f"{bundle.model_label}: {model.label}")
+    pdf.image(donut_png(potential), w=45)
+    paragraph(report.potencial_text)
+    pdf.image(hatas_pont_png(hatas_pontok, language), w=pdf.epw)
+
+    heading(factors_title)
+    for blocks in report.factor_blocks:
+        for block in blocks:
+            paragraph(block)
+
+    heading(vrio_title)
+    with pdf.table(col_widths=(34, 15, 13, 21, 17), text_align=("LEFT", "CENTER", "CENTER", "CENTER", "CENTER")) as table:
+        header = table.row()
+        for title in bundle.vrio_columns:
+            header.cell(title)
+        for eroforras, *flags in vrio_data:
+            row = table.row()
+            row.cell(bundle.resource_name(eroforras))
+            for flag in flags:
+                row.cell("✓" if flag else "✗")
+    pdf.ln(3)
+    for vrio_paragraph in report.vrio_paragraphs:
+        paragraph(vrio_paragraph)
+
+    heading(summary_title)
+    for summary_text in bundle.summary_texts:
+        paragraph(summary_text)
+
+    potencial_tier = get_potential_tier(potential)
+    heading(bundle.recommendations_title)
+    paragraph(f"**{bundle.javaslat_messages[potencial_tier]}**")
+    for item in bundle.javaslat_texts[potencial_tier].splitlines():
+        paragraph(re.sub(r"^\* ", "• ", item.strip()))
+
+    return bytes(pdf.output())
+
+
+def submit_report_pdf(selected_factors, model=None, language=DEFAULT_LANGUAGE):
+    """
+    Elindítja (vagy a gyorsítótárból visszaadja) a profil PDF-jének háttérben futó elkészítését.
+    """
+    key = _profile_key(selected_factors, model, language)
+    frozen_factors = dict(zip(FACTOR_KEYS, key[2]))
+    pdf_future = pdf_cache.get_or_create(key, lambda: _pdf_executor.submit(build_report_pdf, frozen_factors, model, language))
+    if not pdf_future.done():
+        # Elkészülés után újra eltároljuk, hogy a memóriastatisztika a kész PDF méretét mutassa
+        pdf_future.add_done_callback(lambda done_future: pdf_cache.put(key, done_future))
+    return pdf_future
+
+
+def show_pdf_download(selected_factors, key, model=None, language=DEFAULT_LANGUAGE):
+    """
+    Készítés gomb, majd letöltés gomb a kész PDF-hez; amíg a háttérben készül, tájékoztató üzenet és frissítés gomb.
+    """
+    pdf_future = pdf_cache.get(_profile_key(selected_factors, model, language))
+    if pdf_future is None:
+        if not st.button("PDF beszámoló készítése", key=f"{key}_build"):
+            return
+        pdf_future = submit_report_pdf(selected_factors, model, language)
+    if not pdf_future.done():
+        st.info("A PDF beszámoló a háttérben készül...")
+        st.button("Frissítés", key=f"{key}_refresh")
+    elif pdf_future.exception() is not None:
+        # A hibás eredményt nem tartjuk meg, a következő futás újra megpróbálja
+        pdf_cache.discard(_profile_key(selected_factors, model, language))
+        st.error(f"Hiba a PDF beszámoló elkészítése közben: {pdf_future.exception()}")
+    else:
+        st.download_button("Beszámoló letöltése (PDF)", data=pdf_future.result(), file_name=PDF_FILE_NAME,
+                           mime="application/pdf", key=key)
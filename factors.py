@@ -0,0 +1,34 @@
+from functools import lru_cache
+
+from content import SOURCE_LANGUAGE, get_bundle
+from settings import DEFAULT_LANGUAGE
+
+# --- Tényezők definíciói és magyarázatok ---
+# A nevek és a szintleírások a nyelvi csomagokban vannak (content/<nyelv>.json, content.py).
+# A rövid, ékezet nélküli kódok (fájlok, adatbázis oszlopai, nyelvi csomagok kulcsai) sorrendje
+# határozza meg a tényezők sorrendjét a pontozó motorban (scoring.py) és minden tömb alapú
+# feldolgozásban: 5 támogató, majd 4 gátló tényező.
+FACTOR_CODES = (
+    "innovacio", "humantoke", "penzugyi_stabilitas", "kapcsolati_halo", "technologiai_fejlettseg",
+    "korlatozott_penzugyi_forrasok", "piaci_ismeretek_hianya", "hianyos_digitalis_kompetenciak", "vezetesi_strategiai_hianyossagok",
+)
+
+# A belső kulcsok a forrásnyelvi (magyar) tényezőnevek: tényezőnév -> {szint: leírás}
+_source_bundle = get_bundle(SOURCE_LANGUAGE)
+factor_definitions = {_source_bundle.factor_names[factor_code]: _source_bundle.factor_levels[factor_code] for factor_code in FACTOR_CODES}
+
+FACTOR_KEYS = tuple(factor_definitions.keys())
+
+# A gátló tényezők nevében szerepel a "(Gátló)" jelölés
+BARRIER_MARKER = "(Gátló)"
+IS_BARRIER = tuple(BARRIER_MARKER in factor_name for factor_name in FACTOR_KEYS)
+
+
+@lru_cache(maxsize=None)
+def factor_texts(language=DEFAULT_LANGUAGE):
+    """
+    A tényezők megjelenített neve és szintleírásai a nyelvi csomagból: {tényezőnév: (név, {szint: leírás})}.
+    """
+    bundle = get_bundle(language)
+    return {factor_name: (bundle.factor_names[factor_code], bundle.factor_levels[factor_code])
+            for factor_name, factor_code in zip(FACTOR_KEYS, FACTOR_CODES)}
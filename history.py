@@ -0,0 +1,339 @@
+"""
+Egy kkv ismételt (pl. negyedéves) értékeléseinek idősora és trendjei.
+
+Minden értékelés egy tömör sor: cégazonosító, sorszám, időbélyeg (egész másodperc) és a
+9 értékelés egyetlen egész számba csomagolva (lookup_table.profile_index: 5-ös számrendszer,
+legfeljebb 1 953 124, az SQLite-ban 3 bájt). Értékelésenkénti delta kódolás ennél nem lenne
+kisebb, viszont a véletlen eléréshez a teljes előzményt vissza kellene játszani.
+
+Új értékelés mentésekor ugyanabban a tranzakcióban frissülnek az előre aggregált adatok:
+    - negyedévenként az értékelések száma, a potenciál és a 9 "Hatás Pont" összege
+      (ebből rajzolódik a trenddiagram, a cég előzményeinek hosszától függetlenül),
+    - cégenként a legkisebb négyzetes trendegyenes futó összegei (n, Σt, Σt², Σy, Σty),
+      így a potenciál és minden "Hatás Pont" meredeksége (pont/negyedév) O(1) lekérdezés.
+
+Használat:
+    python history.py show "Példa Kft."
+    python history.py import korabbi_ertekelesek.csv --company-column ceg --date-column datum
+"""
+import argparse
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from factors import FACTOR_CODES, FACTOR_KEYS
+from lookup_table import index_to_ratings, profile_index
+from scoring import NUM_FACTORS, as_ratings_array, frame_ratings, score_profiles
+from settings import STORE_PATH, STORE_POOL_SIZE
+from store import ConnectionPool
+
+# A trend időtengelye: negyedévek 2000-01-01 (UTC) óta; a kis értékek miatt a futó
+# összegekből számolt meredekség numerikusan stabil
+TREND_EPOCH = 946684800
+QUARTER_SECONDS = 365.25 * 24 * 3600 / 4
+
+# Az összegzett sorozatok: a potenciál, majd tényezőnként a "Hatás Pont"
+SERIES_COLUMNS = ("potential",) + FACTOR_CODES
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS history_companies (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    assessments INTEGER NOT NULL DEFAULT 0,
+    first_at INTEGER,
+    last_at INTEGER,
+    sum_t REAL NOT NULL DEFAULT 0,
+    sum_tt REAL NOT NULL DEFAULT 0,
+    {", ".join(f"{column}_sum REAL NOT NULL DEFAULT 0, {column}_tsum REAL NOT NULL DEFAULT 0" for column in SERIES_COLUMNS)}
+);
+CREATE TABLE IF NOT EXISTS history_assessments (
+    company_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    assessed_at INTEGER NOT NULL,
+    profile INTEGER NOT NULL,
+    PRIMARY KEY (company_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_history_assessments_time ON history_assessments (company_id, assessed_at);
+CREATE TABLE IF NOT EXISTS history_quarters (
+    company_id INTEGER NOT NULL,
+    quarter INTEGER NOT NULL,
+    assessments INTEGER NOT NULL,
+    {", ".join(f"{column}_sum REAL NOT NULL" for column in SERIES_COLUMNS)},
+    PRIMARY KEY (company_id, quarter)
+) WITHOUT ROWID;
+"""
+
+_UPSERT_QUARTER = (
+    f"INSERT INTO history_quarters (company_id, quarter, assessments, {', '.join(f'{column}_sum' for column in SERIES_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * (len(SERIES_COLUMNS) + 3))}) "
+    f"ON CONFLICT (company_id, quarter) DO UPDATE SET assessments = assessments + excluded.assessments, "
+    + ", ".join(f"{column}_sum = {column}_sum + excluded.{column}_sum" for column in SERIES_COLUMNS)
+)
+
+_UPDATE_COMPANY = (
+    "UPDATE history_companies SET assessments = assessments + ?, "
+    "first_at = MIN(COALESCE(first_at, ?), ?), last_at = MAX(COALESCE(last_at, ?), ?), "
+    "sum_t = sum_t + ?, sum_tt = sum_tt + ?, "
+    + ", ".join(f"{column}_sum = {column}_sum + ?, {column}_tsum = {column}_tsum + ?" for column in SERIES_COLUMNS)
+    + " WHERE id = ?"
+)
+
+
+def quarter_key(timestamp):
+    """
+    Időbélyeg -> negyedévkód (év * 4 + negyedév 0-3), UTC szerint (mint a TREND_EPOCH), így az
+    aggregátumok nem függnek a szerver időzónájától; a CSV import időzóna nélküli dátumai is UTC-k.
+    """
+    moment = datetime.fromtimestamp(timestamp, timezone.utc)
+    return moment.year * 4 + (moment.month - 1) // 3
+
+
+def quarter_label(quarter):
+    return f"{quarter // 4} Q{quarter % 4 + 1}"
+
+
+def _series_values(ratings):
+    # (N, 10): a potenciál és a 9 "Hatás Pont" értékelésenként
+    result = score_profiles(ratings)
+    return np.column_stack([result.potential, result.hatas_pont])
+
+
+class TrendSeries:
+    """
+    Negyedéves átlagok egy cégre: címkék, értékelésszámok, potenciál és "Hatás Pont" hozzájárulások.
+    """
+    __slots__ = ("quarters", "labels", "counts", "potential", "hatas_pont")
+
+    def __init__(self, quarters, counts, sums):
+        self.quarters = quarters                                 # negyedévkódok időrendben
+        self.labels = [quarter_label(quarter) for quarter in quarters]
+        self.counts = counts                                     # (Q,) értékelések száma
+        averages = sums / counts[:, None] if len(counts) else sums
+        self.potential = averages[:, 0]                          # (Q,)   átlagos potenciál
+        self.hatas_pont = averages[:, 1:]                        # (Q, 9) átlagos "Hatás Pont"
+
+
+class CompanyTrend:
+    """
+    Egy cég trendösszesítője: értékelésszám, időtartam, meredekségek és a legutóbbi két értékelés.
+    """
+    __slots__ = ("count", "first_at", "last_at", "potential_slope", "hatas_pont_slopes",
+                 "latest_ratings", "latest_potential", "previous_potential")
+
+    def __init__(self, count, first_at, last_at, potential_slope, hatas_pont_slopes, latest_ratings, latest_potential, previous_potential):
+        self.count = count
+        self.first_at = first_at
+        self.last_at = last_at
+        self.potential_slope = potential_slope       # pont/negyedév, vagy None (legalább két időpont kell)
+        self.hatas_pont_slopes = hatas_pont_slopes   # (9,) pont/negyedév, vagy None
+        self.latest_ratings = latest_ratings         # tényezőnév -> értékelés
+        self.latest_potential = latest_potential
+        self.previous_potential = previous_potential  # az előző értékelés potenciálja, vagy None
+
+
+class AssessmentHistory:
+    """
+    Cégenkénti értékelés-idősorok tömör tárolása és a trendek előre aggregált lekérdezése.
+    """
+
+    def __init__(self, path=STORE_PATH, pool_size=STORE_POOL_SIZE):
+        self.pool = ConnectionPool(path, pool_size)
+        with self.pool.connection() as connection:
+            connection.executescript(_SCHEMA)
+
+    def add(self, company, selected_factors, assessed_at=None):
+        """
+        Egy értékelés hozzáadása a cég idősorához (alapértelmezés szerint a jelenlegi időponttal).
+        """
+        return self.add_many(company, as_ratings_array(selected_factors), [time.time() if assessed_at is None else assessed_at])
+
+    def add_many(self, company, ratings, timestamps, skip_existing=False):
+        """
+        Több értékelés (pl. korábbi adatok importja) egy tranzakcióban; a mentett sorok száma.
+        skip_existing=True esetén a cégnél már tárolt (időbélyeg, értékelés) párok és a kötegen
+        belüli ismétlődések kimaradnak, így ugyanannak a fájlnak az újraimportja nem duplikál.
+        """
+        arr = as_ratings_array(ratings)
+        timestamps = np.asarray(timestamps, dtype=float).round().astype(np.int64)
+        if len(timestamps) != len(arr):
+            raise ValueError("Az időbélyegek és az értékelések száma eltér.")
+        if not len(arr):
+            return 0
+        profiles = profile_index(arr)
+        with self.pool.connection() as connection, connection:
+            connection.execute("INSERT OR IGNORE INTO history_companies (name) VALUES (?)", (company,))
+            company_id, start_seq = connection.execute("SELECT id, assessments FROM history_companies WHERE name = ?", (company,)).fetchone()
+            if skip_existing:
+                seen = set(connection.execute(
+                    "SELECT assessed_at, profile FROM history_assessments WHERE company_id = ? AND assessed_at BETWEEN ? AND ?",
+                    (company_id, int(timestamps.min()), int(timestamps.max()))).fetchall())
+                keep = np.zeros(len(arr), dtype=bool)
+                for row, key in enumerate(zip(timestamps.tolist(), profiles.tolist())):
+                    if key not in seen:
+                        seen.add(key)
+                        keep[row] = True
+                arr, timestamps, profiles = arr[keep], timestamps[keep], profiles[keep]
+                if not len(arr):
+                    return 0
+            self._insert(connection, company_id, start_seq, arr, timestamps, profiles.tolist())
+        return len(arr)
+
+    @staticmethod
+    def _insert(connection, company_id, start_seq, arr, timestamps, profiles):
+        # Az értékelések és az előre aggregált összegek írása a hívó tranzakciójában
+        values = _series_values(arr)
+        t = (timestamps - TREND_EPOCH) / QUARTER_SECONDS
+
+        # Negyedévenkénti összegek a kötegből
+        quarters = np.array([quarter_key(int(timestamp)) for timestamp in timestamps])
+        unique_quarters, inverse = np.unique(quarters, return_inverse=True)
+        quarter_counts = np.bincount(inverse)
+        quarter_sums = np.zeros((len(unique_quarters), len(SERIES_COLUMNS)))
+        np.add.at(quarter_sums, inverse, values)
+
+        first_at, last_at = int(timestamps.min()), int(timestamps.max())
+        running = [float(len(arr)), first_at, first_at, last_at, last_at, float(t.sum()), float((t * t).sum())]
+        for col in range(len(SERIES_COLUMNS)):
+            running += [float(values[:, col].sum()), float((t * values[:, col]).sum())]
+
+        connection.executemany(
+            "INSERT INTO history_assessments (company_id, seq, assessed_at, profile) VALUES (?, ?, ?, ?)",
+            [(company_id, start_seq + offset, timestamp, profile)
+             for offset, (timestamp, profile) in enumerate(zip(timestamps.tolist(), profiles))])
+        connection.executemany(_UPSERT_QUARTER, [(company_id, int(quarter), int(count), *sums)
+                                                 for quarter, count, sums in zip(unique_quarters, quarter_counts, quarter_sums.tolist())])
+        connection.execute(_UPDATE_COMPANY, running + [company_id])
+
+    def companies(self):
+        with self.pool.connection() as connection:
+            return [name for (name,) in connection.execute("SELECT name FROM history_companies ORDER BY name")]
+
+    def assessments(self, company):
+        """
+        A cég összes értékelése időrendben: (időbélyegek (N,), értékelések (N, 9)).
+        """
+        with self.pool.connection() as connection:
+            rows = connection.execute(
+                "SELECT h.assessed_at, h.profile FROM history_assessments h JOIN history_companies c ON c.id = h.company_id "
+                "WHERE c.name = ? ORDER BY h.assessed_at, h.seq", (company,)).fetchall()
+        if not rows:
+            return np.empty(0, dtype=np.int64), np.empty((0, NUM_FACTORS), dtype=np.int8)
+        timestamps, profiles = np.asarray(rows, dtype=np.int64).T
+        return timestamps, index_to_ratings(profiles)
+
+    def quarterly_series(self, company):
+        """
+        A trenddiagram adatai a negyedéves összegekből (legfeljebb negyedévenként egy sor beolvasása).
+        """
+        with self.pool.connection() as connection:
+            rows = connection.execute(
+                f"SELECT q.quarter, q.assessments, {', '.join(f'q.{column}_sum' for column in SERIES_COLUMNS)} "
+                "FROM history_quarters q JOIN history_companies c ON c.id = q.company_id "
+                "WHERE c.name = ? ORDER BY q.quarter", (company,)).fetchall()
+        data = np.asarray(rows, dtype=float).reshape(-1, len(SERIES_COLUMNS) + 2)
+        return TrendSeries(data[:, 0].astype(int).tolist(), data[:, 1], data[:, 2:])
+
+    def trend(self, company):
+        """
+        A cég trendösszesítője a futó összegekből és a legutóbbi két értékelésből; None, ha nincs adat.
+        """
+        with self.pool.connection() as connection:
+            row = connection.execute(
+                f"SELECT id, assessments, first_at, last_at, sum_t, sum_tt, "
+                f"{', '.join(f'{column}_sum, {column}_tsum' for column in SERIES_COLUMNS)} "
+                "FROM history_companies WHERE name = ?", (company,)).fetchone()
+            if row is None or not row[1]:
+                return None
+            latest = connection.execute(
+                "SELECT profile FROM history_assessments WHERE company_id = ? ORDER BY assessed_at DESC, seq DESC LIMIT 2",
+                (row[0],)).fetchall()
+        count, first_at, last_at, sum_t, sum_tt = row[1:6]
+        sums = np.asarray(row[6:], dtype=float).reshape(len(SERIES_COLUMNS), 2)
+        # Legkisebb négyzetes meredekség: (n Σty - Σt Σy) / (n Σt² - (Σt)²)
+        denominator = count * sum_tt - sum_t * sum_t
+        slopes = None
+        if count > 1 and denominator > 1e-9 * count * count:
+            slopes = (count * sums[:, 1] - sum_t * sums[:, 0]) / denominator
+        latest_values = _series_values(index_to_ratings([profile for (profile,) in latest]))
+        return CompanyTrend(
+            count, first_at, last_at,
+            None if slopes is None else float(slopes[0]),
+            None if slopes is None else slopes[1:],
+            dict(zip(FACTOR_KEYS, index_to_ratings(latest[0][0])[0].tolist())),
+            float(latest_values[0, 0]),
+            float(latest_values[1, 0]) if len(latest) > 1 else None,
+        )
+
+
+@lru_cache(maxsize=None)
+def get_history(path=STORE_PATH):
+    """
+    Folyamatonként egyetlen idősor-tároló útvonalanként.
+    """
+    return AssessmentHistory(path)
+
+
+def import_csv(history, path, company_column, date_column):
+    """
+    Korábbi értékelések importja CSV-ből (tényezőnevek vagy rövid kódok oszlopai).
+    Írás előtt a teljes fájl ellenőrzésre kerül: a hiányzó cégű, érvénytelen dátumú vagy
+    értékelésű sorok kimaradnak, a már tárolt értékelések pedig nem duplikálódnak.
+    Eredmény: (mentett sorok, érvénytelen sorok, már tárolt sorok).
+    """
+    df = pd.read_csv(path)
+    missing = [column for column in (company_column, date_column) if column not in df.columns]
+    if missing:
+        raise ValueError(f"Hiányzó oszlopok a bemenetben: {', '.join(missing)}")
+    valid_ratings, valid = frame_ratings(df)
+    ratings = np.zeros((len(df), NUM_FACTORS), dtype=np.int8)
+    ratings[valid] = valid_ratings
+    moments = pd.to_datetime(df[date_column], errors="coerce")
+    valid &= moments.notna().to_numpy() & df[company_column].notna().to_numpy()
+    ratings = ratings[valid]
+    rows = pd.DataFrame({"company": df.loc[valid, company_column].astype(str).to_numpy(),
+                         "timestamp": moments[valid].map(lambda moment: moment.timestamp()).to_numpy()})
+    saved = 0
+    for company, group in rows.groupby("company", sort=False):
+        saved += history.add_many(company, ratings[group.index.to_numpy()], group["timestamp"].to_numpy(), skip_existing=True)
+    invalid = int(len(df) - valid.sum())
+    return saved, invalid, int(valid.sum()) - saved
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kkv értékelések idősora és trendjei.")
+    parser.add_argument("command", choices=("show", "import"))
+    parser.add_argument("target", help="show: a cég neve, import: a CSV fájl")
+    parser.add_argument("--db", default=STORE_PATH, help="Az SQLite adatbázis fájl")
+    parser.add_argument("--company-column", default="company", help="import: a cégazonosító oszlop")
+    parser.add_argument("--date-column", default="date", help="import: az értékelés dátumának oszlopa")
+    args = parser.parse_args(argv)
+    history = AssessmentHistory(args.db)
+    if args.command == "import":
+        try:
+            saved, invalid, existing = import_csv(history, args.target, args.company_column, args.date_column)
+        except ValueError as e:
+            raise SystemExit(f"Hiba az importálás közben: {e}")
+        print(f"{saved} értékelés importálva.")
+        if invalid:
+            print(f"Figyelem: {invalid} érvénytelen sor (hiányzó cég, dátum vagy 1-5 közötti egész értékelés) kimaradt.")
+        if existing:
+            print(f"{existing} már tárolt értékelés kimaradt.")
+        return
+    trend = history.trend(args.target)
+    if trend is None:
+        print(f"Nincs tárolt értékelés: {args.target}")
+        return
+    print(f"Értékelések: {trend.count} ({datetime.fromtimestamp(trend.first_at, timezone.utc):%Y-%m-%d} – {datetime.fromtimestamp(trend.last_at, timezone.utc):%Y-%m-%d})")
+    print(f"Legutóbbi potenciál: {trend.latest_potential:.1f} %")
+    if trend.potential_slope is not None:
+        print(f"Trend: {trend.potential_slope:+.2f} pont/negyedév")
+    series = history.quarterly_series(args.target)
+    for label, count, potential in zip(series.labels, series.counts, series.potential):
+        print(f"  {label}: {potential:.1f} % ({int(count)} értékelés)")
+
+
+if __name__ == "__main__":
+    main()
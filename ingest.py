@@ -0,0 +1,497 @@
+"""
+Web űrlapon beküldött kkv önértékelések folyamatos (stream) feldolgozása, Streamlit nélkül.
+
+A rekordok egy helyi forrásból érkeznek: bővülő JSONL fájl (tail), figyelt könyvtár
+vagy folyamaton belüli sor (queue.Queue). Minden rekordot a factor_definitions alapján
+ellenőrzünk, majd mikrokötegekben pontozunk (potenciál, kategória, VRIO jelzők és
+versenyelőny kategóriák), és JSONL kimenetre, opcionálisan az értékelés-tárolóba
+(store.py) továbbítunk. Az érvénytelen rekordok a hiba okával külön JSONL fájlba kerülnek.
+
+Az olvasó szál és a pontozás egy korlátos sorral kapcsolódik: ha a pontozás lemarad,
+az olvasó vár (backpressure). Kötegenként naplózzuk a méretet, a pontozás és a teljes
+(beérkezéstől továbbításig tartó) késleltetést, a sor telítettségét és az olvasó
+várakozási idejét; a futás végén összesítés készül.
+
+Rekord (soronként egy JSON objektum, figyelt könyvtárban fájlonként egy objektum vagy JSONL):
+    {"id": "urlap-123", "company": "Példa Kft.", "ratings": {"innovacio": 4, ...}}
+A "ratings" kulcsai a tényezők teljes nevei vagy a rövid kódok (FACTOR_CODES); "ratings"
+hiányában a tényezőket a rekord felső szintjén keressük.
+
+Használat:
+    python ingest.py tail beerkezo.jsonl --output pontozott.jsonl [--from-start] [--store assessments.sqlite3]
+    python ingest.py watch beerkezo_konyvtar --output pontozott.jsonl --rejected hibas.jsonl
+    python ingest.py tail beerkezo.jsonl --from-start --once   (a meglévő tartalom feldolgozása, majd kilépés)
+
+A figyelt könyvtárba a fájlokat atomikusan (ideiglenes néven megírva, majd átnevezve)
+kell elhelyezni; a feldolgozott fájlok a "feldolgozott" alkönyvtárba kerülnek.
+"""
+import argparse
+import glob
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from factors import FACTOR_CODES, FACTOR_KEYS, factor_definitions
+from scoring import TIER_LABELS, get_potential_tier, score_profiles
+from settings import INGEST_BATCH_SIZE, INGEST_MAX_WAIT_MS, INGEST_QUEUE_SIZE
+from store import AssessmentStore
+from vrio import VERDICT_LABELS, VRIO_CRITERIA, get_rule_set
+
+POLL_INTERVAL = 0.2
+PROCESSED_DIR_NAME = "feldolgozott"
+# A késleltetési percentilisekhez megtartott legutóbbi kötegek száma
+LATENCY_WINDOW = 10_000
+PERCENTILES = (50, 95, 99)
+
+# A forrás végét jelző elem a sorban
+END_OF_STREAM = object()
+
+
+# --- Források: (nyers rekord, eredet) párokat adnak, amíg a stop_event nincs beállítva ---
+
+class JsonlTailSource:
+    """
+    Bővülő JSONL fájl követése (mint a "tail -f"); a félig megírt utolsó sort kivárja.
+    """
+
+    def __init__(self, path, from_start=False, follow=True):
+        self.path = path
+        self.from_start = from_start
+        self.follow = follow
+
+    def records(self, stop_event):
+        while not os.path.exists(self.path):
+            if not self.follow or stop_event.wait(POLL_INTERVAL):
+                return
+        with open(self.path, encoding="utf-8") as f:
+            if not self.from_start:
+                f.seek(0, os.SEEK_END)
+            partial = ""
+            line_number = 0
+            while not stop_event.is_set():
+                line = f.readline()
+                if line:
+                    partial += line
+                    if partial.endswith("\n"):
+                        line_number += 1
+                        if partial.strip():
+                            yield partial, f"{self.path}:{line_number}"
+                        partial = ""
+                    continue
+                if not self.follow:
+                    break
+                if os.path.getsize(self.path) < f.tell():
+                    # A fájlt csonkolták (pl. naplóforgatás): elölről olvassuk
+                    f.seek(0)
+                    partial, line_number = "", 0
+                stop_event.wait(POLL_INTERVAL)
+            if partial.strip() and not self.follow:
+                yield partial, f"{self.path}:{line_number + 1}"
+
+
+class DirectorySource:
+    """
+    Figyelt könyvtár: az új *.json / *.jsonl fájlok rekordjai, név szerinti sorrendben.
+    """
+
+    def __init__(self, directory, follow=True):
+        self.directory = directory
+        self.follow = follow
+        self.processed_dir = os.path.join(directory, PROCESSED_DIR_NAME)
+
+    def _pending_files(self):
+        paths = glob.glob(os.path.join(self.directory, "*.json")) + glob.glob(os.path.join(self.directory, "*.jsonl"))
+        return sorted(paths)
+
+    def records(self, stop_event):
+        os.makedirs(self.processed_dir, exist_ok=True)
+        while not stop_event.is_set():
+            paths = self._pending_files()
+            for path in paths:
+                with open(path, encoding="utf-8") as f:
+                    content = f.read()
+                name = os.path.basename(path)
+                if path.endswith(".jsonl"):
+                    for line_number, line in enumerate(content.splitlines(), start=1):
+                        if line.strip():
+                            yield line, f"{name}:{line_number}"
+                else:
+                    yield content, name
+                os.replace(path, os.path.join(self.processed_dir, name))
+                if stop_event.is_set():
+                    return
+            if not self.follow:
+                return
+            if not paths:
+                stop_event.wait(POLL_INTERVAL)
+
+
+class QueueSource:
+    """
+    Folyamaton belüli forrás (pl. az űrlapkezelő put()-tal ír bele); a close() zárja le a folyamot.
+    """
+
+    def __init__(self, source_queue=None):
+        self.queue = source_queue if source_queue is not None else queue.Queue()
+        self._received = 0
+
+    def put(self, record):
+        self.queue.put(record)
+
+    def close(self):
+        self.queue.put(END_OF_STREAM)
+
+    def records(self, stop_event):
+        while not stop_event.is_set():
+            try:
+                record = self.queue.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if record is END_OF_STREAM:
+                return
+            self._received += 1
+            yield record, f"queue:{self._received}"
+
+
+# --- Ellenőrzés és pontozás ---
+
+def validate_record(raw):
+    """
+    Nyers rekord (JSON szöveg vagy szótár) -> (9 értékelés, azonosító, cég). Hibás rekordnál ValueError.
+    """
+    if isinstance(raw, (str, bytes)):
+        try:
+            raw = json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Érvénytelen JSON: {e}")
+    if not isinstance(raw, dict):
+        raise ValueError("A rekordnak JSON objektumnak kell lennie.")
+    ratings = raw.get("ratings", raw)
+    if not isinstance(ratings, dict):
+        raise ValueError("A 'ratings' mezőnek objektumnak kell lennie.")
+    if "ratings" in raw:
+        unknown = set(ratings) - set(FACTOR_KEYS) - set(FACTOR_CODES)
+        if unknown:
+            raise ValueError(f"Ismeretlen tényező: {', '.join(sorted(unknown))}")
+    values = []
+    for factor_name, factor_code in zip(FACTOR_KEYS, FACTOR_CODES):
+        value = ratings.get(factor_name, ratings.get(factor_code))
+        if value is None:
+            raise ValueError(f"Hiányzó tényező: '{factor_name}' (vagy '{factor_code}')")
+        if isinstance(value, str) and value.strip().isdigit():
+            value = int(value)
+        # Érvényes érték a factor_definitions szintjei közül (1-5)
+        if isinstance(value, bool) or not isinstance(value, int) or value not in factor_definitions[factor_name]:
+            raise ValueError(f"Érvénytelen értékelés ({factor_name}): {value!r}")
+        values.append(value)
+    return values, raw.get("id"), raw.get("company")
+
+
+class ScoredBatch:
+    """
+    Egy pontozott mikroköteg: a továbbítandó rekordok és a tárolóhoz szükséges tömbök.
+    """
+    __slots__ = ("records", "ratings", "companies", "potentials")
+
+    def __init__(self, records, ratings, companies, potentials):
+        self.records = records          # JSON-ként továbbítandó szótárak
+        self.ratings = ratings          # (N, 9) int8
+        self.companies = companies      # N cégazonosító (vagy None)
+        self.potentials = potentials    # (N,) potenciál
+
+
+def score_records(validated, rule_set=None):
+    """
+    Ellenőrzött rekordok [(értékelések, azonosító, cég, eredet), ...] vektorizált pontozása.
+    """
+    rule_set = rule_set or get_rule_set()
+    ratings = np.asarray([values for values, _, _, _ in validated], dtype=np.int8).reshape(-1, len(FACTOR_KEYS))
+    potentials = score_profiles(ratings).potential
+    tiers = get_potential_tier(potentials)
+    flags, verdicts = rule_set.evaluate_with_verdicts(ratings)
+    scored_at = time.time()
+    records = []
+    for row, (values, record_id, company, origin) in enumerate(validated):
+        records.append({
+            "id": record_id,
+            "company": company,
+            "source": origin,
+            "ratings": dict(zip(FACTOR_CODES, values)),
+            "potential": float(potentials[row]),
+            "tier": TIER_LABELS[tiers[row]],
+            "vrio": {resource: dict(zip(VRIO_CRITERIA, flags[row, resource_index].tolist()))
+                     for resource_index, resource in enumerate(rule_set.resources)},
+            "verdicts": {resource: VERDICT_LABELS[verdicts[row, resource_index]]
+                         for resource_index, resource in enumerate(rule_set.resources)},
+            "scored_at": scored_at,
+        })
+    return ScoredBatch(records, ratings, [company for _, _, company, _ in validated], potentials)
+
+
+# --- Kimenetek ---
+
+class JsonlSink:
+    """
+    Rekordok hozzáfűzése JSONL fájlhoz (útvonal nélkül a szabványos kimenetre).
+    """
+
+    def __init__(self, path=None):
+        self._file = open(path, "a", encoding="utf-8") if path else sys.stdout
+        self._owned = bool(path)
+
+    def write(self, records):
+        for record in records:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def send(self, batch):
+        self.write(batch.records)
+
+    def close(self):
+        if self._owned:
+            self._file.close()
+
+
+class StoreSink:
+    """
+    A pontozott rekordok mentése az értékelés-tárolóba (egy köteg egy tranzakció).
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    def send(self, batch):
+        if len(batch.ratings):
+            self.store.save_many(batch.ratings, batch.companies, batch.potentials)
+
+    def close(self):
+        pass
+
+
+# --- Mérőszámok ---
+
+class IngestMetrics:
+    """
+    Kötegenkénti késleltetések, sor telítettség és az olvasó várakozása (backpressure).
+    """
+
+    def __init__(self, queue_size):
+        self.queue_size = queue_size
+        self.batches = 0
+        self.records = 0
+        self.rejected = 0
+        self.queue_high_water = 0
+        self.producer_waits = 0         # ennyiszer talált tele sort az olvasó
+        self.producer_wait_seconds = 0.0
+        self.processing_latencies = deque(maxlen=LATENCY_WINDOW)  # ellenőrzés + pontozás + továbbítás
+        self.end_to_end_latencies = deque(maxlen=LATENCY_WINDOW)  # a köteg legrégebbi rekordjának beérkezésétől
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self.producer_waits += 1
+            self.producer_wait_seconds += seconds
+
+    def record_batch(self, size, rejected, processing_seconds, end_to_end_seconds, queue_depth):
+        with self._lock:
+            self.batches += 1
+            self.records += size
+            self.rejected += rejected
+            self.queue_high_water = max(self.queue_high_water, queue_depth)
+            self.processing_latencies.append(processing_seconds)
+            self.end_to_end_latencies.append(end_to_end_seconds)
+
+    def summary(self):
+        with self._lock:
+            elapsed = time.perf_counter() - self.started
+
+            def percentiles(samples):
+                if not samples:
+                    return {}
+                return dict(zip((f"p{p}_ms" for p in PERCENTILES), (np.percentile(np.asarray(samples) * 1000, PERCENTILES)).tolist()))
+
+            return {
+                "batches": self.batches,
+                "records": self.records,
+                "rejected": self.rejected,
+                "records_per_s": self.records / elapsed if elapsed else 0.0,
+                "processing": percentiles(self.processing_latencies),
+                "end_to_end": percentiles(self.end_to_end_latencies),
+                "queue_high_water": self.queue_high_water,
+                "queue_size": self.queue_size,
+                "producer_waits": self.producer_waits,
+                "producer_wait_s": self.producer_wait_seconds,
+            }
+
+
+# --- A folyam: olvasó szál -> korlátos sor -> mikrokötegek ---
+
+class IngestPipeline:
+    """
+    Egy forrás rekordjainak folyamatos ellenőrzése, mikrokötegelt pontozása és továbbítása.
+    """
+
+    def __init__(self, source, sinks, rejected_sink=None, batch_size=INGEST_BATCH_SIZE, max_wait=INGEST_MAX_WAIT_MS / 1000,
+                 queue_size=INGEST_QUEUE_SIZE, rule_set=None, log=sys.stderr):
+        self.source = source
+        self.sinks = list(sinks)
+        self.rejected_sink = rejected_sink
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.rule_set = rule_set or get_rule_set()
+        self.log = log
+        self.metrics = IngestMetrics(queue_size)
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stop_event = threading.Event()
+        self._reader = threading.Thread(target=self._read, name="ingest-reader", daemon=True)
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _put(self, item):
+        try:
+            self._queue.put_nowait(item)
+            return
+        except queue.Full:
+            pass
+        # Tele a sor: az olvasó megvárja a pontozást (backpressure), közben a leállítást figyeli
+        started = time.perf_counter()
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put(item, timeout=POLL_INTERVAL)
+                break
+            except queue.Full:
+                continue
+        self.metrics.record_wait(time.perf_counter() - started)
+
+    def _read(self):
+        try:
+            for raw, origin in self.source.records(self._stop_event):
+                self._put((raw, origin, time.perf_counter()))
+                if self._stop_event.is_set():
+                    break
+        except Exception as e:
+            print(f"Hiba a forrás olvasása közben: {e}", file=self.log)
+        finally:
+            # A lezáró elemnek akkor is be kell kerülnie, ha a sor tele van
+            self._queue.put(END_OF_STREAM)
+
+    def _next_batch(self):
+        # Az első rekordra korlátlanul várunk, utána legfeljebb max_wait ideig gyűjtünk
+        first = self._queue.get()
+        if first is END_OF_STREAM:
+            return None, True
+        items = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(items) < self.batch_size:
+            timeout = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is END_OF_STREAM:
+                return items, True
+            items.append(item)
+        return items, False
+
+    def process_batch(self, items):
+        """
+        Egy mikroköteg ellenőrzése, pontozása és továbbítása; a visszatérési érték a pontozott köteg.
+        """
+        started = time.perf_counter()
+        validated, rejected = [], []
+        for raw, origin, _ in items:
+            try:
+                values, record_id, company = validate_record(raw)
+            except ValueError as e:
+                rejected.append({"source": origin, "error": str(e), "record": raw if isinstance(raw, (dict, str)) else repr(raw)})
+                continue
+            validated.append((values, record_id, company, origin))
+        batch = score_records(validated, self.rule_set)
+        for sink in self.sinks:
+            sink.send(batch)
+        if rejected and self.rejected_sink is not None:
+            self.rejected_sink.write(rejected)
+        finished = time.perf_counter()
+        processing = finished - started
+        end_to_end = finished - min(received for _, _, received in items)
+        queue_depth = self._queue.qsize()
+        self.metrics.record_batch(len(validated), len(rejected), processing, end_to_end, queue_depth)
+        print(f"{self.metrics.batches}. köteg: {len(validated)} rekord, {len(rejected)} érvénytelen, "
+              f"feldolgozás {processing * 1000:.1f} ms, beérkezéstől {end_to_end * 1000:.1f} ms, "
+              f"sor: {queue_depth}/{self.metrics.queue_size}, olvasó várakozása: {self.metrics.producer_wait_seconds:.2f} s",
+              file=self.log)
+        return batch
+
+    def run(self):
+        """
+        A folyam futtatása a forrás végéig (vagy a stop() hívásáig); a visszatérési érték az összesítés.
+        """
+        self._reader.start()
+        try:
+            finished = False
+            while not finished:
+                items, finished = self._next_batch()
+                if items:
+                    self.process_batch(items)
+        finally:
+            self._stop_event.set()
+            for sink in self.sinks:
+                sink.close()
+            if self.rejected_sink is not None:
+                self.rejected_sink.close()
+        return self.metrics.summary()
+
+
+def format_summary(summary):
+    lines = [f"Összesen: {summary['records']} rekord, {summary['rejected']} érvénytelen, {summary['batches']} köteg "
+             f"({summary['records_per_s']:.1f} rekord/s)"]
+    for label, key in (("Feldolgozás", "processing"), ("Beérkezéstől", "end_to_end")):
+        if summary[key]:
+            lines.append(f"{label}: " + ", ".join(f"{name[:-3]} {value:.1f} ms" for name, value in summary[key].items()))
+    lines.append(f"Sor csúcstelítettség: {summary['queue_high_water']}/{summary['queue_size']}, "
+                 f"olvasó várakozása: {summary['producer_waits']} alkalom, {summary['producer_wait_s']:.2f} s")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kkv önértékelések folyamatos pontozása helyi forrásból.")
+    parser.add_argument("mode", choices=("tail", "watch"), help="tail: bővülő JSONL fájl, watch: figyelt könyvtár")
+    parser.add_argument("path", help="A JSONL fájl vagy a figyelt könyvtár")
+    parser.add_argument("--output", help="A pontozott rekordok JSONL fájlja (alapértelmezés: szabványos kimenet)")
+    parser.add_argument("--rejected", help="Az érvénytelen rekordok JSONL fájlja")
+    parser.add_argument("--store", help="A pontozott rekordok mentése ebbe az SQLite értékelés-tárolóba")
+    parser.add_argument("--from-start", action="store_true", help="tail módban a fájl meglévő tartalmát is feldolgozza")
+    parser.add_argument("--once", action="store_true", help="A jelenlegi tartalom feldolgozása után kilép")
+    parser.add_argument("--batch-size", type=int, default=INGEST_BATCH_SIZE, help="Rekordok száma mikrokötegenként (legfeljebb)")
+    parser.add_argument("--max-wait-ms", type=int, default=INGEST_MAX_WAIT_MS, help="Egy mikroköteg gyűjtésének leghosszabb ideje")
+    parser.add_argument("--queue-size", type=int, default=INGEST_QUEUE_SIZE, help="Az olvasó és a pontozás közötti sor mérete")
+    args = parser.parse_args(argv)
+
+    follow = not args.once
+    if args.mode == "tail":
+        source = JsonlTailSource(args.path, from_start=args.from_start, follow=follow)
+    else:
+        source = DirectorySource(args.path, follow=follow)
+    sinks = [JsonlSink(args.output)]
+    if args.store:
+        sinks.append(StoreSink(AssessmentStore(args.store)))
+    pipeline = IngestPipeline(source, sinks, JsonlSink(args.rejected) if args.rejected else None,
+                              batch_size=args.batch_size, max_wait=args.max_wait_ms / 1000, queue_size=args.queue_size)
+    try:
+        summary = pipeline.run()
+    except KeyboardInterrupt:
+        pipeline.stop()
+        summary = pipeline.metrics.summary()
+    print(format_summary(summary), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
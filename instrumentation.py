@@ -0,0 +1,159 @@
+import contextlib
+import cProfile
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+from settings import INSTRUMENTATION_ENABLED, PROFILE_DIR
+
+# --- Újrafuttatásonkénti (rerun) időmérés és opcionális cProfile ---
+# Bekapcsolva (RBVKKV_INSTRUMENT=1) minden rerun szakaszai (session state, pontozás,
+# táblázatok, diagram renderelés és PNG szerializálás, küldés) külön időt kapnak. A rerun
+# végén egy "rerun page=... total_ms=... <szakasz>_ms=..." naplósor készül, az oldalankénti
+# összesítés pedig a page_stats()-ból olvasható. RBVKKV_PROFILE_DIR megadásakor minden
+# rerun cProfile kimenete .prof fájlba kerül. Kikapcsolva a stage() egy üres kontextuskezelő.
+
+logger = logging.getLogger("rbvkkv.instrumentation")
+if INSTRUMENTATION_ENABLED and not logger.handlers:
+    # Saját kimenet a naplósoroknak, hogy külön naplókonfiguráció nélkül is gyűjthetők legyenek
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_local = threading.local()
+_stats_lock = threading.Lock()
+# oldal -> szakasz -> [darab, összes idő (s), legnagyobb idő (s)]
+_page_stats = defaultdict(lambda: defaultdict(lambda: [0, 0.0, 0.0]))
+
+_NULL_CONTEXT = contextlib.nullcontext()
+TOTAL_STAGE = "total"
+
+
+class _RerunRecord:
+    __slots__ = ("started", "stages", "profiler")
+
+    def __init__(self, profiler=None):
+        self.started = time.perf_counter()
+        self.stages = defaultdict(float)
+        self.profiler = profiler
+
+
+def start_rerun():
+    """
+    Egy rerun mérésének kezdete (az app.py elején); a korábbi, félbemaradt mérést eldobja.
+    """
+    if not INSTRUMENTATION_ENABLED:
+        return
+    _discard_profiler(getattr(_local, "record", None))
+    profiler = None
+    if PROFILE_DIR:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    _local.record = _RerunRecord(profiler)
+
+
+def _discard_profiler(record):
+    # Az st.rerun() kivétellel szakítja meg a futást, ilyenkor a profiler még fut
+    if record is not None and record.profiler is not None:
+        record.profiler.disable()
+
+
+class _Stage:
+    __slots__ = ("name", "record", "started")
+
+    def __init__(self, name, record):
+        self.name = name
+        self.record = record
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.record.stages[self.name] += time.perf_counter() - self.started
+        return False
+
+
+def stage(name):
+    """
+    Kontextuskezelő egy szakasz idejének mérésére; azonos nevű szakaszok ideje összeadódik.
+    Mérés nélkül (kikapcsolva, vagy nem Streamlit szálon, pl. a PDF export) nem csinál semmit.
+    """
+    record = getattr(_local, "record", None) if INSTRUMENTATION_ENABLED else None
+    if record is None:
+        return _NULL_CONTEXT
+    return _Stage(name, record)
+
+
+def finish_rerun(page):
+    """
+    A rerun mérésének lezárása: oldalankénti összesítés, naplósor és opcionális cProfile fájl.
+    """
+    record = getattr(_local, "record", None) if INSTRUMENTATION_ENABLED else None
+    if record is None:
+        return None
+    _local.record = None
+    total = time.perf_counter() - record.started
+    stages = dict(record.stages)
+    stages[TOTAL_STAGE] = total
+    with _stats_lock:
+        page_entry = _page_stats[page]
+        for name, seconds in stages.items():
+            entry = page_entry[name]
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+    logger.info("rerun page=%s %s", _log_token(page),
+                " ".join(f"{_log_token(name)}_ms={seconds * 1000:.1f}" for name, seconds in sorted(stages.items())))
+    if record.profiler is not None:
+        record.profiler.disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        file_name = f"{_log_token(page)}-{time.time_ns()}-{threading.get_ident()}.prof"
+        record.profiler.dump_stats(os.path.join(PROFILE_DIR, file_name))
+    return stages
+
+
+@contextlib.contextmanager
+def fragment_rerun(name):
+    """
+    Egy @st.fragment törzsének mérése. Önálló fragment-újrafuttatáskor saját rerunként
+    (start_rerun / finish_rerun a fragment nevével) kerül az összesítésbe, a teljes szkript
+    futása közben pedig annak egy szakasza.
+    """
+    if not INSTRUMENTATION_ENABLED or getattr(_local, "record", None) is not None:
+        with stage(name):
+            yield
+        return
+    start_rerun()
+    try:
+        yield
+    except BaseException:
+        # Megszakított fragment (pl. st.rerun()): a félbemaradt mérés nem kerül az összesítésbe
+        _discard_profiler(getattr(_local, "record", None))
+        _local.record = None
+        raise
+    finish_rerun(name)
+
+
+def _log_token(text):
+    # Szóköz nélküli azonosító a naplósorba (kulcs=érték formátum)
+    return "_".join(str(text).split())
+
+
+def page_stats():
+    """
+    Oldalankénti összesítés: {oldal: {szakasz: {"count", "mean_ms", "max_ms"}}}.
+    """
+    with _stats_lock:
+        return {page: {name: {"count": count, "mean_ms": total / count * 1000, "max_ms": longest * 1000}
+                       for name, (count, total, longest) in stages.items()}
+                for page, stages in _page_stats.items()}
+
+
+def reset_stats():
+    with _stats_lock:
+        _page_stats.clear()
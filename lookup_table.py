@@ -0,0 +1,198 @@
+"""
+Előre kiszámított keresőtábla a teljes, 5^9 = 1 953 125 elemű tényezőtérre.
+
+Minden lehetséges profilhoz eltárolja a potenciált (fél pontokban, uint8), a kategóriát
+és a VRIO jelzőket egy 20 bites maszkba csomagolva (6 bájt/profil, kb. 12 MB). A tábla egy .npy fájl, amelyet
+memórialeképezéssel (mmap) töltünk be, így a pontozás egyetlen indexelés.
+
+Az alkalmazás RBVKKV_SCORING_LUT=1 esetén induláskor leképezi a táblát (get_table), és az
+alapképlet szerinti pontozás (scoring.cached_score_profile) a lut_score_profile-on keresztül fut.
+
+A fájl neve tartalmazza a pontozási paraméterek (0.6/0.4 súlyok, kategóriahatárok,
+tényezősorrend, VRIO szabályok) verzió-hash-ét: ha ezek változnak, új tábla épül.
+
+Használat:
+    python lookup_table.py build [--dir KÖNYVTÁR]
+"""
+import argparse
+import hashlib
+import os
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+from factors import FACTOR_KEYS
+from settings import LUT_DIR
+from scoring import (
+    BARRIER_WEIGHT,
+    HATAS_PONT_SCALE,
+    NUM_FACTORS,
+    SUPPORT_WEIGHT,
+    TIER_THRESHOLDS,
+    as_ratings_array,
+    get_potential_tier,
+    score_profiles,
+)
+from vrio import VRIO_CRITERIA, get_rule_set
+
+NUM_LEVELS = 5
+TABLE_SIZE = NUM_LEVELS ** NUM_FACTORS
+DEFAULT_TABLE_DIR = LUT_DIR
+
+# A VRIO maszk erőforrásonként 4 bitet használ, így legfeljebb 8 erőforrás fér bele
+MAX_VRIO_RESOURCES = 32 // len(VRIO_CRITERIA)
+DEFAULT_VRIO_RESOURCES = 5
+
+# Az alapképlet minden potenciálja 0,5 többszöröse (támogató lépés 3, gátló lépés 2,5 pont),
+# így fél pontokban egy bájton pontosan tárolható
+POTENTIAL_SCALE = 2
+LUT_DTYPE = np.dtype([("potential", "u1"), ("tier", "i1"), ("vrio", "<u4")])
+
+_table_lock = threading.Lock()
+
+# Helyiérték-szorzók: az első tényező a legnagyobb helyiértékű számjegy (factor_definitions sorrend)
+_PLACE_VALUES = NUM_LEVELS ** np.arange(NUM_FACTORS - 1, -1, -1, dtype=np.int64)
+
+
+def profile_index(ratings):
+    """
+    Profil(ok) -> tábla index: az (érték - 1) számjegyek 5-ös számrendszerben.
+    """
+    arr = as_ratings_array(ratings).astype(np.int64)
+    return (arr - 1) @ _PLACE_VALUES
+
+
+def index_to_ratings(index):
+    """
+    A profile_index inverze: index(ek) -> (N, 9) értékelés tömb.
+    """
+    index = np.atleast_1d(np.asarray(index, dtype=np.int64))
+    digits = (index[:, None] // _PLACE_VALUES) % NUM_LEVELS
+    return (digits + 1).astype(np.int8)
+
+
+def pack_vrio_flags(flags):
+    """
+    (N, R, 4) VRIO jelzők -> (N,) uint32 maszk; bit = erőforrás * 4 + kritérium.
+    """
+    flat = np.asarray(flags, dtype=np.uint32).reshape(len(flags), -1)
+    return flat @ (np.uint32(1) << np.arange(flat.shape[1], dtype=np.uint32))
+
+
+def scoring_version_hash(rule_set=None):
+    """
+    A pontozás paramétereinek és a VRIO szabálytábla küszöbmátrixának rövid hash-e.
+    """
+    rule_set = rule_set or get_rule_set()
+    digest = hashlib.sha256()
+    digest.update(repr(LUT_DTYPE.descr).encode("utf-8"))
+    digest.update(repr((SUPPORT_WEIGHT, BARRIER_WEIGHT, HATAS_PONT_SCALE, TIER_THRESHOLDS, FACTOR_KEYS)).encode("utf-8"))
+    digest.update(repr(rule_set.resources).encode("utf-8"))
+    digest.update(rule_set.factor_columns.astype(np.int64).tobytes())
+    digest.update(rule_set.thresholds.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def table_path(table_dir=DEFAULT_TABLE_DIR, version=None, rule_set=None):
+    return os.path.join(table_dir, f"potential_lut_{version or scoring_version_hash(rule_set)}.npy")
+
+
+def build_table(path=None, rule_set=None):
+    """
+    Felépíti és elmenti a teljes keresőtáblát. Visszaadja a fájl elérési útját.
+    """
+    rule_set = rule_set or get_rule_set()
+    if len(rule_set.resources) > MAX_VRIO_RESOURCES:
+        raise ValueError(f"A keresőtábla legfeljebb {MAX_VRIO_RESOURCES} VRIO erőforrást tud tárolni.")
+    path = path or table_path(rule_set=rule_set)
+    ratings = index_to_ratings(np.arange(TABLE_SIZE))
+    potential = score_profiles(ratings).potential
+    half_points = np.round(potential * POTENTIAL_SCALE)
+    if not np.allclose(half_points, potential * POTENTIAL_SCALE, rtol=0, atol=1e-9):
+        raise ValueError("A keresőtábla csak fél pontra kerek potenciálokat tud tárolni.")
+    table = np.empty(TABLE_SIZE, dtype=LUT_DTYPE)
+    table["potential"] = half_points
+    table["tier"] = get_potential_tier(potential)
+    table["vrio"] = pack_vrio_flags(rule_set.evaluate(ratings))
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Írónként külön ideiglenes fájl: párhuzamos építések (munkamenetek, batch.py --lut) nem
+    # írják felül egymást, az olvasó pedig csak a kész fájlt látja az os.replace után
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, table)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_table(table_dir=DEFAULT_TABLE_DIR, build_if_missing=True, rule_set=None):
+    """
+    Memórialeképezéssel betölti az aktuális verziójú táblát; ha nincs, felépíti.
+    """
+    path = table_path(table_dir, rule_set=rule_set)
+    if not os.path.exists(path):
+        if not build_if_missing:
+            raise FileNotFoundError(f"A keresőtábla nem található: {path}")
+        build_table(path, rule_set=rule_set)
+    return np.load(path, mmap_mode="r")
+
+
+def lookup(table, ratings):
+    """
+    Potenciál, kategória és VRIO maszk kikeresése profil(ok)hoz.
+    """
+    rows = table[profile_index(ratings)]
+    return decode_potential(rows["potential"]), rows["tier"], rows["vrio"]
+
+
+def decode_potential(half_points):
+    """
+    Tárolt fél pontok -> potenciál (float).
+    """
+    return np.asarray(half_points, dtype=float) / POTENTIAL_SCALE
+
+
+@lru_cache(maxsize=None)
+def get_table():
+    """
+    Az aktuális verziójú tábla folyamatonként egyszer memórialeképezve (szükség esetén felépítve).
+    A zár miatt egyszerre induló munkamenetek közül csak egy építi a táblát.
+    """
+    with _table_lock:
+        return load_table()
+
+
+# A "Hatás Pont" tényezőnként csak a tényező saját értékelésétől függ: szint x tényező tábla (5, 9)
+_HATAS_PONT_BY_LEVEL = score_profiles(np.repeat(np.arange(1, NUM_LEVELS + 1)[:, None], NUM_FACTORS, axis=1)).hatas_pont
+
+
+def lut_score_profile(ratings):
+    """
+    Mint a scoring.score_profile: a potenciál a keresőtáblából, a "Hatás Pont" a szintenkénti táblából.
+    """
+    arr = as_ratings_array(ratings)
+    potential = float(decode_potential(get_table()["potential"][profile_index(arr)[0]]))
+    return potential, _HATAS_PONT_BY_LEVEL[arr[0] - 1, np.arange(NUM_FACTORS)].tolist()
+
+
+def unpack_vrio_mask(masks, num_resources=DEFAULT_VRIO_RESOURCES):
+    """
+    VRIO maszk(ok) -> (N, R, 4) logikai tömb (erőforrás x kritérium).
+    """
+    masks = np.atleast_1d(np.asarray(masks, dtype=np.uint32))
+    bits = (masks[:, None] >> np.arange(num_resources * len(VRIO_CRITERIA), dtype=np.uint32)) & 1
+    return bits.astype(bool).reshape(-1, num_resources, len(VRIO_CRITERIA))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="A teljes tényezőtér keresőtáblájának felépítése.")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--dir", default=DEFAULT_TABLE_DIR, help="A tábla könyvtára")
+    args = parser.parse_args(argv)
+    path = build_table(table_path(args.dir))
+    print(f"Keresőtábla elmentve: {path}")
+
+
+if __name__ == "__main__":
+    main()
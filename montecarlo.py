@@ -0,0 +1,69 @@
+import numpy as np
+
+from cache import LRUCache
+from factors import FACTOR_KEYS
+from scoring import NUM_FACTORS, TIER_LABELS, as_ratings_array, get_potential_tier, score_profiles
+from settings import MC_SAMPLES
+
+# --- Monte Carlo bizonytalansági mód ---
+# Az önértékelés zajos, ezért minden tényező értékelését eloszlásként kezeljük: p valószínűséggel
+# egy fokozattal eltér (fele-fele arányban lefelé vagy felfelé), a skála szélein 1 és 5 közé vágva.
+# A mintákat egyetlen (minták x 9) tömbként sorsoljuk, és a vektorizált pontozó motorral
+# (scoring.score_profiles) egy lépésben értékeljük, Python ciklus nélkül.
+
+DEFAULT_NOISE_PROBABILITY = 0.2
+CONFIDENCE_LEVEL = 0.9
+
+mc_cache = LRUCache(maxsize=128, name="montecarlo")
+
+
+class MonteCarloResult:
+    """
+    A szimuláció összesítése: várható potenciál, konfidenciaintervallum és kategória-valószínűségek.
+    """
+    __slots__ = ("mean", "ci_low", "ci_high", "confidence", "tier_probabilities", "samples")
+
+    def __init__(self, mean, ci_low, ci_high, confidence, tier_probabilities, samples):
+        self.mean = mean
+        self.ci_low = ci_low
+        self.ci_high = ci_high
+        self.confidence = confidence
+        self.tier_probabilities = tier_probabilities  # {kategória: valószínűség} a TIER_LABELS sorrendjében
+        self.samples = samples
+
+
+def sample_ratings(ratings, noise_probability=DEFAULT_NOISE_PROBABILITY, samples=MC_SAMPLES, rng=None):
+    """
+    (samples, 9) alakú zajos értékelés minta egyetlen profil körül.
+    """
+    if not 0 <= noise_probability <= 1:
+        raise ValueError(f"A zaj valószínűségének 0 és 1 közé kell esnie: {noise_probability}")
+    rng = np.random.default_rng(rng)
+    base = as_ratings_array(ratings)[0].astype(np.int8)
+    # Egyenletes [0, 1) szám tényezőnként: < p/2 -> -1, < p -> +1, különben változatlan
+    u = rng.random((samples, NUM_FACTORS), dtype=np.float32)
+    shift = (u < noise_probability).astype(np.int8)
+    shift -= 2 * (u < noise_probability / 2)
+    return np.clip(base + shift, 1, 5)
+
+
+def simulate(ratings, noise_probability=DEFAULT_NOISE_PROBABILITY, samples=MC_SAMPLES, confidence=CONFIDENCE_LEVEL, rng=None, model=None):
+    """
+    Monte Carlo becslés a potenciál eloszlására egyetlen profil körül (model: scoring_models.ScoringModel vagy None).
+    """
+    sampled = sample_ratings(ratings, noise_probability, samples, rng)
+    potentials = (score_profiles(sampled) if model is None else model.score_profiles(sampled)).potential
+    alpha = (1 - confidence) / 2
+    ci_low, ci_high = np.quantile(potentials, [alpha, 1 - alpha])
+    tier_counts = np.bincount(get_potential_tier(potentials), minlength=len(TIER_LABELS))
+    tier_probabilities = dict(zip(TIER_LABELS, (tier_counts / samples).tolist()))
+    return MonteCarloResult(float(potentials.mean()), float(ci_low), float(ci_high), confidence, tier_probabilities, samples)
+
+
+def cached_simulate(selected_factors, noise_probability=DEFAULT_NOISE_PROBABILITY, samples=MC_SAMPLES, model=None):
+    """
+    Az alkalmazás számára: rögzített véletlenmaggal futtatott, profil, p és modell szerint gyorsítótárazott szimuláció.
+    """
+    profile_key = tuple(int(selected_factors[factor_name]) for factor_name in FACTOR_KEYS)
+    key = (profile_key, round(float(noise_probability), 4), samples, getattr(model, "name", None))
+    return mc_cache.get_or_create(key, lambda: simulate(profile_key, noise_probability, samples, rng=0, model=model))
@@ -0,0 +1,280 @@
+"""
+"Mi kellene hozzá?" optimalizáló: portfólió minden kkv-jára a legolcsóbb tényezőjavítás-csomag,
+amellyel a potenciál a következő kategóriába (<40, 40-70, >=70) lép.
+
+Egy tényező javító iránya támogató tényezőnél +1, gátlónál -1 fokozat; minden fokozat költsége
+tényezőnként és fokozatonként állítható (--costs JSON). A javítások hatása a pontozó motor
+lépésenkénti deltáiból (sensitivity.py) számolódik, a legolcsóbb csomagot tényezőnkénti
+dinamikus programozás adja (a (nyereség, költség) Pareto-front tényezőről tényezőre bővül).
+A kiválasztott csomag eredményét a felületen is használt pontozással (scoring.py, ill. a
+pontozási modell) újraszámoljuk, így a kategória pontosan megegyezik a felületével.
+
+A bemenet darabokban olvasódik; egy darab azonos profiljai egyszer kerülnek kiszámításra, a
+feladatok (--task-size sor) pedig egy folyamatkészletben oszlanak el.
+
+A költségfájl szerkezete: {tényező neve vagy rövid kódja: költség}, ahol a költség egy szám
+(minden fokozat ugyanannyiba kerül) vagy 4 elemű lista a javító irány fokozataira (támogató
+tényezőnél 1->2, 2->3, 3->4, 4->5; gátlónál 5->4, 4->3, 3->2, 2->1). A hiányzó tényezők
+fokozatonkénti költsége 1.
+
+Használat:
+    python optimizer.py bemenet.csv kimenet.csv [--costs koltsegek.json] [--model gatlo_hangsulyos]
+    python optimizer.py bemenet.csv kimenet.csv --workers 8 --task-size 5000 --without-texts
+    python optimizer.py bemenet.csv kimenet.csv --language en
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from content import available_languages, get_bundle
+from factors import FACTOR_CODES, FACTOR_KEYS
+from lookup_table import profile_index
+from scoring import TIER_LABELS, TIER_THRESHOLDS, frame_ratings, get_potential_tier, score_profiles
+from scoring_models import get_registry
+from sensitivity import MAX_RATING, STEP_DELTAS, unclipped_potentials
+from settings import DEFAULT_LANGUAGE
+
+DEFAULT_STEP_COST = 1.0
+STEPS_PER_FACTOR = MAX_RATING - 1
+DEFAULT_CHUNKSIZE = 100_000
+DEFAULT_TASK_SIZE = 5_000
+# A lépésenkénti deltákból összegzett nyereség és a teljes újrapontozás eltérésének tűrése
+GAIN_TOLERANCE = 1e-9
+# A küszöböt ennyivel meghaladó nyereségű állapotok egy állapotba vonódnak össze
+GAIN_CAP_MARGIN = 1e-6
+
+
+def default_step_costs():
+    return np.full((len(FACTOR_KEYS), STEPS_PER_FACTOR), DEFAULT_STEP_COST)
+
+
+def parse_step_costs(spec):
+    """
+    Költségleírás ({tényező neve vagy kódja: szám vagy 4 elemű lista}) -> (9, 4) költségtömb.
+    """
+    costs = default_step_costs()
+    for key, value in spec.items():
+        if key in FACTOR_KEYS:
+            factor_index = FACTOR_KEYS.index(key)
+        elif key in FACTOR_CODES:
+            factor_index = FACTOR_CODES.index(key)
+        else:
+            raise ValueError(f"Ismeretlen tényező a költségfájlban: '{key}'")
+        values = value if isinstance(value, list) else [value] * STEPS_PER_FACTOR
+        if len(values) != STEPS_PER_FACTOR:
+            raise ValueError(f"A(z) '{key}' tényezőhöz {STEPS_PER_FACTOR} fokozat költsége kell, nem {len(values)}.")
+        for step_cost in values:
+            if isinstance(step_cost, bool) or not isinstance(step_cost, (int, float)) or not np.isfinite(step_cost) or step_cost < 0:
+                raise ValueError(f"Érvénytelen költség ({key}): {step_cost}")
+        costs[factor_index] = values
+    return costs
+
+
+def load_step_costs(path):
+    with open(path, encoding="utf-8") as f:
+        return parse_step_costs(json.load(f))
+
+
+class ImprovementPlan:
+    """
+    A legolcsóbb javítási csomag a következő kategóriához; reachable hamis, ha a csomag nem létezik.
+    """
+    __slots__ = ("target_tier", "steps", "step_count", "cost", "potential")
+
+    def __init__(self, target_tier, steps=None, step_count=None, cost=None, potential=None):
+        self.target_tier = target_tier
+        self.steps = steps            # {tényező: (kiinduló érték, cél érték)}, mint a sensitivity.summarize_steps
+        self.step_count = step_count  # egylépéses javítások száma
+        self.cost = cost
+        self.potential = potential    # a csomag utáni potenciál (teljes újrapontozással)
+
+    @property
+    def threshold(self):
+        return TIER_THRESHOLDS[self.target_tier - 1]
+
+    @property
+    def reachable(self):
+        return self.steps is not None
+
+
+def _cheapest_step_counts(available, gains, cumulative_costs, need):
+    # Pareto-front a (-nyereség, költség, tényezőnkénti lépésszám) állapotokon, tényezőnként bővítve.
+    # A küszöböt biztosan meghaladó nyereség egy értékre vágódik, a hátralévő tényezőkkel sem
+    # elégségessé tehető állapotok pedig kiesnek, így a front kicsi marad.
+    cap = need + GAIN_CAP_MARGIN
+    remaining = [0.0] * (len(available) + 1)
+    for factor_index in range(len(available) - 1, -1, -1):
+        remaining[factor_index] = remaining[factor_index + 1] + available[factor_index] * gains[factor_index]
+    if remaining[0] < need - GAIN_TOLERANCE:
+        return None
+    states = [(-0.0, 0.0, ())]
+    for factor_index, factor_available in enumerate(available):
+        start = STEPS_PER_FACTOR - factor_available
+        base_cost = cumulative_costs[factor_index][start]
+        step_costs = [cumulative_costs[factor_index][start + steps] - base_cost for steps in range(factor_available + 1)]
+        step_gains = [steps * gains[factor_index] for steps in range(factor_available + 1)]
+        lowest = need - GAIN_TOLERANCE - remaining[factor_index + 1]
+        candidates = [(-min(cap, -negated_gain + step_gain), cost + step_cost, plan + (steps,))
+                      for negated_gain, cost, plan in states
+                      for steps, (step_gain, step_cost) in enumerate(zip(step_gains, step_costs))
+                      if step_gain - negated_gain >= lowest]
+        candidates.sort()
+        states = []
+        cheapest = np.inf
+        for state in candidates:
+            if state[1] < cheapest:
+                states.append(state)
+                cheapest = state[1]
+    # A front nyereség és költség szerint is csökkenő, és már csak elégséges állapotot tartalmaz:
+    # az utolsó a legolcsóbb
+    negated_gain, cost, plan = states[-1]
+    return -negated_gain, cost, plan
+
+
+def cheapest_plans(ratings, step_costs=None, model=None):
+    """
+    A legolcsóbb javítási csomagok egy (N, 9) értékelés tömbre.
+    Visszatérési érték: (potenciálok, kategóriák, [ImprovementPlan vagy None, ha már a legfelső kategória]).
+    """
+    step_costs = default_step_costs() if step_costs is None else np.asarray(step_costs, dtype=float)
+    cumulative_costs = np.concatenate([np.zeros((len(FACTOR_KEYS), 1)), np.cumsum(step_costs, axis=1)], axis=1).tolist()
+    score = score_profiles if model is None else model.score_profiles
+    step_deltas = STEP_DELTAS if model is None else model.weight_vector
+    directions = np.where(step_deltas < 0, -1, 1)
+    gains = np.abs(step_deltas).tolist()
+
+    ratings = np.asarray(ratings, dtype=np.int64)
+    potentials = score(ratings).potential
+    tiers = get_potential_tier(potentials)
+    available = np.where(directions > 0, MAX_RATING - ratings, ratings - 1)
+    # Eltolásos modellnél a 0-ra levágott potenciál alábecsülné a szükséges nyereséget
+    starts = unclipped_potentials(ratings, potentials, model)
+    plans = [None] * len(ratings)
+    step_counts = {}
+    for row in np.flatnonzero(tiers < len(TIER_THRESHOLDS)):
+        need = TIER_THRESHOLDS[tiers[row]] - float(starts[row])
+        step_counts[row] = _cheapest_step_counts(available[row].tolist(), gains, cumulative_costs, need)
+
+    # Ellenőrzés teljes újrapontozással; a lebegőpontos határeseteknél szigorúbb küszöbbel újra
+    rows = [row for row, state in step_counts.items() if state is not None]
+    if rows:
+        improved = ratings[rows] + directions * np.array([step_counts[row][2] for row in rows])
+        new_potentials = score(improved).potential
+        for row, new_rating_row, new_potential in zip(rows, improved, new_potentials):
+            if get_potential_tier(new_potential) <= tiers[row]:
+                need = TIER_THRESHOLDS[tiers[row]] - float(starts[row]) + GAIN_CAP_MARGIN
+                state = _cheapest_step_counts(available[row].tolist(), gains, cumulative_costs, need)
+                step_counts[row] = state
+                if state is None:
+                    continue
+                new_rating_row = ratings[row] + directions * np.array(state[2])
+                new_potential = score(new_rating_row).potential[0]
+            state = step_counts[row]
+            steps = {FACTOR_KEYS[factor_index]: (int(ratings[row, factor_index]), int(new_rating_row[factor_index]))
+                     for factor_index, count in enumerate(state[2]) if count}
+            plans[row] = ImprovementPlan(int(tiers[row]) + 1, steps, sum(state[2]), float(state[1]), float(new_potential))
+    for row, state in step_counts.items():
+        if state is None:
+            plans[row] = ImprovementPlan(int(tiers[row]) + 1)
+    return potentials, tiers, plans
+
+
+def format_steps(steps):
+    return "; ".join(f"{factor_name}: {from_value} → {to_value}" for factor_name, (from_value, to_value) in steps.items())
+
+
+def optimize_chunk(df, step_costs=None, model=None, with_texts=True, language=DEFAULT_LANGUAGE):
+    """
+    Egy DataFrame darab kiegészítése a jelenlegi és a cél kategóriával, a legolcsóbb javítási csomaggal
+    és a jelenlegi kategória "Gyakorlati Javaslatok" szövegével. Az azonos profilok egyszer számolódnak.
+    """
+    bundle = get_bundle(language)
+    ratings, valid = frame_ratings(df)
+    _, first_rows, inverse = np.unique(profile_index(ratings), return_index=True, return_inverse=True)
+    potentials, tiers, plans = cheapest_plans(ratings[first_rows], step_costs, model)
+
+    columns = {
+        "Nemzetköziesedési potenciál": np.full(len(df), np.nan),
+        "Kategória": np.full(len(df), None, dtype=object),
+        "Cél kategória": np.full(len(df), None, dtype=object),
+        "Javítási lépések": np.full(len(df), None, dtype=object),
+        "Lépések száma": np.full(len(df), np.nan),
+        "Költség": np.full(len(df), np.nan),
+        "Várható potenciál": np.full(len(df), np.nan),
+        "Javaslat": np.full(len(df), None, dtype=object),
+    }
+    if with_texts:
+        columns["Gyakorlati javaslatok"] = np.full(len(df), None, dtype=object)
+    unique_columns = {
+        "Nemzetköziesedési potenciál": potentials,
+        "Kategória": np.asarray(TIER_LABELS, dtype=object)[tiers],
+        "Cél kategória": np.array([None if plan is None else TIER_LABELS[plan.target_tier] for plan in plans], dtype=object),
+        "Javítási lépések": np.array([None if plan is None or not plan.reachable else format_steps(plan.steps) for plan in plans], dtype=object),
+        "Lépések száma": np.array([np.nan if plan is None or not plan.reachable else plan.step_count for plan in plans], dtype=float),
+        "Költség": np.array([np.nan if plan is None or not plan.reachable else plan.cost for plan in plans], dtype=float),
+        "Várható potenciál": np.array([np.nan if plan is None or not plan.reachable else plan.potential for plan in plans], dtype=float),
+        "Javaslat": np.asarray(bundle.javaslat_messages, dtype=object)[tiers],
+    }
+    if with_texts:
+        unique_columns["Gyakorlati javaslatok"] = np.asarray(bundle.javaslat_texts, dtype=object)[tiers]
+    out = df.copy()
+    for column, values in columns.items():
+        values[valid] = unique_columns[column][inverse]
+        out[column] = values
+    return out, int((~valid).sum())
+
+
+def _optimize_task(task):
+    # Munkafolyamatban fut; a modell név szerint, a folyamat saját regiszteréből töltődik
+    df, step_costs, model_name, with_texts, language = task
+    model = None if model_name is None else get_registry().get(model_name)
+    return optimize_chunk(df, step_costs, model, with_texts, language)
+
+
+def run(input_path, output_path, costs_path=None, model_name=None, workers=None, chunksize=DEFAULT_CHUNKSIZE,
+        task_size=DEFAULT_TASK_SIZE, with_texts=True, language=DEFAULT_LANGUAGE, log=sys.stderr):
+    step_costs = load_step_costs(costs_path) if costs_path else default_step_costs()
+    get_bundle(language)  # ismeretlen nyelv esetén a munkafolyamatok indítása előtt hibázzon
+    if model_name is not None and model_name not in get_registry().models:
+        raise ValueError(f"Ismeretlen pontozási modell: '{model_name}'")
+    total_rows = 0
+    total_invalid = 0
+    first = True
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in pd.read_csv(input_path, chunksize=chunksize):
+            tasks = [(chunk.iloc[start:start + task_size], step_costs, model_name, with_texts, language) for start in range(0, len(chunk), task_size)]
+            for optimized, invalid in executor.map(_optimize_task, tasks):
+                optimized.to_csv(output_path, mode="w" if first else "a", header=first, index=False)
+                first = False
+                total_invalid += invalid
+            total_rows += len(chunk)
+            print(f"{total_rows} sor feldolgozva...", file=log)
+    elapsed = time.perf_counter() - started
+    print(f"Kész: {total_rows} sor, {total_invalid} érvénytelen, {elapsed:.2f} s", file=log)
+    return total_rows, total_invalid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="A legolcsóbb javítási csomag a következő kategóriához, kkv-nként.")
+    parser.add_argument("input", help="Bemeneti CSV (tényezőnevek vagy rövid kódok oszlopokként)")
+    parser.add_argument("output", help="Kimeneti CSV")
+    parser.add_argument("--costs", help="Tényezőnkénti / fokozatonkénti költségek (JSON)")
+    parser.add_argument("--model", help="Pontozási modell neve (models/*.json); alapértelmezés: az alapképlet")
+    parser.add_argument("--workers", type=int, default=None, help="Munkafolyamatok száma (alapértelmezés: CPU magok)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Egyszerre beolvasott sorok száma")
+    parser.add_argument("--task-size", type=int, default=DEFAULT_TASK_SIZE, help="Egy munkafolyamat-feladat sorainak száma")
+    parser.add_argument("--without-texts", action="store_true", help="A részletes javaslatszövegek elhagyása a kimenetből")
+    parser.add_argument("--language", choices=available_languages(), default=DEFAULT_LANGUAGE, help="A javaslatszövegek nyelve")
+    args = parser.parse_args(argv)
+    run(args.input, args.output, costs_path=args.costs, model_name=args.model, workers=args.workers,
+        chunksize=args.chunksize, task_size=args.task_size, with_texts=not args.without_texts, language=args.language)
+
+
+if __name__ == "__main__":
+    main()
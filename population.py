@@ -0,0 +1,118 @@
+from functools import lru_cache
+
+import numpy as np
+
+from factors import IS_BARRIER
+from scoring import BARRIER_WEIGHT, NUM_FACTORS, SUPPORT_WEIGHT, as_ratings_array
+
+# --- Referencia-populáció előre aggregált hisztogramokkal ---
+# Egy kkv percentilisét nem a tárolt értékelések végigolvasásával számoljuk, hanem
+# előre aggregált gyakoriságokból: tényezőnként 5 értékosztály (1-5), a potenciálhoz
+# 0,5 pontos osztályok 0 és 100 között (a képlet lépései 3,0 és 2,5 pont, így minden
+# lehetséges potenciál 0,5 többszöröse). Új értékelések érkezésekor csak a számlálók nőnek;
+# a percentilis lekérdezése a kumulált gyakoriságokból O(1).
+
+RATING_VALUES = 5
+# Ennyi tárolt értékelés alatt a referencia az összes lehetséges profil (uniform_reference)
+MIN_STORED_POPULATION = 30
+POTENTIAL_BIN_WIDTH = 0.5
+POTENTIAL_BINS = int(100 / POTENTIAL_BIN_WIDTH) + 1
+
+
+def potential_bins(potentials):
+    """
+    Potenciál értékek -> 0,5 pontos osztályindexek (0..200).
+    """
+    bins = np.rint(np.asarray(potentials, dtype=float) / POTENTIAL_BIN_WIDTH).astype(np.intp)
+    return np.clip(bins, 0, POTENTIAL_BINS - 1)
+
+
+def _midrank_percentile(cumulative, counts, index, total):
+    # A nála kisebbek aránya plusz az azonosak fele, százalékban
+    below = cumulative[index] - counts[index]
+    return float((below + counts[index] / 2) / total * 100)
+
+
+class PopulationHistogram:
+    """
+    Tényezőnkénti (9 x 5) és potenciál (201 osztály) gyakoriságok, növekményes frissítéssel.
+    """
+
+    def __init__(self, factor_counts=None, potential_counts=None):
+        self.factor_counts = np.zeros((NUM_FACTORS, RATING_VALUES), dtype=np.int64) if factor_counts is None else np.asarray(factor_counts, dtype=np.int64)
+        self.potential_counts = np.zeros(POTENTIAL_BINS, dtype=np.int64) if potential_counts is None else np.asarray(potential_counts, dtype=np.int64)
+        self._cumulative = None
+
+    @property
+    def total(self):
+        return int(self.potential_counts.sum())
+
+    def add(self, ratings, potentials):
+        """
+        Új értékelések hozzáadása; a visszatérési érték a (tényező, potenciál) gyakoriság-növekmény.
+        """
+        arr = as_ratings_array(ratings)
+        factor_delta = np.stack([np.bincount(arr[:, col] - 1, minlength=RATING_VALUES) for col in range(NUM_FACTORS)])
+        potential_delta = np.bincount(potential_bins(potentials), minlength=POTENTIAL_BINS)
+        self.factor_counts += factor_delta
+        self.potential_counts += potential_delta
+        self._cumulative = None
+        return factor_delta, potential_delta
+
+    def _cumulative_counts(self):
+        if self._cumulative is None:
+            self._cumulative = (np.cumsum(self.factor_counts, axis=1), np.cumsum(self.potential_counts))
+        return self._cumulative
+
+    def potential_percentile(self, potential):
+        """
+        A potenciál percentilise a populációban (0-100), vagy None üres populációnál.
+        """
+        total = self.total
+        if not total:
+            return None
+        _, potential_cumulative = self._cumulative_counts()
+        return _midrank_percentile(potential_cumulative, self.potential_counts, int(potential_bins(potential)), total)
+
+    def factor_percentiles(self, ratings):
+        """
+        Tényezőnként az értékelés percentilise a populációban (FACTOR_KEYS sorrendben).
+        """
+        total = self.total
+        if not total:
+            return [None] * NUM_FACTORS
+        arr = as_ratings_array(ratings)[0]
+        factor_cumulative, _ = self._cumulative_counts()
+        return [_midrank_percentile(factor_cumulative[col], self.factor_counts[col], int(arr[col]) - 1, total)
+                for col in range(NUM_FACTORS)]
+
+
+@lru_cache(maxsize=None)
+def uniform_reference():
+    """
+    Referencia tárolt adatok nélkül: mind az 5^9 lehetséges profil egyszer.
+    A potenciál eloszlása tényezőnkénti konvolúcióval adódik, a profilok felsorolása nélkül.
+    """
+    factor_counts = np.full((NUM_FACTORS, RATING_VALUES), RATING_VALUES ** (NUM_FACTORS - 1), dtype=np.int64)
+    num_support = IS_BARRIER.count(False)
+    num_barrier = IS_BARRIER.count(True)
+    potential_counts = np.ones(1, dtype=np.int64)
+    for is_barrier in IS_BARRIER:
+        # Egy fokozat ennyi 0,5 pontos osztállyal növeli a potenciált (6 ill. 5 osztály)
+        weight = BARRIER_WEIGHT / num_barrier if is_barrier else SUPPORT_WEIGHT / num_support
+        step = int(round(weight * 100 / 4 / POTENTIAL_BIN_WIDTH))
+        kernel = np.zeros(step * (RATING_VALUES - 1) + 1, dtype=np.int64)
+        kernel[::step] = 1
+        potential_counts = np.convolve(potential_counts, kernel)
+    return PopulationHistogram(factor_counts, potential_counts[:POTENTIAL_BINS])
+
+
+def reference_population(store):
+    """
+    A tárolt értékelések hisztogramja, ha elég nagy; különben az összes lehetséges profil.
+    Visszatérési érték: (hisztogram, True ha a tárolt populációról van szó).
+    """
+    histogram = store.population_histogram()
+    if histogram.total >= MIN_STORED_POPULATION:
+        return histogram, True
+    return uniform_reference(), False
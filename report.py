@@ -0,0 +1,285 @@
+"""
+A "Beszámoló" oldal szövegeinek előre lefordított sablonjai és a tömeges beszámoló export.
+
+A szövegek nyelvenként a nyelvi csomagokból (content.py, content/<nyelv>.json) jönnek.
+A tényezőnkénti mondatok (tényező, érték) szerint, a VRIO bekezdések (erőforrás, V, R, I, O)
+szerint nyelvenként egyszer készülnek el; egy beszámoló összeállítása ezután csak
+kikeresés és összefűzés.
+
+Tömeges export (Markdown vagy HTML fájlok, párhuzamos munkafolyamatokkal):
+    python report.py bemenet.csv kimeneti_konyvtar --format html --workers 8 [--id-column ceg] [--language en]
+"""
+import argparse
+import html
+import itertools
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from cache import LRUCache
+from content import available_languages, get_bundle
+from factors import BARRIER_MARKER, FACTOR_CODES, FACTOR_KEYS
+from scoring import frame_ratings, get_potential_tier, score_profile
+from settings import DEFAULT_LANGUAGE, RESULT_CACHE_SIZE
+from vrio import get_rule_set
+
+# --- Főbb tényezők: csoportonként a kiemelt értékelések és a kiemelés sorrendje ---
+# A "values" a csoportba tartozó értékelések, a "descending" a kiemelés sorrendje. A csoportok
+# szövegei (fejléc, bevezető, tényezőmondat sablon, üres eset) a nyelvi csomagban vannak; a
+# sablonokban a {factor} a tényező (kisbetűs, gátló jelölés nélküli) neve, a {desc} a szint leírása.
+FACTOR_GROUPS = (
+    {"key": "eros_tamogatok", "barrier": False, "values": (4, 5), "descending": True},
+    {"key": "gyenge_tamogatok", "barrier": False, "values": (1, 2), "descending": False},
+    {"key": "alacsony_gatlok", "barrier": True, "values": (1, 2), "descending": False},
+    {"key": "magas_gatlok", "barrier": True, "values": (4, 5), "descending": True},
+)
+# Csoportonként legfeljebb ennyi tényezőt emelünk ki
+FACTORS_PER_GROUP = 2
+
+
+def _factor_display_name(bundle, factor_code):
+    return bundle.factor_names[factor_code].replace(f" {bundle.barrier_marker}", "").lower()
+
+
+def _compile_factor_sentences(bundle):
+    # (csoport, tényező, érték) -> kész mondat
+    compiled = {}
+    for group in FACTOR_GROUPS:
+        sentence = bundle.factor_groups[group["key"]]["sentence"]
+        for factor_name, factor_code in zip(FACTOR_KEYS, FACTOR_CODES):
+            if (BARRIER_MARKER in factor_name) != group["barrier"]:
+                continue
+            for value in group["values"]:
+                desc = bundle.factor_levels[factor_code][value].split(': ', 1)[1].lower()
+                compiled[(group["key"], factor_name, value)] = sentence.format(factor=_factor_display_name(bundle, factor_code), value=value, desc=desc)
+    return compiled
+
+
+def _compile_vrio_paragraphs(bundle, resources):
+    # (erőforrás, V, R, I, O) -> kész bekezdés, mind a 16 jelzőkombinációra
+    rule_set = get_rule_set()
+    compiled = {}
+    for resource in resources:
+        for flags in itertools.product((True, False), repeat=len(bundle.vrio_sentence_parts)):
+            sentence_parts = [parts[0] if flag else parts[1] for parts, flag in zip(bundle.vrio_sentence_parts, flags)]
+            verdict = int(rule_set.verdicts([flags])[0])
+            compiled[(resource, *flags)] = (bundle.vrio_paragraph.format(resource=bundle.resource_name(resource).lower(), parts=", ".join(sentence_parts))
+                                            + bundle.vrio_verdicts[verdict])
+    return compiled
+
+
+class ReportTexts:
+    """
+    Egy nyelv előre lefordított beszámoló szövegei: a nyelvi csomag, a tényezőmondatok és a VRIO bekezdések.
+    """
+
+    def __init__(self, bundle):
+        self.bundle = bundle
+        self.factor_sentences = _compile_factor_sentences(bundle)
+        self.vrio_paragraphs = _compile_vrio_paragraphs(bundle, get_rule_set().resources)
+
+
+@lru_cache(maxsize=None)
+def get_report_texts(language=DEFAULT_LANGUAGE):
+    """
+    A nyelv beszámoló szövegei, folyamatonként egyszer lefordítva.
+    """
+    return ReportTexts(get_bundle(language))
+
+
+# Az elkészült beszámolók profilonként (és nyelvenként), a munkamenetek között megosztva
+report_cache = LRUCache(maxsize=RESULT_CACHE_SIZE, name="reports")
+
+
+class Report:
+    """
+    Egy profil beszámolójának szövegrészei, a "Beszámoló" oldal szakaszai szerint.
+    """
+    __slots__ = ("potential", "potencial_text", "factor_blocks", "vrio_paragraphs", "language")
+
+    def __init__(self, potential, potencial_text, factor_blocks, vrio_paragraphs, language=DEFAULT_LANGUAGE):
+        self.potential = potential                # potenciál (0-100)
+        self.potencial_text = potencial_text      # 1. szakasz értékelő szövege
+        self.factor_blocks = factor_blocks        # 2. szakasz: csoportonként 1-2 markdown blokk
+        self.vrio_paragraphs = vrio_paragraphs    # 3. szakasz: erőforrásonként egy bekezdés
+        self.language = language                  # a szövegek nyelve (a fejlécekhez)
+
+
+def _factor_group_blocks(group, selected_factors, texts):
+    group_texts = texts.bundle.factor_groups[group["key"]]
+    candidates = [(k, v) for k, v in selected_factors.items()
+                  if (BARRIER_MARKER in k) == group["barrier"] and v is not None and v in group["values"]]
+    candidates = sorted(candidates, key=lambda item: item[1], reverse=group["descending"])
+    if not candidates:
+        return [group_texts["empty"]]
+    sentences = "".join(texts.factor_sentences[(group["key"], factor, value)] for factor, value in candidates[:FACTORS_PER_GROUP])
+    return [group_texts["header"], group_texts["intro"] + sentences]
+
+
+def build_report(selected_factors, potential=None, rule_set=None, language=DEFAULT_LANGUAGE):
+    """
+    Beszámoló összeállítása a tényezőnév -> értékelés szótárból, előre lefordított szövegekből.
+    """
+    rule_set = rule_set or get_rule_set()
+    texts = get_report_texts(language)
+    if potential is None:
+        potential, _ = score_profile(selected_factors)
+    potencial_text = texts.bundle.potential_texts[get_potential_tier(potential)]
+    factor_blocks = [_factor_group_blocks(group, selected_factors, texts) for group in FACTOR_GROUPS]
+
+    vrio_paragraphs = []
+    flags = rule_set.evaluate(selected_factors)[0]
+    for resource, resource_flags in zip(rule_set.resources, flags):
+        key = (resource, *(bool(flag) for flag in resource_flags))
+        paragraph = texts.vrio_paragraphs.get(key)
+        if paragraph is None:
+            # Alternatív szabálytábla új erőforrásnévvel: egyszeri fordítás
+            texts.vrio_paragraphs.update(_compile_vrio_paragraphs(texts.bundle, [resource]))
+            paragraph = texts.vrio_paragraphs[key]
+        vrio_paragraphs.append(paragraph)
+    return Report(potential, potencial_text, factor_blocks, vrio_paragraphs, language)
+
+
+def cached_build_report(selected_factors, model=None, language=DEFAULT_LANGUAGE):
+    """
+    A build_report eredménye az alapértelmezett szabálytáblával, profilonként (pontozási modellenként
+    és nyelvenként) folyamatszinten gyorsítótárazva.
+    """
+    profile_key = tuple(int(selected_factors[factor_name]) for factor_name in FACTOR_KEYS)
+
+    def compute():
+        potential = None if model is None else model.score_profile(profile_key)[0]
+        return build_report(dict(zip(FACTOR_KEYS, profile_key)), potential, language=language)
+
+    return report_cache.get_or_create((getattr(model, "name", None), language, profile_key), compute)
+
+
+def report_to_markdown(report):
+    """
+    A teljes beszámoló egyetlen Markdown dokumentumként, a beszámoló nyelvén.
+    """
+    bundle = get_bundle(report.language)
+    potential_title, factors_title, vrio_title, summary_title = bundle.section_titles
+    parts = [
+        f"# {bundle.report_title}",
+        bundle.report_intro,
+        f"## {potential_title}",
+        f"**{bundle.potential_label}:** {report.potential:.1f} %",
+        report.potencial_text,
+        f"## {factors_title}",
+    ]
+    for blocks in report.factor_blocks:
+        parts.extend(blocks)
+    parts.append(f"## {vrio_title}")
+    parts.extend(report.vrio_paragraphs)
+    parts.append(f"## {summary_title}")
+    parts.extend(bundle.summary_texts)
+    return "\n\n".join(parts) + "\n"
+
+
+_BOLD_PATTERN = re.compile(r"\*\*(.+?)\*\*")
+
+
+def markdown_to_html(markdown_text, title=None, language=DEFAULT_LANGUAGE):
+    """
+    Egyszerű Markdown -> HTML átalakítás a beszámolóban használt elemekre (címsorok, bekezdések, félkövér).
+    """
+    title = title or get_bundle(language).report_title
+    body = []
+    for block in markdown_text.strip().split("\n\n"):
+        heading = re.match(r"(#+) (.*)", block)
+        text = _BOLD_PATTERN.sub(r"<strong>\1</strong>", html.escape(heading.group(2) if heading else block, quote=False))
+        if heading:
+            level = len(heading.group(1))
+            body.append(f"<h{level}>{text}</h{level}>")
+        else:
+            body.append(f"<p>{text}</p>")
+    return (f'<!DOCTYPE html>\n<html lang="{html.escape(language)}">\n<head><meta charset="utf-8"><title>{html.escape(title)}</title></head>\n'
+            f"<body>\n" + "\n".join(body) + "\n</body>\n</html>\n")
+
+
+# --- Tömeges export párhuzamos munkafolyamatokkal ---
+def _render_report_file(task):
+    # Munkafolyamatban fut: egy beszámoló elkészítése és kiírása
+    file_name, ratings, fmt, out_dir, language = task
+    selected_factors = dict(zip(FACTOR_KEYS, ratings))
+    markdown_text = report_to_markdown(build_report(selected_factors, language=language))
+    if fmt == "html":
+        content, extension = markdown_to_html(markdown_text, language=language), "html"
+    else:
+        content, extension = markdown_text, "md"
+    with open(os.path.join(out_dir, f"{file_name}.{extension}"), "w", encoding="utf-8") as f:
+        f.write(content)
+    return 1
+
+
+def _unique_file_name(name, used_names, renamed):
+    # Az azonosítóból képzett fájlnév; ismétlődő (vagy a tisztítás után egybeeső) azonosítónál
+    # _2, _3, ... utótag, hogy a beszámolók ne írják felül egymást
+    base_name = re.sub(r"[^\w.-]", "_", str(name))
+    file_name, suffix = base_name, 1
+    while file_name.lower() in used_names:
+        suffix += 1
+        file_name = f"{base_name}_{suffix}"
+    if suffix > 1:
+        renamed[0] += 1
+    used_names.add(file_name.lower())
+    return file_name
+
+
+def _iter_task_batches(input_path, out_dir, fmt, id_column, chunksize, skipped, renamed, language):
+    # CSV darabonként egy feladatlista, így egyszerre legfeljebb egy darab feladatai vannak a memóriában
+    row_offset = 0
+    used_names = set()
+    for chunk in pd.read_csv(input_path, chunksize=chunksize):
+        ratings, valid = frame_ratings(chunk)
+        ids = chunk[id_column].to_numpy(dtype=object)[valid] if id_column else np.arange(row_offset, row_offset + len(chunk))[valid]
+        tasks = [(_unique_file_name(name, used_names, renamed), tuple(profile), fmt, out_dir, language)
+                 for name, profile in zip(ids.tolist(), ratings.tolist())]
+        skipped[0] += int((~valid).sum())
+        row_offset += len(chunk)
+        yield tasks
+
+
+def export_reports(input_path, out_dir, fmt="md", workers=None, id_column=None, chunksize=10_000, log=sys.stderr, language=DEFAULT_LANGUAGE):
+    """
+    Beszámolók tömeges renderelése fájlokba; a munka a folyamatkészletben CSV darabonként oszlik el,
+    így a memóriahasználatot a chunksize korlátozza. Ismétlődő azonosítónál a fájlnév utótagot kap.
+    """
+    get_bundle(language)  # ismeretlen nyelv esetén a munkafolyamatok indítása előtt hibázzon
+    os.makedirs(out_dir, exist_ok=True)
+    skipped = [0]
+    renamed = [0]
+    started = time.perf_counter()
+    written = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for tasks in _iter_task_batches(input_path, out_dir, fmt, id_column, chunksize, skipped, renamed, language):
+            for written_now in executor.map(_render_report_file, tasks, chunksize=256):
+                written += written_now
+    elapsed = time.perf_counter() - started
+    if renamed[0]:
+        print(f"Figyelem: {renamed[0]} ismétlődő azonosító, ezek fájlneve _2, _3, ... utótagot kapott", file=log)
+    print(f"Kész: {written} beszámoló, {skipped[0]} érvénytelen sor kihagyva, {elapsed:.2f} s", file=log)
+    return written, skipped[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Beszámolók tömeges exportja Markdown vagy HTML fájlokba.")
+    parser.add_argument("input", help="Bemeneti CSV (tényezőnevek vagy rövid kódok oszlopokként)")
+    parser.add_argument("out_dir", help="Kimeneti könyvtár")
+    parser.add_argument("--format", choices=["md", "html"], default="md")
+    parser.add_argument("--workers", type=int, default=None, help="Munkafolyamatok száma (alapértelmezés: CPU magok)")
+    parser.add_argument("--id-column", help="A fájlnevekhez használt azonosító oszlop")
+    parser.add_argument("--language", choices=available_languages(), default=DEFAULT_LANGUAGE, help="A beszámolók nyelve")
+    args = parser.parse_args(argv)
+    export_reports(args.input, args.out_dir, fmt=args.format, workers=args.workers, id_column=args.id_column, language=args.language)
+
+
+if __name__ == "__main__":
+    main()
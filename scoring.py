@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+
+from cache import LRUCache
+from factors import FACTOR_CODES, FACTOR_KEYS, IS_BARRIER
+from settings import RESULT_CACHE_SIZE, SCORING_LUT
+
+# --- A nemzetköziesedési potenciál pontozó motorja ---
+# A képlet megegyezik az app.py korábbi, soronkénti számításával:
+#   támogató tényező:  s = (érték - 1) / 4
+#   gátló tényező:     s = 1 - (érték - 1) / 4
+#   potenciál = (átlag(támogató s) * 0.6 + átlag(gátló s) * 0.4) * 100
+# A bemenet egy (N, 9) alakú egész tömb, az oszlopok sorrendje a FACTOR_KEYS sorrendje.
+# A súlyok a konfigurálható pontozási modellekhez (scoring_models.py) felülírhatók; az alapértékek
+# a szakdolgozat modelljét adják.
+
+SUPPORT_WEIGHT = 0.6
+BARRIER_WEIGHT = 0.4
+HATAS_PONT_SCALE = 10
+
+# Kategóriahatárok: < 40 alacsony, 40-70 közepes, >= 70 magas
+TIER_THRESHOLDS = (40, 70)
+TIER_LABELS = ("alacsony", "közepes", "magas")
+
+NUM_FACTORS = len(FACTOR_KEYS)
+SUPPORT_COLUMNS = tuple(i for i, is_barrier in enumerate(IS_BARRIER) if not is_barrier)
+BARRIER_COLUMNS = tuple(i for i, is_barrier in enumerate(IS_BARRIER) if is_barrier)
+_IS_BARRIER_MASK = np.array(IS_BARRIER, dtype=bool)
+
+# Profilonkénti eredmények, a munkamenetek között megosztva
+score_cache = LRUCache(maxsize=RESULT_CACHE_SIZE, name="scores")
+
+
+class ScoreResult:
+    """
+    Egy pontozási futás eredménye, soronként egy profillal.
+    """
+    __slots__ = ("potential", "hatas_pont", "avg_support", "avg_barrier_negated", "normalized")
+
+    def __init__(self, potential, hatas_pont, avg_support, avg_barrier_negated, normalized):
+        self.potential = potential                      # (N,)   potenciál 0-100
+        self.hatas_pont = hatas_pont                    # (N, 9) "Hatás Pont" hozzájárulások
+        self.avg_support = avg_support                  # (N,)   támogató tényezők átlaga (0-1)
+        self.avg_barrier_negated = avg_barrier_negated  # (N,)   negált gátló tényezők átlaga (0-1)
+        self.normalized = normalized                    # (N, 9) normalizált s értékek (0-1)
+
+
+def as_ratings_array(ratings):
+    """
+    Ellenőrzi és (N, 9) alakú egész tömbbé alakítja a bemenetet.
+    Egyetlen profil (9 elemű sorozat vagy tényezőnév -> érték szótár) is megadható.
+    """
+    if isinstance(ratings, dict):
+        ratings = [ratings[factor_name] for factor_name in FACTOR_KEYS]
+    arr = np.asarray(ratings)
+    if arr.ndim == 1:
+        arr = arr.reshape(1, -1)
+    if arr.ndim != 2 or arr.shape[1] != NUM_FACTORS:
+        raise ValueError(f"A bemenetnek (N, {NUM_FACTORS}) alakúnak kell lennie, kapott alak: {arr.shape}")
+    if not np.issubdtype(arr.dtype, np.integer):
+        if not np.all(np.mod(arr, 1) == 0):
+            raise ValueError("Az értékeléseknek egész számoknak kell lenniük (1-5).")
+        arr = arr.astype(np.int64)
+    if arr.size and (arr.min() < 1 or arr.max() > 5):
+        raise ValueError("Az értékeléseknek 1 és 5 közé kell esniük.")
+    return arr
+
+
+def resolve_factor_columns(columns):
+    """
+    A tényezők oszlopai egy táblázatban (a teljes név vagy a rövid kód), FACTOR_KEYS sorrendben.
+    """
+    resolved = [factor_name if factor_name in columns else factor_code for factor_name, factor_code in zip(FACTOR_KEYS, FACTOR_CODES)]
+    missing = [f"'{factor_name}' (vagy '{factor_code}')" for factor_name, factor_code, column in zip(FACTOR_KEYS, FACTOR_CODES, resolved) if column not in columns]
+    if missing:
+        raise ValueError(f"Hiányzó oszlopok a bemenetben: {', '.join(missing)}")
+    return resolved
+
+
+def frame_ratings(df):
+    """
+    Egy DataFrame tényezőoszlopai -> (érvényes sorok (M, 9) int8 tömbje, (N,) érvényességi maszk).
+    A nem szám, hiányzó, nem egész vagy 1-5 tartományon kívüli értéket tartalmazó sor érvénytelen.
+    """
+    columns = resolve_factor_columns(df.columns)
+    raw = np.empty((len(df), NUM_FACTORS))
+    for col_index, column in enumerate(columns):
+        raw[:, col_index] = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    valid = np.all((raw >= 1) & (raw <= 5) & (np.mod(raw, 1) == 0), axis=1)
+    return raw[valid].astype(np.int8), valid
+
+
+def normalize_ratings(ratings):
+    """
+    A normalizált s értékek: támogató tényezőnél (érték-1)/4, gátlónál 1-(érték-1)/4.
+    """
+    arr = as_ratings_array(ratings)
+    scaled = (arr - 1) / 4
+    return np.where(_IS_BARRIER_MASK, 1 - scaled, scaled)
+
+
+def score_profiles(ratings, support_weight=SUPPORT_WEIGHT, barrier_weight=BARRIER_WEIGHT, factor_weights=None, offset=0.0):
+    """
+    Vektorizált pontozás: potenciál, tényezőnkénti "Hatás Pont" és a két részátlag egy lépésben.
+    A factor_weights (9 elemű) megadásakor a csoportátlagok súlyozottak, az offset pedig
+    a potenciálhoz adott állandó (pont).
+    """
+    normalized = normalize_ratings(ratings)
+    weighted = normalized if factor_weights is None else normalized * np.asarray(factor_weights, dtype=float)
+    # Az összeadás oszloponként, a korábbi skaláris képlettel azonos sorrendben történik,
+    # így az eredmény bitre megegyezik az eredeti számítással.
+    support_sum = weighted[:, SUPPORT_COLUMNS[0]].copy()
+    for col in SUPPORT_COLUMNS[1:]:
+        support_sum += weighted[:, col]
+    barrier_sum = weighted[:, BARRIER_COLUMNS[0]].copy()
+    for col in BARRIER_COLUMNS[1:]:
+        barrier_sum += weighted[:, col]
+    if factor_weights is None:
+        avg_support = support_sum / len(SUPPORT_COLUMNS)
+        avg_barrier_negated = barrier_sum / len(BARRIER_COLUMNS)
+    else:
+        avg_support = support_sum / sum(factor_weights[col] for col in SUPPORT_COLUMNS)
+        avg_barrier_negated = barrier_sum / sum(factor_weights[col] for col in BARRIER_COLUMNS)
+    potential = (avg_support * support_weight + avg_barrier_negated * barrier_weight) * 100
+    if offset:
+        potential = potential + offset
+    potential = np.clip(potential, 0, 100)
+
+    # Támogató tényező: s * 10, gátló tényező: (1 - s) * -10
+    hatas_pont = np.where(_IS_BARRIER_MASK, (1 - normalized) * -HATAS_PONT_SCALE, normalized * HATAS_PONT_SCALE)
+    return ScoreResult(potential, hatas_pont, avg_support, avg_barrier_negated, normalized)
+
+
+def score_profile(ratings):
+    """
+    Egyetlen profil pontozása; a visszatérési érték a potenciál (float) és a 9 "Hatás Pont" listája.
+    """
+    result = score_profiles(ratings)
+    return float(result.potential[0]), result.hatas_pont[0].tolist()
+
+
+def cached_score_profile(selected_factors, model=None):
+    """
+    Mint a score_profile, de folyamatszinten gyorsítótárazva (kulcs: a modell neve és a 9 értékelés).
+    A model egy scoring_models.ScoringModel; None esetén az alapképlet. RBVKKV_SCORING_LUT=1 esetén
+    az alapképlet (és a vele azonos alapmodell) a keresőtáblából olvas (lookup_table.lut_score_profile).
+    """
+    profile_key = tuple(int(selected_factors[factor_name]) for factor_name in FACTOR_KEYS)
+
+    def compute():
+        if SCORING_LUT and (model is None or model.is_reference):
+            # Késleltetett import: a lookup_table maga is a scoring modulra épül
+            from lookup_table import lut_score_profile
+            potential, hatas_pont = lut_score_profile(profile_key)
+        elif model is None:
+            potential, hatas_pont = score_profile(profile_key)
+        else:
+            potential, hatas_pont = model.score_profile(profile_key)
+        return potential, tuple(hatas_pont)
+
+    potential, hatas_pont = score_cache.get_or_create((getattr(model, "name", None), profile_key), compute)
+    return potential, list(hatas_pont)
+
+
+def get_potential_tier(potential):
+    """
+    Kategóriakód (0: alacsony, 1: közepes, 2: magas) skalárra vagy tömbre.
+    """
+    tiers = np.searchsorted(np.asarray(TIER_THRESHOLDS, dtype=float), potential, side="right")
+    if np.ndim(tiers) == 0:
+        return int(tiers)
+    return tiers.astype(np.int8)
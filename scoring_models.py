@@ -0,0 +1,180 @@
+import glob
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from factors import FACTOR_KEYS, IS_BARRIER
+from scoring import (
+    BARRIER_COLUMNS,
+    BARRIER_WEIGHT,
+    NUM_FACTORS,
+    SUPPORT_COLUMNS,
+    SUPPORT_WEIGHT,
+    as_ratings_array,
+    score_profiles,
+)
+from settings import DEFAULT_SCORING_MODEL, SCORING_MODELS_DIR
+
+# --- Konfigurálható pontozási modellek (pl. iparáganként vagy országonként) ---
+# Minden modell egy JSON fájl a models/ könyvtárban: csoportsúlyok (támogató/gátló),
+# opcionális tényezőnkénti súlyok a csoporton belül és egy állandó eltolás. Betöltéskor
+# ellenőrizzük, majd egy súlyvektorrá és tengelymetszetté fordítjuk:
+#   potenciál = clip(értékelések @ súlyvektor + tengelymetszet, 0, 100)
+# A súlyvektor i. eleme egyben az i. tényező egy fokozatnyi növelésének hatása (pont).
+# A regiszter a modellek súlyvektoraiból egy (9, M) mátrixot épít, így egy profilhalmaz
+# az összes modellel egyetlen mátrixszorzással pontozható.
+
+GROUP_WEIGHT_TOLERANCE = 1e-9
+
+
+class ScoringModel:
+    """
+    Lefordított pontozási modell: paraméterek, súlyvektor (9,) és tengelymetszet.
+    """
+
+    def __init__(self, name, label, support_weight, barrier_weight, factor_weights=None, offset=0.0, description="", version=None):
+        self.name = name
+        self.label = label
+        self.description = description
+        self.version = version
+        self.support_weight = float(support_weight)
+        self.barrier_weight = float(barrier_weight)
+        # Egyenlő tényezősúlyoknál None: az alapképlet változatlan útja fut
+        self.factor_weights = None if factor_weights is None else tuple(float(weight) for weight in factor_weights)
+        self.offset = float(offset)
+        self.weight_vector, self.intercept = self._compile()
+
+    def _compile(self):
+        factor_weights = np.ones(NUM_FACTORS) if self.factor_weights is None else np.asarray(self.factor_weights)
+        support_total = factor_weights[list(SUPPORT_COLUMNS)].sum()
+        barrier_total = factor_weights[list(BARRIER_COLUMNS)].sum()
+        # Támogató tényező: c * (érték - 1), gátló tényező: c * (5 - érték), ahol c a fokozatonkénti hatás
+        step = np.where(IS_BARRIER, self.barrier_weight / barrier_total, self.support_weight / support_total) * factor_weights * 100 / 4
+        weight_vector = np.where(IS_BARRIER, -step, step)
+        intercept = self.offset + float(np.where(IS_BARRIER, 5 * step, -step).sum())
+        return weight_vector, intercept
+
+    @property
+    def is_reference(self):
+        """
+        Igaz, ha a modell megegyezik az alapképlettel (a tárolt értékelések és a keresőtábla képletével).
+        """
+        return (self.factor_weights is None and self.offset == 0
+                and self.support_weight == SUPPORT_WEIGHT and self.barrier_weight == BARRIER_WEIGHT)
+
+    def score_profiles(self, ratings):
+        """
+        Mint a scoring.score_profiles, a modell súlyaival (az alapmodellnél bitre azonos eredmény).
+        """
+        return score_profiles(ratings, self.support_weight, self.barrier_weight, self.factor_weights, self.offset)
+
+    def score_profile(self, ratings):
+        result = self.score_profiles(ratings)
+        return float(result.potential[0]), result.hatas_pont[0].tolist()
+
+
+class ScoringModelRegistry:
+    """
+    Név szerint elérhető pontozási modellek és az összes modell közös súlymátrixa.
+    """
+
+    def __init__(self, models, default_name=DEFAULT_SCORING_MODEL):
+        self.models = {}
+        for model in models:
+            if model.name in self.models:
+                raise ValueError(f"Kétszer definiált pontozási modell: '{model.name}'")
+            self.models[model.name] = model
+        if default_name not in self.models:
+            raise ValueError(f"Az alapértelmezett pontozási modell ('{default_name}') nem található.")
+        self.default_name = default_name
+        self.weight_matrix = np.column_stack([model.weight_vector for model in self.models.values()])  # (9, M)
+        self.intercepts = np.array([model.intercept for model in self.models.values()])                 # (M,)
+
+    @property
+    def names(self):
+        return list(self.models)
+
+    @property
+    def default(self):
+        return self.models[self.default_name]
+
+    def get(self, name=None):
+        """
+        A megnevezett modell; None vagy ismeretlen név esetén az alapértelmezett.
+        """
+        return self.models.get(name, self.default)
+
+    def __len__(self):
+        return len(self.models)
+
+    def score_all(self, ratings):
+        """
+        Potenciál (N, M) tömbként: minden profil minden modellel, egyetlen mátrixszorzással.
+        """
+        arr = as_ratings_array(ratings)
+        potentials = arr @ self.weight_matrix + self.intercepts
+        # A lebegőpontos zaj (~1e-14) elhagyása, hogy a kategóriahatárokon ne billenjen az eredmény
+        return np.clip(np.round(potentials, 10), 0, 100)
+
+
+def _weight(value, what):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not np.isfinite(value):
+        raise ValueError(f"Érvénytelen súly ({what}): {value}")
+    return float(value)
+
+
+def compile_model(spec):
+    """
+    Modellleírás (a models/*.json szerkezete) -> ScoringModel. Hibás leírás esetén ValueError.
+    """
+    name = spec.get("name")
+    if not name or not isinstance(name, str):
+        raise ValueError("A pontozási modellnek kötelező a neve ('name').")
+    group_weights = spec.get("group_weights", {})
+    support_weight = _weight(group_weights.get("support"), f"{name} / support")
+    barrier_weight = _weight(group_weights.get("barrier"), f"{name} / barrier")
+    if support_weight < 0 or barrier_weight < 0 or abs(support_weight + barrier_weight - 1) > GROUP_WEIGHT_TOLERANCE:
+        raise ValueError(f"A csoportsúlyoknak nemnegatívnak kell lenniük, összegük 1 ({name}): {support_weight} + {barrier_weight}")
+
+    factor_weights = None
+    if spec.get("factor_weights"):
+        unknown = set(spec["factor_weights"]) - set(FACTOR_KEYS)
+        if unknown:
+            raise ValueError(f"Ismeretlen tényező a(z) '{name}' modellben: {', '.join(sorted(unknown))}")
+        # A hiányzó tényezők súlya 1
+        factor_weights = [_weight(spec["factor_weights"].get(factor_name, 1.0), f"{name} / {factor_name}") for factor_name in FACTOR_KEYS]
+        if min(factor_weights) <= 0:
+            raise ValueError(f"A tényezősúlyoknak pozitívnak kell lenniük ({name}).")
+        if len(set(factor_weights)) == 1:
+            factor_weights = None
+
+    offset = _weight(spec.get("offset", 0.0), f"{name} / offset")
+    if not -100 <= offset <= 100:
+        raise ValueError(f"Érvénytelen eltolás ({name}): {offset}")
+    return ScoringModel(name, spec.get("label", name), support_weight, barrier_weight, factor_weights, offset,
+                        description=spec.get("description", ""), version=spec.get("version"))
+
+
+def load_model(path):
+    with open(path, encoding="utf-8") as f:
+        return compile_model(json.load(f))
+
+
+def load_registry(directory, default_name=DEFAULT_SCORING_MODEL):
+    """
+    A könyvtár összes *.json modellje, fájlnév szerinti sorrendben.
+    """
+    paths = sorted(glob.glob(os.path.join(directory, "*.json")))
+    if not paths:
+        raise ValueError(f"Nincs pontozási modell a könyvtárban: {directory}")
+    return ScoringModelRegistry([load_model(path) for path in paths], default_name)
+
+
+@lru_cache(maxsize=None)
+def get_registry(directory=SCORING_MODELS_DIR):
+    """
+    A modellek egyszer betöltve és lefordítva, folyamatonként gyorsítótárazva.
+    """
+    return load_registry(directory)
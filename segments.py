@@ -0,0 +1,321 @@
+"""
+Nagy kkv portfóliók szegmentálása (súlyozott k-közép klaszterezés) a kilenc normalizált tényezőértéken.
+
+A jellemzőtér a pontozó motor normalizált s értékei (scoring.normalize_ratings): támogató
+tényezőnél (érték-1)/4, gátlónál 1-(érték-1)/4. Mivel legfeljebb 5^9 különböző profil létezik,
+a sorokat először profilonként összeszámoljuk (egy 5^9 elemű számlálótömbbe, darabonként
+olvasva), és a klaszterezés a különböző profilokon fut, az előfordulások számával súlyozva.
+Így millió soros portfólió esetén is legfeljebb ~2 millió pont marad, a hozzárendelési lépés
+pedig szálanként darabolva, több magon fut (a numpy mátrixműveletek elengedik a GIL-t).
+
+A szegmensek címkéje a jellemző (súlyozottan leggyakoribb) VRIO mintázatuk a VRIO szabálymotor
+alapján; a szegmensek a súlyozott átlagos potenciál szerint csökkenő sorrendben számozódnak.
+
+Használat:
+    python segments.py [--db assessments.sqlite3] [--k 6] [--workers 8] [--assignments profilok.csv]
+    python segments.py --input portfolio.csv --k 8
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from cache import LRUCache
+from factors import FACTOR_CODES, FACTOR_KEYS, IS_BARRIER
+from lookup_table import TABLE_SIZE, index_to_ratings, pack_vrio_flags, profile_index
+from population import MIN_STORED_POPULATION
+from scoring import TIER_LABELS, frame_ratings, get_potential_tier, normalize_ratings, score_profiles
+from settings import SEGMENT_WORKERS, STORE_PATH
+from store import AssessmentStore
+from vrio import VERDICT_PARITY, VERDICT_SUSTAINED, VERDICT_TEMPORARY, get_rule_set
+
+DEFAULT_SEGMENTS = 6
+MAX_ITERATIONS = 100
+# A középpontok legnagyobb elmozdulása, amely alatt a klaszterezés leáll (normalizált egység, 0-1)
+TOLERANCE = 1e-4
+# Ennyi pont kerül egy hozzárendelési feladatba (a részeredmények a gyorsítótárban maradnak)
+ASSIGN_CHUNK = 32_768
+
+segment_cache = LRUCache(maxsize=16, name="segments")
+
+
+def profile_counts(ratings, counts=None):
+    """
+    Profilonkénti előfordulások (5^9 elemű tömb, index: lookup_table.profile_index), növekményesen.
+    """
+    if counts is None:
+        counts = np.zeros(TABLE_SIZE, dtype=np.int64)
+    if len(ratings):
+        counts += np.bincount(profile_index(ratings), minlength=TABLE_SIZE)
+    return counts
+
+
+def profile_counts_from_store(store):
+    counts = np.zeros(TABLE_SIZE, dtype=np.int64)
+    for ratings, _ in store.iter_ratings():
+        profile_counts(ratings, counts)
+    return counts
+
+
+def _assign_chunk(points, point_norms, scaled_centers, center_norms, labels, distances):
+    # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2; a legközelebbi középpont és a távolság négyzete
+    chunk_distances = points @ scaled_centers
+    chunk_distances += center_norms
+    np.argmin(chunk_distances, axis=1, out=labels)
+    nearest = np.take_along_axis(chunk_distances, labels[:, None], axis=1)[:, 0]
+    np.maximum(nearest + point_norms, 0, out=distances)
+
+
+def assign_points(points, centers, executor=None, point_norms=None):
+    """
+    Minden pont legközelebbi középpontja és a távolság négyzete; executor esetén darabonként párhuzamosan.
+    """
+    if point_norms is None:
+        point_norms = np.einsum("ij,ij->i", points, points)
+    scaled_centers = -2 * centers.T
+    center_norms = np.einsum("ij,ij->i", centers, centers)
+    labels = np.empty(len(points), dtype=np.intp)
+    distances = np.empty(len(points))
+
+    def run(start):
+        end = start + ASSIGN_CHUNK
+        _assign_chunk(points[start:end], point_norms[start:end], scaled_centers, center_norms, labels[start:end], distances[start:end])
+
+    starts = range(0, len(points), ASSIGN_CHUNK)
+    # A list() a szálak kivételeit is továbbadja
+    list(executor.map(run, starts) if executor is not None else map(run, starts))
+    return labels, distances
+
+
+def _kmeans_plus_plus(points, weights, k, rng):
+    # Súlyozott k-means++ kezdőpontok: a következő középpont valószínűsége súly * távolság^2
+    centers = [points[rng.choice(len(points), p=weights / weights.sum())]]
+    closest = np.einsum("ij,ij->i", points - centers[0], points - centers[0])
+    for _ in range(1, k):
+        probabilities = weights * closest
+        if probabilities.sum() <= 0:
+            break
+        center = points[rng.choice(len(points), p=probabilities / probabilities.sum())]
+        centers.append(center)
+        closest = np.minimum(closest, np.einsum("ij,ij->i", points - center, points - center))
+    return np.array(centers)
+
+
+def weighted_kmeans(points, weights, k, seed=0, max_iterations=MAX_ITERATIONS, tolerance=TOLERANCE, workers=SEGMENT_WORKERS):
+    """
+    Súlyozott k-közép (Lloyd) klaszterezés. Visszatérési érték: (középpontok, címkék, inercia, iterációk).
+    """
+    rng = np.random.default_rng(seed)
+    weights = np.asarray(weights, dtype=float)
+    centers = _kmeans_plus_plus(points, weights, k, rng)
+    k = len(centers)
+    point_norms = np.einsum("ij,ij->i", points, points)
+    # Dimenziónként folytonos, súlyozott koordináták a középpontok frissítéséhez
+    weighted_coordinates = np.ascontiguousarray((points * weights[:, None]).T)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="segments") if workers > 1 else _NoExecutor() as executor:
+        for iteration in range(1, max_iterations + 1):
+            labels, distances = assign_points(points, centers, executor, point_norms)
+            weight_sums = np.bincount(labels, weights=weights, minlength=k)
+            new_centers = np.column_stack([np.bincount(labels, weights=coordinates, minlength=k) for coordinates in weighted_coordinates])
+            filled = weight_sums > 0
+            new_centers[filled] /= weight_sums[filled, None]
+            # Üres szegmens: a legtávolabbi (súlyozottan) pont lesz az új középpontja
+            for empty in np.flatnonzero(~filled):
+                farthest = int(np.argmax(weights * distances))
+                new_centers[empty] = points[farthest]
+                distances[farthest] = 0
+            shift = np.abs(new_centers - centers).max()
+            centers = new_centers
+            if shift < tolerance:
+                break
+        labels, distances = assign_points(points, centers, executor, point_norms)
+    return centers, labels, float((weights * distances).sum()), iteration
+
+
+class _NoExecutor:
+    # Egyszálú futás: a hozzárendelés egyetlen darabban történik
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def normalized_to_ratings(normalized):
+    """
+    Normalizált s értékek (pl. szegmensközéppontok) -> értékelés skála (1-5, tört értékkel).
+    """
+    normalized = np.asarray(normalized, dtype=float)
+    return 1 + 4 * np.where(IS_BARRIER, 1 - normalized, normalized)
+
+
+class Segment:
+    """
+    Egy szegmens összesítése: méret, átlagos potenciál, kategóriaarányok, középpont és VRIO mintázat.
+    """
+    __slots__ = ("id", "label", "size", "share", "mean_potential", "tier_shares", "center_ratings",
+                 "vrio_flags", "vrio_share", "representative")
+
+    def __init__(self, segment_id, label, size, share, mean_potential, tier_shares, center_ratings, vrio_flags, vrio_share, representative):
+        self.id = segment_id
+        self.label = label
+        self.size = size                      # értékelések száma (ismétlődésekkel)
+        self.share = share                    # a portfólió hányada (0-1)
+        self.mean_potential = mean_potential
+        self.tier_shares = tier_shares        # {kategória: arány} a TIER_LABELS sorrendjében
+        self.center_ratings = center_ratings  # tényezőnév -> átlagos értékelés (1-5)
+        self.vrio_flags = vrio_flags          # (R, 4) a jellemző VRIO mintázat
+        self.vrio_share = vrio_share          # a jellemző mintázat aránya a szegmensen belül
+        self.representative = representative  # a jellemző mintázatú leggyakoribb profil (9 értékelés)
+
+
+class SegmentationResult:
+    """
+    A szegmentálás eredménye; az assign() új profilokat a legközelebbi szegmenshez rendel.
+    """
+
+    def __init__(self, segments, centers, profile_indices, profile_segments, total, inertia, iterations):
+        self.segments = segments                  # szegmens sorszám (1-től) szerint
+        self.centers = centers                    # (k, 9) normalizált középpontok, a szegmensek sorrendjében
+        self.profile_indices = profile_indices    # a különböző profilok indexei
+        self.profile_segments = profile_segments  # ... és a szegmensük sorszáma
+        self.total = total
+        self.distinct = len(profile_indices)
+        self.inertia = inertia
+        self.iterations = iterations
+
+    def assign(self, ratings):
+        labels, _ = assign_points(normalize_ratings(ratings), self.centers)
+        return labels + 1
+
+
+def segment_label(flags, verdicts, resources):
+    """
+    Szöveges címke a VRIO mintázatból: a tartós és ideiglenes előnyt adó, különben a paritást adó erőforrások.
+    """
+    sustained = [resource for resource, verdict in zip(resources, verdicts) if verdict == VERDICT_SUSTAINED]
+    temporary = [resource for resource, verdict in zip(resources, verdicts) if verdict == VERDICT_TEMPORARY]
+    parts = []
+    if sustained:
+        parts.append(f"Tartós előny: {', '.join(sustained)}")
+    if temporary:
+        parts.append(f"Ideiglenes előny: {', '.join(temporary)}")
+    if not parts:
+        parity = [resource for resource, verdict in zip(resources, verdicts) if verdict == VERDICT_PARITY]
+        parts.append(f"Versenyparitás: {', '.join(parity)}" if parity else "Nincs VRIO versenyelőny")
+    return "; ".join(parts)
+
+
+def segment_portfolio(counts, k=DEFAULT_SEGMENTS, seed=0, workers=SEGMENT_WORKERS, rule_set=None):
+    """
+    Szegmentálás a profilonkénti előfordulásokból (profile_counts). None, ha nincs egyetlen profil sem.
+    """
+    rule_set = rule_set or get_rule_set()
+    profile_indices = np.flatnonzero(counts)
+    if not len(profile_indices):
+        return None
+    weights = counts[profile_indices].astype(float)
+    ratings = index_to_ratings(profile_indices)
+    points = normalize_ratings(ratings)
+    centers, labels, inertia, iterations = weighted_kmeans(points, weights, min(k, len(profile_indices)), seed, workers=workers)
+    k = len(centers)
+
+    # Szegmensenkénti súlyozott átlagos potenciál, majd sorszámozás csökkenő potenciál szerint
+    potentials = score_profiles(ratings).potential
+    weight_sums = np.bincount(labels, weights=weights, minlength=k)
+    mean_potentials = np.bincount(labels, weights=weights * potentials, minlength=k) / np.maximum(weight_sums, 1e-12)
+    order = np.argsort(-mean_potentials, kind="stable")
+    rank = np.empty(k, dtype=np.intp)
+    rank[order] = np.arange(k)
+    labels = rank[labels]
+    centers, weight_sums, mean_potentials = centers[order], weight_sums[order], mean_potentials[order]
+
+    tier_counts = np.bincount(labels * len(TIER_LABELS) + get_potential_tier(potentials), weights=weights,
+                              minlength=k * len(TIER_LABELS)).reshape(k, len(TIER_LABELS))
+
+    # A jellemző VRIO mintázat: szegmensenként a súlyozottan leggyakoribb VRIO maszk
+    flags = rule_set.evaluate(ratings)
+    masks = pack_vrio_flags(flags).astype(np.int64)
+    pair_keys, pair_inverse = np.unique(labels.astype(np.int64) << 32 | masks, return_inverse=True)
+    pair_weights = np.bincount(pair_inverse, weights=weights)
+    pair_segments = pair_keys >> 32
+
+    total = float(weights.sum())
+    segments = []
+    for segment_index in range(k):
+        candidates = np.flatnonzero(pair_segments == segment_index)
+        best_pair = candidates[np.argmax(pair_weights[candidates])]
+        members = np.flatnonzero((labels == segment_index) & (masks == (pair_keys[best_pair] & 0xFFFFFFFF)))
+        representative = members[np.argmax(weights[members])]
+        segment_flags = flags[representative]
+        segments.append(Segment(
+            segment_index + 1,
+            segment_label(segment_flags, rule_set.verdicts(segment_flags), rule_set.resources),
+            int(weight_sums[segment_index]),
+            float(weight_sums[segment_index] / total),
+            float(mean_potentials[segment_index]),
+            dict(zip(TIER_LABELS, (tier_counts[segment_index] / max(weight_sums[segment_index], 1e-12)).tolist())),
+            dict(zip(FACTOR_KEYS, normalized_to_ratings(centers[segment_index]).tolist())),
+            segment_flags,
+            float(pair_weights[best_pair] / weight_sums[segment_index]),
+            ratings[representative].tolist(),
+        ))
+    return SegmentationResult(segments, centers, profile_indices, labels + 1, int(total), inertia, iterations)
+
+
+def cached_segment_store(store, k=DEFAULT_SEGMENTS):
+    """
+    A tárolt értékelések szegmentálása, a tároló mérete és k szerint folyamatszinten gyorsítótárazva.
+    None, ha kevés a tárolt értékelés (population.MIN_STORED_POPULATION).
+    """
+    total = store.population_histogram().total
+    if total < MIN_STORED_POPULATION:
+        return None
+    key = (store.pool.path, total, k)
+    return segment_cache.get_or_create(key, lambda: segment_portfolio(profile_counts_from_store(store), k))
+
+
+def _profile_counts_from_csv(path, chunksize=500_000):
+    counts = np.zeros(TABLE_SIZE, dtype=np.int64)
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        ratings, _ = frame_ratings(chunk)
+        profile_counts(ratings, counts)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kkv portfólió szegmentálása a kilenc tényező alapján.")
+    parser.add_argument("--db", default=STORE_PATH, help="Az SQLite értékelés-tároló")
+    parser.add_argument("--input", help="Tároló helyett CSV bemenet (tényezőnevek vagy rövid kódok oszlopai)")
+    parser.add_argument("--k", type=int, default=DEFAULT_SEGMENTS, help="A szegmensek száma")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=SEGMENT_WORKERS, help="A hozzárendelés párhuzamos szálainak száma")
+    parser.add_argument("--assignments", help="A különböző profilok, előfordulásuk és szegmensük CSV fájlba")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    counts = _profile_counts_from_csv(args.input) if args.input else profile_counts_from_store(AssessmentStore(args.db))
+    loaded = time.perf_counter()
+    result = segment_portfolio(counts, args.k, args.seed, args.workers)
+    finished = time.perf_counter()
+    if result is None:
+        print("Nincs feldolgozható értékelés.", file=sys.stderr)
+        return
+    print(f"{result.total} értékelés, {result.distinct} különböző profil; beolvasás {loaded - started:.2f} s, "
+          f"klaszterezés {finished - loaded:.2f} s ({result.iterations} iteráció)", file=sys.stderr)
+    for segment in result.segments:
+        tiers = ", ".join(f"{label} {share:.0%}" for label, share in segment.tier_shares.items())
+        print(f"{segment.id}. szegmens ({segment.share:.1%}, {segment.size} értékelés): {segment.label}")
+        print(f"   átlagos potenciál {segment.mean_potential:.1f} % ({tiers}); a jellemző VRIO mintázat aránya {segment.vrio_share:.0%}")
+    if args.assignments:
+        df = pd.DataFrame(index_to_ratings(result.profile_indices), columns=FACTOR_CODES)
+        df["darab"] = counts[result.profile_indices]
+        df["szegmens"] = result.profile_segments
+        df.to_csv(args.assignments, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import numpy as np
+
+from factors import FACTOR_KEYS, IS_BARRIER
+from scoring import (
+    BARRIER_COLUMNS,
+    BARRIER_WEIGHT,
+    SUPPORT_COLUMNS,
+    SUPPORT_WEIGHT,
+    TIER_THRESHOLDS,
+    as_ratings_array,
+    score_profiles,
+)
+
+# --- Érzékenységvizsgálat és "mi lenne, ha" szimuláció ---
+# A potenciál képlete tényezőnként lineáris: egy támogató tényező +1 lépése mindig
+# SUPPORT_WEIGHT * 100 / (4 * 5) ponttal, egy gátló tényező -1 lépése mindig
+# BARRIER_WEIGHT * 100 / (4 * 4) ponttal növeli a potenciált. Ezért a jelöltek értékeléséhez
+# a keresésnél nem kell a teljes profilt újrapontozni, elég a lépésenkénti változást (delta)
+# hozzáadni; teljes újraszámolás csak a végeredmény ellenőrzésére történik.
+# Más pontozási modellnél (scoring_models.py) a lépésenkénti delták a modell súlyvektorából jönnek.
+# Eltolással (offset) rendelkező modellnél a potenciál a 0-100 határon levágódik, ott a delták
+# nem adódnak össze: az érzékenységi tábla és a szimuláció ezért a módosított profilokat egyetlen
+# vektorizált hívással újrapontozza, a keresés pedig a levágás előtti lineáris értékből indul.
+
+MIN_RATING, MAX_RATING = 1, 5
+
+
+def factor_step_deltas():
+    """
+    Tényezőnként a potenciál változása, ha az értékelés 1-gyel NŐ (gátló tényezőnél negatív).
+    """
+    deltas = np.empty(len(FACTOR_KEYS))
+    deltas[list(SUPPORT_COLUMNS)] = SUPPORT_WEIGHT * 100 / (4 * len(SUPPORT_COLUMNS))
+    deltas[list(BARRIER_COLUMNS)] = -BARRIER_WEIGHT * 100 / (4 * len(BARRIER_COLUMNS))
+    return deltas
+
+
+STEP_DELTAS = factor_step_deltas()
+# A javító irány: támogató tényezőnél +1, gátló tényezőnél -1 lépés
+IMPROVEMENT_DIRECTIONS = np.where(np.array(IS_BARRIER), -1, 1)
+IMPROVEMENT_GAINS = np.abs(STEP_DELTAS)
+
+
+def _step_deltas(model):
+    return STEP_DELTAS if model is None else model.weight_vector
+
+
+def _score(ratings, model):
+    return (score_profiles(ratings) if model is None else model.score_profiles(ratings)).potential
+
+
+def _potential(ratings, model):
+    return float(_score(ratings, model)[0])
+
+
+def linear_potentials(ratings, model=None):
+    """
+    A potenciál a 0-100 közötti levágás nélkül (értékelések @ súlyvektor + tengelymetszet).
+    """
+    step_deltas = _step_deltas(model)
+    intercept = float(np.where(IS_BARRIER, 5 * np.abs(step_deltas), -np.abs(step_deltas)).sum()) if model is None else model.intercept
+    return as_ratings_array(ratings) @ step_deltas + intercept
+
+
+def unclipped_potentials(ratings, potentials, model=None):
+    """
+    A pontozott potenciálok, ahol levágódtak (0 vagy 100), a lineáris értékkel helyettesítve.
+    """
+    potentials = np.asarray(potentials, dtype=float)
+    clipped = (potentials <= 0) | (potentials >= 100)
+    if not clipped.any():
+        return potentials
+    return np.where(clipped, linear_potentials(ratings, model), potentials)
+
+
+def sensitivity_table(ratings, model=None):
+    """
+    Tényezőnként a potenciál változása -1 és +1 lépés esetén (None, ha a lépés a skálán kívülre vinne).
+    Visszatérési érték: (jelenlegi potenciál, [(tényező, érték, delta_minus, delta_plus), ...]).
+    """
+    arr = as_ratings_array(ratings)[0]
+    # A jelenlegi profil és tényezőnként a -1/+1 lépéses változat egyetlen hívással pontozva;
+    # a skálán kívüli lépések a skálán belül maradnak, eredményük nem kerül felhasználásra
+    candidates = np.repeat(arr[None, :], 1 + 2 * len(FACTOR_KEYS), axis=0)
+    factor_indices = np.arange(len(FACTOR_KEYS))
+    candidates[1 + factor_indices, factor_indices] = np.maximum(arr - 1, MIN_RATING)
+    candidates[1 + len(FACTOR_KEYS) + factor_indices, factor_indices] = np.minimum(arr + 1, MAX_RATING)
+    potentials = _score(candidates, model)
+    potential = float(potentials[0])
+    rows = []
+    for factor_index, factor_name in enumerate(FACTOR_KEYS):
+        value = int(arr[factor_index])
+        delta_minus = float(potentials[1 + factor_index]) - potential if value > MIN_RATING else None
+        delta_plus = float(potentials[1 + len(FACTOR_KEYS) + factor_index]) - potential if value < MAX_RATING else None
+        rows.append((factor_name, value, delta_minus, delta_plus))
+    return potential, rows
+
+
+def what_if(ratings, changes, model=None):
+    """
+    A potenciál a megadott módosításokkal ({tényező: új érték}), a módosított profil újrapontozásával.
+    """
+    arr = as_ratings_array(ratings)[0].copy()
+    for factor_name, new_value in changes.items():
+        if not MIN_RATING <= new_value <= MAX_RATING:
+            raise ValueError(f"Érvénytelen értékelés ({factor_name}): {new_value}")
+        arr[FACTOR_KEYS.index(factor_name)] = new_value
+    return _potential(arr, model)
+
+
+def min_improvements(ratings, threshold, model=None):
+    """
+    A legkevesebb egylépéses javítás, amellyel a potenciál eléri a küszöböt.
+    Visszatérési érték: ([(tényező, régi érték, új érték), ...], új potenciál), vagy None, ha nem érhető el.
+    """
+    current = as_ratings_array(ratings)[0].astype(np.int64)
+    # Levágott potenciálnál a lineáris értékből indulunk, különben a nyereségek nem adódnak össze
+    potential = float(unclipped_potentials(current, [_potential(current, model)], model)[0])
+    step_deltas = _step_deltas(model)
+    directions = np.where(step_deltas < 0, -1, 1)
+    gains = np.abs(step_deltas)
+    steps = []
+    # A lépések egymástól függetlenek és állandó nyereségűek, így a mohó választás
+    # (mindig a legnagyobb nyereségű, még javítható tényező) adja a legkevesebb lépést.
+    order = np.argsort(-gains, kind="stable")
+    while potential < threshold:
+        for factor_index in order:
+            next_value = current[factor_index] + directions[factor_index]
+            if MIN_RATING <= next_value <= MAX_RATING:
+                break
+        else:
+            return None
+        steps.append((FACTOR_KEYS[factor_index], int(current[factor_index]), int(next_value)))
+        current[factor_index] = next_value
+        potential += float(gains[factor_index])
+        if potential >= threshold:
+            # A lebegőpontos összegzés eltérhet a teljes képlettől, ezért itt újrapontozunk
+            potential = _potential(current, model)
+    return steps, potential
+
+
+def tier_targets(ratings, model=None):
+    """
+    A jelenlegi potenciál feletti kategóriahatárokhoz (40, 70) tartozó legkisebb javítási tervek.
+    """
+    potential = _potential(ratings, model)
+    return {threshold: min_improvements(ratings, threshold, model) for threshold in TIER_THRESHOLDS if potential < threshold}
+
+
+def summarize_steps(steps):
+    """
+    Az egylépéses javítások tényezőnként összevonva: {tényező: (kiinduló érték, cél érték)}.
+    """
+    summary = {}
+    for factor_name, old_value, new_value in steps:
+        summary[factor_name] = (summary.get(factor_name, (old_value,))[0], new_value)
+    return summary
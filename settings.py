@@ -0,0 +1,59 @@
+import os
+
+# --- Futási beállítások környezeti változókból ---
+# Minden beállítás RBVKKV_ előtagú környezeti változóval írható felül.
+
+# Diagram megjelenítés: "matplotlib" (szerveroldali PNG) vagy "vega" (böngészőben rajzolt Vega-Lite)
+CHART_BACKEND = os.environ.get("RBVKKV_CHART_BACKEND", "matplotlib").lower()
+CHART_BACKENDS = ("matplotlib", "vega")
+if CHART_BACKEND not in CHART_BACKENDS:
+    raise ValueError(f"Ismeretlen RBVKKV_CHART_BACKEND érték: '{CHART_BACKEND}' (lehetséges: {', '.join(CHART_BACKENDS)})")
+
+# A renderelt diagramok gyorsítótárának mérete (elemszám)
+FIGURE_CACHE_SIZE = int(os.environ.get("RBVKKV_FIGURE_CACHE_SIZE", "256"))
+# ... és becsült memóriakorlátja (MB)
+FIGURE_CACHE_MAX_MB = int(os.environ.get("RBVKKV_FIGURE_CACHE_MAX_MB", "64"))
+# A folyamatszintű gyorsítótárak mérete (elemszám) a pontszámokhoz, VRIO táblákhoz és beszámolókhoz
+RESULT_CACHE_SIZE = int(os.environ.get("RBVKKV_RESULT_CACHE_SIZE", "1024"))
+# Gyorsítótár statisztikák megjelenítése az oldalsávon (1/0)
+SHOW_CACHE_STATS = os.environ.get("RBVKKV_SHOW_CACHE_STATS", "0") == "1"
+
+# Az előre kiszámított keresőtábla könyvtára
+LUT_DIR = os.environ.get("RBVKKV_LUT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".lut_cache"))
+# Az alkalmazás (alapképlet szerinti) pontozása a keresőtáblából (1/0); induláskor memórialeképezve
+SCORING_LUT = os.environ.get("RBVKKV_SCORING_LUT", "0") == "1"
+
+# A VRIO szabálytábla (küszöbértékek) JSON fájlja
+VRIO_RULES_PATH = os.environ.get("RBVKKV_VRIO_RULES", os.path.join(os.path.dirname(os.path.abspath(__file__)), "vrio_rules.json"))
+
+# A nyelvi tartalomcsomagok (JSON) könyvtára, a lefordított csomagok könyvtára és az alapértelmezett nyelv
+CONTENT_DIR = os.environ.get("RBVKKV_CONTENT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "content"))
+CONTENT_CACHE_DIR = os.environ.get("RBVKKV_CONTENT_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".content_cache"))
+DEFAULT_LANGUAGE = os.environ.get("RBVKKV_LANGUAGE", "hu")
+
+# A pontozási modellek (JSON) könyvtára és az alapértelmezett modell neve
+SCORING_MODELS_DIR = os.environ.get("RBVKKV_MODELS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "models"))
+DEFAULT_SCORING_MODEL = os.environ.get("RBVKKV_DEFAULT_MODEL", "alap")
+
+# A PDF export háttérszálainak száma
+PDF_WORKERS = int(os.environ.get("RBVKKV_PDF_WORKERS", "2"))
+
+# A Monte Carlo bizonytalansági mód mintaszáma profilonként
+MC_SAMPLES = int(os.environ.get("RBVKKV_MC_SAMPLES", "100000"))
+
+# Az értékelések SQLite adatbázisa és a kapcsolatkészlet mérete
+STORE_PATH = os.environ.get("RBVKKV_STORE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "assessments.sqlite3"))
+STORE_POOL_SIZE = int(os.environ.get("RBVKKV_STORE_POOL_SIZE", "4"))
+
+# A folyamatos feldolgozás (ingest.py) mikrokötegeinek legnagyobb mérete és gyűjtési ideje (ms),
+# valamint az olvasó és a pontozás közötti korlátos sor mérete
+INGEST_BATCH_SIZE = int(os.environ.get("RBVKKV_INGEST_BATCH_SIZE", "500"))
+INGEST_MAX_WAIT_MS = int(os.environ.get("RBVKKV_INGEST_MAX_WAIT_MS", "200"))
+INGEST_QUEUE_SIZE = int(os.environ.get("RBVKKV_INGEST_QUEUE_SIZE", "10000"))
+
+# A portfólió szegmentálás (segments.py) hozzárendelési lépésének párhuzamos szálai
+SEGMENT_WORKERS = int(os.environ.get("RBVKKV_SEGMENT_WORKERS", str(os.cpu_count() or 1)))
+
+# Újrafuttatásonkénti időmérés (1/0) és opcionális cProfile kimeneti könyvtár
+INSTRUMENTATION_ENABLED = os.environ.get("RBVKKV_INSTRUMENT", "0") == "1"
+PROFILE_DIR = os.environ.get("RBVKKV_PROFILE_DIR") or None
@@ -0,0 +1,320 @@
+"""
+Kkv értékelések tartós tárolása beágyazott SQLite adatbázisban.
+
+Minden értékelés egy sor: cégazonosító (opcionális), időbélyeg, a 9 tényező értékelése
+(oszlopnév a FACTOR_CODES rövid kódja), a kiszámított potenciál és kategória.
+A potenciálra, a kategóriára és minden tényezőre külön index készül, így a kohorsz
+lekérdezések (pl. "innovacio >= 4 és potenciál < 40") millió soros táblán is indexből futnak.
+Nagy kötegek betöltésekor (bulk_load) az indexek a betöltés végén egyszerre épülnek újra.
+
+Használat:
+    python store.py count --where innovacio>=4 --potential-max 40
+    python store.py stats
+"""
+import argparse
+import queue
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+
+import numpy as np
+
+from factors import FACTOR_CODES
+from population import PopulationHistogram
+from scoring import TIER_LABELS, as_ratings_array, get_potential_tier, score_profiles
+from settings import STORE_PATH, STORE_POOL_SIZE
+
+# Ennyi sor kerül egy executemany hívásba / tranzakcióba
+WRITE_BATCH_SIZE = 50_000
+
+# Legalább ennyi sor mentésekor (és ha a köteg nem kisebb a már tárolt soroknál) a save_many
+# az indexeket eldobja és a végén újraépíti: 11 index soronkénti karbantartása helyett
+# egyetlen rendezett indexépítés fut indexenként
+BULK_LOAD_MIN_ROWS = 100_000
+
+# A tényezőindexek (tényező, potenciál) összetett indexek: a tipikus kohorsz szűrés
+# (tényező + potenciálsáv) így a táblasorok olvasása nélkül, csak az indexből fut.
+_INDEXES = {
+    "idx_assessments_potential": "potential",
+    "idx_assessments_tier": "tier",
+    **{f"idx_assessments_{code}": f"{code}, potential" for code in FACTOR_CODES},
+}
+_CREATE_INDEXES = "".join(f"CREATE INDEX IF NOT EXISTS {name} ON assessments ({columns});\n" for name, columns in _INDEXES.items())
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS assessments (
+    id INTEGER PRIMARY KEY,
+    company TEXT,
+    created_at REAL NOT NULL,
+    {", ".join(f"{code} INTEGER NOT NULL" for code in FACTOR_CODES)},
+    potential REAL NOT NULL,
+    tier INTEGER NOT NULL
+);
+{_CREATE_INDEXES}CREATE TABLE IF NOT EXISTS population_histogram (
+    kind INTEGER NOT NULL,
+    bin INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (kind, bin)
+) WITHOUT ROWID;
+"""
+
+_INSERT = (f"INSERT INTO assessments (company, created_at, {', '.join(FACTOR_CODES)}, potential, tier) "
+           f"VALUES ({', '.join('?' * (len(FACTOR_CODES) + 4))})")
+
+# A population_histogram tábla: kind 0-8 a tényezők (bin = érték - 1), kind 9 a potenciál (0,5 pontos osztály).
+# A gyakoriságok az értékelésekkel azonos tranzakcióban nőnek, így mindig konzisztensek a táblával.
+POTENTIAL_KIND = len(FACTOR_CODES)
+_UPSERT_HISTOGRAM = ("INSERT INTO population_histogram (kind, bin, count) VALUES (?, ?, ?) "
+                     "ON CONFLICT (kind, bin) DO UPDATE SET count = count + excluded.count")
+
+_OPERATORS = {">=": ">=", "<=": "<=", "=": "=", ">": ">", "<": "<"}
+
+
+class ConnectionPool:
+    """
+    Rögzített számú, szálak között megosztható SQLite kapcsolat (WAL módban).
+    """
+
+    def __init__(self, path, size=STORE_POOL_SIZE):
+        self.path = str(path)
+        self._connections = queue.Queue()
+        for _ in range(size):
+            connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._connections.put(connection)
+
+    @contextmanager
+    def connection(self):
+        connection = self._connections.get()
+        try:
+            yield connection
+        finally:
+            self._connections.put(connection)
+
+    def close(self):
+        while not self._connections.empty():
+            self._connections.get_nowait().close()
+
+
+class AssessmentStore:
+    """
+    Értékelések mentése (egyenként vagy kötegben) és kohorsz lekérdezések.
+    """
+
+    def __init__(self, path=STORE_PATH, pool_size=STORE_POOL_SIZE):
+        self.pool = ConnectionPool(path, pool_size)
+        self._bulk_lock = threading.Lock()
+        self._bulk_depth = 0
+        with self.pool.connection() as connection:
+            # A CREATE INDEX IF NOT EXISTS egy megszakadt bulk_load után hiányzó indexeket is pótolja
+            connection.executescript(_SCHEMA)
+            # Korábbi (hisztogram nélküli) adatbázisnál a gyakoriságokat egyszer újraépítjük
+            has_assessments = connection.execute("SELECT EXISTS (SELECT 1 FROM assessments)").fetchone()[0]
+            has_histogram = connection.execute("SELECT EXISTS (SELECT 1 FROM population_histogram)").fetchone()[0]
+        if has_assessments and not has_histogram:
+            self.rebuild_population_histogram()
+
+    def save(self, selected_factors, company=None):
+        """
+        Egyetlen profil mentése; a visszatérési érték az új sor azonosítója.
+        """
+        arr = as_ratings_array(selected_factors)
+        potential = score_profiles(arr).potential
+        row = self._rows([company], arr, potential)[0]
+        with self.pool.connection() as connection, connection:
+            assessment_id = connection.execute(_INSERT, row).lastrowid
+            self._update_histogram(connection, arr, potential)
+        return assessment_id
+
+    def save_many(self, ratings, companies=None, potentials=None):
+        """
+        Kötegelt mentés: (N, 9) értékelés tömb, opcionális cégazonosítók és már kiszámított potenciálok.
+        """
+        arr = as_ratings_array(ratings)
+        if potentials is None:
+            potentials = score_profiles(arr).potential
+        if companies is None:
+            companies = [None] * len(arr)
+        with self.bulk_load() if self.is_bulk_load(len(arr)) else nullcontext(), self.pool.connection() as connection:
+            for start in range(0, len(arr), WRITE_BATCH_SIZE):
+                stop = start + WRITE_BATCH_SIZE
+                with connection:
+                    connection.executemany(_INSERT, self._rows(companies[start:stop], arr[start:stop], potentials[start:stop]))
+                    self._update_histogram(connection, arr[start:stop], potentials[start:stop])
+        return len(arr)
+
+    def is_bulk_load(self, row_count):
+        """
+        Igaz, ha ennyi új sor mentésekor megéri az indexeket eldobni és a végén újraépíteni
+        (legalább BULK_LOAD_MIN_ROWS sor, és legalább annyi, amennyi már tárolva van).
+        """
+        if row_count < BULK_LOAD_MIN_ROWS:
+            return False
+        # A MAX(id) az elsődleges kulcs indexéből, a tábla bejárása nélkül adja a sorszám becslését
+        with self.pool.connection() as connection:
+            stored = connection.execute("SELECT COALESCE(MAX(id), 0) FROM assessments").fetchone()[0]
+        return row_count >= stored
+
+    @contextmanager
+    def bulk_load(self):
+        """
+        Tömeges betöltés: a másodlagos indexek a blokk idejére eldobásra kerülnek, a végén
+        egyszer épülnek újra. Egymásba ágyazható (pl. a batch.py futás és a save_many).
+        """
+        with self._bulk_lock:
+            self._bulk_depth += 1
+            if self._bulk_depth == 1:
+                with self.pool.connection() as connection, connection:
+                    for name in _INDEXES:
+                        connection.execute(f"DROP INDEX IF EXISTS {name}")
+        try:
+            yield self
+        finally:
+            with self._bulk_lock:
+                self._bulk_depth -= 1
+                if self._bulk_depth == 0:
+                    with self.pool.connection() as connection:
+                        connection.executescript(_CREATE_INDEXES)
+
+    @staticmethod
+    def _update_histogram(connection, arr, potentials):
+        AssessmentStore._write_histogram(connection, *PopulationHistogram().add(arr, potentials))
+
+    @staticmethod
+    def _write_histogram(connection, factor_counts, potential_counts):
+        # Csak a nem nulla gyakoriságok kerülnek hozzáadásra
+        updates = [(int(kind), int(bin_index), int(factor_counts[kind, bin_index])) for kind, bin_index in zip(*np.nonzero(factor_counts))]
+        updates += [(POTENTIAL_KIND, int(bin_index), int(potential_counts[bin_index])) for bin_index in np.flatnonzero(potential_counts)]
+        connection.executemany(_UPSERT_HISTOGRAM, updates)
+
+    def population_histogram(self):
+        """
+        A tárolt értékelések előre aggregált gyakoriságai (legfeljebb 9 x 5 + 201 sor beolvasása).
+        """
+        histogram = PopulationHistogram()
+        with self.pool.connection() as connection:
+            for kind, bin_index, count in connection.execute("SELECT kind, bin, count FROM population_histogram"):
+                if kind == POTENTIAL_KIND:
+                    histogram.potential_counts[bin_index] = count
+                else:
+                    histogram.factor_counts[kind, bin_index] = count
+        return histogram
+
+    def rebuild_population_histogram(self):
+        """
+        A gyakoriságok teljes újraszámolása a tárolt értékelésekből.
+        """
+        histogram = PopulationHistogram()
+        for ratings, potentials in self.iter_ratings():
+            histogram.add(ratings, potentials)
+        with self.pool.connection() as connection, connection:
+            connection.execute("DELETE FROM population_histogram")
+            self._write_histogram(connection, histogram.factor_counts, histogram.potential_counts)
+        return histogram
+
+    @staticmethod
+    def _rows(companies, arr, potentials):
+        created_at = time.time()
+        tiers = get_potential_tier(np.asarray(potentials)).tolist()
+        company_values = [None if company is None else str(company) for company in companies]
+        return [(company, created_at, *ratings, potential, tier)
+                for company, ratings, potential, tier in zip(company_values, arr.tolist(), np.asarray(potentials, dtype=float).tolist(), tiers)]
+
+    @staticmethod
+    def _where(factor_filters=(), potential_min=None, potential_max=None, tier=None):
+        # A tényezőszűrők (kód, operátor, érték) hármasok; az oszlopnevek csak a FACTOR_CODES-ból jöhetnek
+        clauses, params = [], []
+        for code, operator, value in factor_filters:
+            if code not in FACTOR_CODES:
+                raise ValueError(f"Ismeretlen tényezőkód: '{code}' (lehetséges: {', '.join(FACTOR_CODES)})")
+            if operator not in _OPERATORS:
+                raise ValueError(f"Ismeretlen összehasonlítás: '{operator}'")
+            clauses.append(f"{code} {_OPERATORS[operator]} ?")
+            params.append(int(value))
+        if potential_min is not None:
+            clauses.append("potential >= ?"); params.append(float(potential_min))
+        if potential_max is not None:
+            clauses.append("potential < ?"); params.append(float(potential_max))
+        if tier is not None:
+            clauses.append("tier = ?"); params.append(int(tier))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query_cohort(self, factor_filters=(), potential_min=None, potential_max=None, tier=None, limit=1000):
+        """
+        A szűrőknek megfelelő értékelések listája (szótárak), legfeljebb limit darab.
+        A potenciál szűrő félig nyílt: potential_min <= potenciál < potential_max.
+        """
+        where, params = self._where(factor_filters, potential_min, potential_max, tier)
+        columns = ("id", "company", "created_at") + FACTOR_CODES + ("potential", "tier")
+        sql = f"SELECT {', '.join(columns)} FROM assessments{where} ORDER BY id LIMIT ?"
+        with self.pool.connection() as connection:
+            rows = connection.execute(sql, params + [int(limit)]).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def count_cohort(self, factor_filters=(), potential_min=None, potential_max=None, tier=None):
+        where, params = self._where(factor_filters, potential_min, potential_max, tier)
+        with self.pool.connection() as connection:
+            return connection.execute(f"SELECT COUNT(*) FROM assessments{where}", params).fetchone()[0]
+
+    def iter_ratings(self, batch_size=WRITE_BATCH_SIZE):
+        """
+        Az összes tárolt értékelés (N, 9) tömbökben, a potenciállal együtt.
+        """
+        with self.pool.connection() as connection:
+            cursor = connection.execute(f"SELECT {', '.join(FACTOR_CODES)}, potential FROM assessments ORDER BY id")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                arr = np.asarray(rows, dtype=float)
+                yield arr[:, :len(FACTOR_CODES)].astype(np.int8), arr[:, len(FACTOR_CODES)]
+
+
+@lru_cache(maxsize=None)
+def get_store(path=STORE_PATH):
+    """
+    Folyamatonként egyetlen tároló (és kapcsolatkészlet) útvonalanként.
+    """
+    return AssessmentStore(path)
+
+
+def parse_filter(text):
+    """
+    "innovacio>=4" alakú szűrő -> ("innovacio", ">=", 4).
+    """
+    match = re.fullmatch(r"\s*(\w+)\s*(>=|<=|=|>|<)\s*([1-5])\s*", text)
+    if not match:
+        raise argparse.ArgumentTypeError(f"Érvénytelen szűrő: '{text}' (példa: innovacio>=4)")
+    return match.group(1), match.group(2), int(match.group(3))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tárolt kkv értékelések lekérdezése.")
+    parser.add_argument("command", choices=("count", "list", "stats"))
+    parser.add_argument("--db", default=STORE_PATH, help="Az SQLite adatbázis fájl")
+    parser.add_argument("--where", type=parse_filter, action="append", default=[], help="Tényezőszűrő, pl. innovacio>=4")
+    parser.add_argument("--potential-min", type=float)
+    parser.add_argument("--potential-max", type=float)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+    store = AssessmentStore(args.db)
+    if args.command == "stats":
+        print(f"Tárolt értékelések: {store.count_cohort()}")
+        for tier_code, tier_label in enumerate(TIER_LABELS):
+            print(f"  {tier_label}: {store.count_cohort(tier=tier_code)}")
+        return
+    started = time.perf_counter()
+    if args.command == "count":
+        print(store.count_cohort(args.where, args.potential_min, args.potential_max))
+    else:
+        for row in store.query_cohort(args.where, args.potential_min, args.potential_max, limit=args.limit):
+            print(row)
+    print(f"({(time.perf_counter() - started) * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
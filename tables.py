@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+from cache import LRUCache
+from content import get_bundle
+from factors import FACTOR_KEYS, factor_texts
+from settings import DEFAULT_LANGUAGE
+from utils import highlight_vrio_cells, style_main_profile_row_cells
+from vrio import VRIO_CRITERIA
+
+# --- Előre kiszámított táblázatstílusok a "Főoldal (Kkv Profil)" és a "VRIO Elemzés" oldalhoz ---
+# A cellák csak 1-5 értéket (vagy "nincs értékelés"-t), illetve igaz/hamis jelzőt vehetnek fel,
+# ezért a stílusfüggvényeket induláskor egyszer, minden lehetséges értékre lefuttatjuk, és a
+# kész CSS szövegeket tömbből indexeljük. A Styler így cellánkénti visszahívás helyett egyetlen
+# apply(axis=None) hívással kapja meg a teljes stílusmátrixot. Az elkészült táblázatok
+# profilonként (és nyelvenként) gyorsítótárba kerülnek. A tényezőnevek, szintleírások és
+# erőforrásnevek a nyelvi csomagból jönnek; az oszlopnevek a column_config miatt változatlanok.
+
+PROFILE_COLUMNS = ["Tényező", "Értékelés (1-5)", "Rövid Leírás"]
+VRIO_TABLE_COLUMNS = ['Erőforrás'] + VRIO_CRITERIA
+NOT_RATED_TEXT = "Még nem értékelt"
+
+# 0. sor: nincs értékelés, 1-5. sor: az adott értékelés; oszlopok a PROFILE_COLUMNS szerint
+PROFILE_ROW_CSS = np.array([style_main_profile_row_cells({"Értékelés (1-5)": value}) for value in (None, 1, 2, 3, 4, 5)], dtype=object)
+
+# A VRIO táblázat set_properties beállításai és a highlight_vrio_cells színei egy CSS szövegbe fűzve
+VRIO_RESOURCE_CSS = 'text-align: left; font-weight: bold;'
+VRIO_FLAG_CSS = np.array([f"{highlight_vrio_cells(flag)}; text-align: center; font-weight: bold;" for flag in (False, True)], dtype=object)
+VRIO_FLAG_SYMBOLS = np.array(["✗", "✓"], dtype=object)
+
+table_cache = LRUCache(maxsize=256, name="tables")
+
+
+def _profile_key(selected_factors):
+    return tuple(selected_factors.get(factor_name) for factor_name in FACTOR_KEYS)
+
+
+def _build_profile_table(profile_key, language):
+    texts = factor_texts(language)
+    descriptions = [texts[factor_name][1][value].split(': ', 1)[1] if value is not None else NOT_RATED_TEXT
+                    for factor_name, value in zip(FACTOR_KEYS, profile_key)]
+    display_ratings = ["-" if value is None else str(value) for value in profile_key]
+    df = pd.DataFrame({"Tényező": [texts[factor_name][0] for factor_name in FACTOR_KEYS], "Értékelés (1-5)": display_ratings, "Rövid Leírás": descriptions})
+    css = pd.DataFrame(PROFILE_ROW_CSS[[0 if value is None else value for value in profile_key]], index=df.index, columns=df.columns)
+    return df, css
+
+
+def _build_vrio_table(vrio_data, language):
+    bundle = get_bundle(language)
+    flags = np.array([row[1:] for row in vrio_data], dtype=bool)
+    df = pd.DataFrame(VRIO_FLAG_SYMBOLS[flags.astype(np.intp)], columns=VRIO_CRITERIA)
+    df.insert(0, "Erőforrás", [bundle.resource_name(row[0]) for row in vrio_data])
+    css = pd.DataFrame(VRIO_FLAG_CSS[flags.astype(np.intp)], columns=VRIO_CRITERIA)
+    css.insert(0, "Erőforrás", VRIO_RESOURCE_CSS)
+    return df, css
+
+
+def _styled(df, css):
+    return df.style.apply(lambda _: css, axis=None).hide(axis="index")
+
+
+def profile_table_styler(selected_factors, language=DEFAULT_LANGUAGE):
+    """
+    A kkv profil táblázat Styler objektuma; az adatok és a stílusmátrix profilonként gyorsítótárazva.
+    """
+    key = ("profile", language, _profile_key(selected_factors))
+    df, css = table_cache.get_or_create(key, lambda: _build_profile_table(key[2], language))
+    return _styled(df, css)
+
+
+def vrio_table_styler(vrio_data, language=DEFAULT_LANGUAGE):
+    """
+    A VRIO táblázat Styler objektuma a get_vrio_table_data soraiból, ✓/✗ jelekkel.
+    """
+    key = ("vrio", language, tuple(tuple(row) for row in vrio_data))
+    df, css = table_cache.get_or_create(key, lambda: _build_vrio_table(vrio_data, language))
+    return _styled(df, css)
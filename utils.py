@@ -1,53 +1,36 @@
 import streamlit as st
 import pandas as pd
+from cache import LRUCache
+from factors import FACTOR_KEYS
+from settings import RESULT_CACHE_SIZE
+from vrio import get_rule_set
 
 # --- VRIO modell elemzéshez segédfüggvény ---
-def get_vrio_table_data(innovacio, humantoke, penzugyi_stabilitas, kapcsolati_halo, technologiai_fejlettseg):
-    # A szakdolgozat 3. táblázata alapján a VRIO kritériumok
-    # Jelenlegi egyszerűsített logika:
-    # Valuable: Általában 3-tól jó
-    # Rare: Általában 4-től jó
-    # Inimitable: Csak bizonyos tényezők lehetnek 5-ös értéknél
-    # Organized: Általában 4-től jó
-
+# A küszöbértékek a szakdolgozat 3. táblázata alapján a vrio_rules.json szabálytáblában
+# vannak; a kiértékelést a vrio.py szabálymotorja végzi.
+VRIO_SUPPORT_COLUMNS = (0, 1, 2, 3, 4)
+vrio_table_cache = LRUCache(maxsize=RESULT_CACHE_SIZE, name="vrio")
+
+def get_vrio_table_data(innovacio, humantoke, penzugyi_stabilitas, kapcsolati_halo, technologiai_fejlettseg, rule_set=None):
+    if rule_set is None:
+        # Az alapértelmezett szabálytáblához az eredmény profilonként, folyamatszinten gyorsítótárazott
+        key = (innovacio, humantoke, penzugyi_stabilitas, kapcsolati_halo, technologiai_fejlettseg)
+        data = vrio_table_cache.get_or_create(key, lambda: _vrio_table_data(*key, get_rule_set()))
+    else:
+        data = _vrio_table_data(innovacio, humantoke, penzugyi_stabilitas, kapcsolati_halo, technologiai_fejlettseg, rule_set)
+    return [list(row) for row in data]
+
+
+def _vrio_table_data(innovacio, humantoke, penzugyi_stabilitas, kapcsolati_halo, technologiai_fejlettseg, rule_set):
+    if not set(rule_set.factor_columns.tolist()) <= set(VRIO_SUPPORT_COLUMNS):
+        raise ValueError("A VRIO szabályok gátló tényezőre is hivatkoznak; használja a VrioRuleSet.evaluate metódust a teljes profillal.")
+    # A gátló tényezők oszlopait a szabályok nem olvassák, ezért semleges értékkel töltjük ki
+    profile = [innovacio, humantoke, penzugyi_stabilitas, kapcsolati_halo, technologiai_fejlettseg] + [3] * (len(FACTOR_KEYS) - len(VRIO_SUPPORT_COLUMNS))
+    flags = rule_set.evaluate(profile)[0]
     data = []
-
-    # Innováció
-    is_valuable = innovacio >= 3
-    is_rare = innovacio >= 4
-    is_inimitable = innovacio == 5 # Csak a legmagasabb szinten utánozhatatlan
-    is_organized = innovacio >= 4
-    data.append(["Innováció", is_valuable, is_rare, is_inimitable, is_organized])
-
-    # Humántőke
-    is_valuable = humantoke >= 3
-    is_rare = humantoke >= 4
-    is_inimitable = humantoke == 5 # Csak a legmagasabb szinten utánozhatatlan
-    is_organized = humantoke >= 4
-    data.append(["Humántőke", is_valuable, is_rare, is_inimitable, is_organized])
-
-    # Pénzügyi stabilitás
-    is_valuable = penzugyi_stabilitas >= 3
-    is_rare = False # A szakdolgozat szerint a pénzügyi források nem ritka
-    is_inimitable = False # A szakdolgozat szerint a pénzügyi források nem utánozhatatlan
-    is_organized = penzugyi_stabilitas >= 3
-    data.append(["Pénzügyi források", is_valuable, is_rare, is_inimitable, is_organized])
-
-    # Kapcsolati háló
-    is_valuable = kapcsolati_halo >= 3
-    is_rare = kapcsolati_halo >= 4
-    is_inimitable = kapcsolati_halo >= 4 # Erős háló nehezen utánozható
-    is_organized = kapcsolati_halo >= 3
-    data.append(["Kapcsolati háló", is_valuable, is_rare, is_inimitable, is_organized])
-
-    # Technológiai fejlettség
-    is_valuable = technologiai_fejlettseg >= 3
-    is_rare = technologiai_fejlettseg >= 4
-    is_inimitable = False # A szakdolgozat szerint a technológia elérhető, de beépítése versenyelőny
-    is_organized = technologiai_fejlettseg >= 3
-    data.append(["Technológiai fejlettség", is_valuable, is_rare, is_inimitable, is_organized])
-
-    return data
+    for resource, resource_flags in zip(rule_set.resources, flags):
+        data.append((resource, *(bool(flag) for flag in resource_flags)))
+    return tuple(data)
 
 # --- Stílus a "Gyakorlati Javaslatok" oldal fő állapotjelző dobozához ---
 def get_status_box_style(potencial_score):
@@ -98,6 +81,37 @@ def highlight_vrio_cells(val):
             return f'background-color: {color_false}'
     return ''
 
+# --- Stílusok a "Főoldal (Kkv Profil)" táblázat celláihoz (Streamlit Stylerrel) ---
+def get_rating_style_main_profile(value):
+    color = "black"; background_color = 'transparent'; font_weight = "normal"
+    if pd.notnull(value) and isinstance(value, (int, float)):
+        font_weight = "bold"
+        if value == 1: background_color = '#f8d7da'; color = '#721c24'
+        elif value == 2: background_color = '#f5c6cb'; color = '#721c24'
+        elif value == 3: background_color = '#fff3cd'; color = '#856404'
+        elif value == 4: background_color = '#d4edda'; color = '#155724'
+        elif value == 5: background_color = '#c3e6cb'; color = '#155724'
+    return f'background-color: {background_color}; color: {color}; font-weight: {font_weight};'
+
+def get_description_style_main_profile(rating_value):
+    color = 'black'
+    if pd.notnull(rating_value) and isinstance(rating_value, (int, float)):
+        if rating_value == 1: color = '#721c24'
+        elif rating_value == 2: color = '#721c24'
+        elif rating_value == 3: color = '#856404'
+        elif rating_value == 4: color = '#155724'
+        elif rating_value == 5: color = '#155724'
+    return f'color: {color};'
+
+def style_main_profile_row_cells(row):
+    factor_style = 'text-align: left; font-weight: bold; border: 1px solid #ddd; padding: 8px; vertical-align: top;'
+    rating_value = row['Értékelés (1-5)'] # Ez lehet None vagy szám
+    rating_cell_color_props = get_rating_style_main_profile(rating_value)
+    rating_cell_style = f'{rating_cell_color_props} text-align: center; border: 1px solid #ddd; padding: 8px; vertical-align: top;'
+    desc_cell_color_props = get_description_style_main_profile(rating_value)
+    desc_cell_style = f'{desc_cell_color_props} text-align: left; border: 1px solid #ddd; padding: 8px; vertical-align: top; word-break: break-word; white-space: normal;'
+    return [factor_style, rating_cell_style, desc_cell_style]
+
 # --- Stílus a "Kkv Jellemzők Beállítása" oldal tényezőnkénti magyarázó dobozaihoz ---
 def get_factor_explanation_box_style(score, is_barrier=False):
     """
@@ -0,0 +1,96 @@
+import json
+from functools import lru_cache
+
+import numpy as np
+
+from factors import FACTOR_KEYS
+from scoring import as_ratings_array
+from settings import VRIO_RULES_PATH
+
+# --- Adatvezérelt VRIO szabálymotor ---
+# A küszöbértékek deklaratív szabálytáblából (vrio_rules.json) jönnek. Betöltéskor egy
+# (erőforrás x kritérium) küszöbmátrixszá fordítjuk őket; a kiértékelés ezután egyetlen
+# vektorizált összehasonlítás tetszőleges számú profilra.
+
+VRIO_CRITERIA = ['Értékes', 'Ritka', 'Utánozhatatlan', 'Szervezett']
+
+# Versenyelőny kategóriák (a "Beszámoló" oldal VRIO bekezdéseinek zárómondata)
+VERDICT_DISADVANTAGE, VERDICT_PARITY, VERDICT_TEMPORARY, VERDICT_SUSTAINED = 0, 1, 2, 3
+VERDICT_LABELS = ("versenyhátrány", "versenyparitás", "ideiglenes versenyelőny", "tartós versenyelőny")
+
+# A "soha nem teljesül" küszöb: nagyobb bármely lehetséges értékelésnél
+NEVER = 6
+
+
+class VrioRuleSet:
+    """
+    Lefordított VRIO szabályok: erőforrásnevek, a hozzájuk tartozó tényezőoszlopok és a küszöbmátrix.
+    """
+
+    def __init__(self, resources, factor_columns, thresholds, version=None):
+        self.resources = list(resources)                                # R erőforrásnév
+        self.factor_columns = np.asarray(factor_columns, dtype=np.intp)  # (R,) oszlopindex a FACTOR_KEYS-ben
+        self.thresholds = np.asarray(thresholds, dtype=np.int8)          # (R, 4) küszöbmátrix
+        self.version = version
+
+    def evaluate(self, ratings):
+        """
+        VRIO jelzők (N, R, 4) logikai tömbként egy (N, 9) értékelés tömbre.
+        """
+        arr = as_ratings_array(ratings)
+        return arr[:, self.factor_columns][:, :, None] >= self.thresholds[None, :, :]
+
+    def verdicts(self, flags):
+        """
+        Versenyelőny kategóriák (N, R) a VRIO jelzőkből: tartós, ideiglenes, paritás vagy hátrány.
+        """
+        flags = np.asarray(flags, dtype=bool)
+        v, r, i, o = (flags[..., k] for k in range(len(VRIO_CRITERIA)))
+        verdict = np.full(v.shape, VERDICT_DISADVANTAGE, dtype=np.int8)
+        verdict[v & o] = VERDICT_PARITY
+        verdict[v & r & o] = VERDICT_TEMPORARY
+        verdict[v & r & i & o] = VERDICT_SUSTAINED
+        return verdict
+
+    def evaluate_with_verdicts(self, ratings):
+        flags = self.evaluate(ratings)
+        return flags, self.verdicts(flags)
+
+
+def compile_rules(rules):
+    """
+    Szabálytábla (a vrio_rules.json szerkezete) -> VrioRuleSet. Hibás tábla esetén ValueError.
+    """
+    criteria = rules.get("criteria", VRIO_CRITERIA)
+    if list(criteria) != VRIO_CRITERIA:
+        raise ValueError(f"A VRIO kritériumok sorrendje nem megfelelő: {criteria}")
+    resources, factor_columns, thresholds = [], [], []
+    for entry in rules["resources"]:
+        factor_name = entry["factor"]
+        if factor_name not in FACTOR_KEYS:
+            raise ValueError(f"Ismeretlen tényező a VRIO szabályokban: '{factor_name}'")
+        row = []
+        for criterion in VRIO_CRITERIA:
+            threshold = entry["thresholds"].get(criterion)
+            if threshold is None:
+                threshold = NEVER
+            elif not 1 <= threshold <= 5:
+                raise ValueError(f"Érvénytelen küszöb ({entry['resource']} / {criterion}): {threshold}")
+            row.append(threshold)
+        resources.append(entry["resource"])
+        factor_columns.append(FACTOR_KEYS.index(factor_name))
+        thresholds.append(row)
+    return VrioRuleSet(resources, factor_columns, thresholds, version=rules.get("version"))
+
+
+def load_rules(path):
+    with open(path, encoding="utf-8") as f:
+        return compile_rules(json.load(f))
+
+
+@lru_cache(maxsize=None)
+def get_rule_set(path=VRIO_RULES_PATH):
+    """
+    A szabálytábla egyszer betöltve és lefordítva, folyamatonként gyorsítótárazva.
+    """
+    return load_rules(path)